@@ -1,5 +1,11 @@
-// Google Maps Ultimate Scraper - 40+ fields, parallel enrichment, website scraping
-const googleMapsUltimate = require('../scrapers/googleMapsUltimate');
+const { performance } = require('perf_hooks');
+
+// Scraper modules are required on first use, so API-only processes never
+// load Puppeteer. scraperModule paths are relative to this file.
+const STUB_SCRAPER_MODULE = '../scrapers/stubScraper';
+
+// SCRAPER_STUB=true runs every actor on synthetic data (load tests without Chromium)
+const useStubScrapers = () => process.env.SCRAPER_STUB === 'true';
 
 /**
  * Actor Registry - Define all public actors with field schemas
@@ -19,7 +25,23 @@ const actorRegistry = [
     stats: { runs: 0, rating: 4.9, reviews: 500 },
     pricingModel: 'Pay per result',
     isPublic: true,
-    scraperFunction: googleMapsUltimate,
+    // Google Maps Ultimate Scraper - 40+ fields, parallel enrichment, website scraping
+    scraperModule: '../scrapers/googleMapsUltimate',
+    // Requests aborted in scraper pages (photos keep their src URLs)
+    resourceBlocking: {
+      blockTypes: ['image', 'media', 'font'],
+      denyPatterns: [
+        'google-analytics.com',
+        'googletagmanager.com',
+        'doubleclick.net',
+        'googleadservices.com',
+        'connect.facebook.net',
+        'hotjar.com',
+        'maps/vt',
+        'streetviewpixels'
+      ],
+      allowPatterns: []
+    },
     inputFields: [
       {
         key: 'query',
@@ -46,6 +68,14 @@ const actorRegistry = [
         placeholder: '20',
         default: 20,
         description: 'Total number of places to scrape (1-100). Each result includes full enrichment.'
+      },
+      {
+        key: 'feedIdleSeconds',
+        label: 'Results Scroll Timeout (s)',
+        type: 'number',
+        required: false,
+        placeholder: '90',
+        description: 'Stop scrolling the search results after this many seconds without new places.'
       }
     ],
     outputFields: [
@@ -64,33 +94,75 @@ const actorRegistry = [
   }
 ];
 
+const actorsById = new Map(actorRegistry.map(actor => [actor.actorId, actor]));
+const scraperLoadTimes = new Map();
+
+/**
+ * Require a scraper module once, recording how long loading took
+ */
+function loadScraper(modulePath) {
+  if (!scraperLoadTimes.has(modulePath)) {
+    const start = performance.now();
+    require(modulePath);
+    const ms = Math.round(performance.now() - start);
+    scraperLoadTimes.set(modulePath, ms);
+    console.log(`📦 Loaded scraper ${modulePath} in ${ms}ms`);
+  }
+  return require(modulePath);
+}
+
 /**
- * Get scraper function by actorId
+ * Registry entry by actorId
+ */
+function getActor(actorId) {
+  return actorsById.get(actorId) || null;
+}
+
+/**
+ * Get scraper function by actorId (loads the scraper module on first use)
  */
 function getScraperFunction(actorId) {
-  const actor = actorRegistry.find(a => a.actorId === actorId);
-  return actor?.scraperFunction || null;
+  const actor = actorsById.get(actorId);
+  if (!actor) return null;
+  if (useStubScrapers()) return loadScraper(STUB_SCRAPER_MODULE);
+  return actor.scraperModule ? loadScraper(actor.scraperModule) : null;
+}
+
+/**
+ * Get resource blocking rules by actorId
+ */
+function getResourceBlocking(actorId) {
+  return actorsById.get(actorId)?.resourceBlocking || null;
 }
 
 /**
  * Get input field schema by actorId
  */
 function getInputFields(actorId) {
-  const actor = actorRegistry.find(a => a.actorId === actorId);
-  return actor?.inputFields || [];
+  return actorsById.get(actorId)?.inputFields || [];
 }
 
 /**
  * Get output field schema by actorId
  */
 function getOutputFields(actorId) {
-  const actor = actorRegistry.find(a => a.actorId === actorId);
-  return actor?.outputFields || [];
+  return actorsById.get(actorId)?.outputFields || [];
+}
+
+/**
+ * Scraper modules loaded so far and their load time in ms
+ */
+function loadedScrapers() {
+  return Object.fromEntries(scraperLoadTimes);
 }
 
 module.exports = {
   actorRegistry,
+  getActor,
   getScraperFunction,
+  getResourceBlocking,
   getInputFields,
-  getOutputFields
+  getOutputFields,
+  loadedScrapers,
+  useStubScrapers
 };
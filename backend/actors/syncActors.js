@@ -1,61 +1,90 @@
+const crypto = require('crypto');
 const Actor = require('../models/Actor');
 const { actorRegistry } = require('./registry');
 
+const DUPLICATE_KEY = 11000;
+
+/**
+ * Registry fields stored on the actor document
+ */
+function syncedFields(actorData) {
+  return {
+    name: actorData.name,
+    title: actorData.title,
+    description: actorData.description,
+    author: actorData.author,
+    slug: actorData.slug,
+    category: actorData.category,
+    icon: actorData.icon,
+    pricingModel: actorData.pricingModel,
+    isPublic: actorData.isPublic,
+    'stats.rating': actorData.stats.rating,
+    'stats.reviews': actorData.stats.reviews
+  };
+}
+
+function contentHash(fields) {
+  return crypto.createHash('sha1').update(JSON.stringify(fields)).digest('hex');
+}
+
 /**
  * Auto-sync actors from registry to database
- * Called on backend startup
+ * Called on backend startup. Unchanged actors are skipped by comparing a
+ * content hash, and the rest are upserted in one bulkWrite, so boot cost
+ * does not grow with the registry and concurrent nodes converge on the
+ * same documents.
  */
 async function syncActors() {
+  const start = Date.now();
   try {
     console.log('🔄 Syncing actors from registry...');
     
+    const entries = actorRegistry.map(actorData => {
+      const fields = syncedFields(actorData);
+      return { actorId: actorData.actorId, fields, hash: contentHash(fields) };
+    });
+    
+    const existing = await Actor.find(
+      { actorId: { $in: entries.map(e => e.actorId) } },
+      { actorId: 1, registryHash: 1 }
+    ).lean();
+    const hashes = new Map(existing.map(actor => [actor.actorId, actor.registryHash]));
+    const changed = entries.filter(entry => hashes.get(entry.actorId) !== entry.hash);
+    
     let created = 0;
     let updated = 0;
-    
-    for (const actorData of actorRegistry) {
-      // Remove scraperFunction before saving to DB
-      const { scraperFunction, ...actorInfo } = actorData;
-      
-      // Check if actor exists
-      const existingActor = await Actor.findOne({ actorId: actorInfo.actorId });
-      
-      if (existingActor) {
-        // Update existing actor (preserve userId if set)
-        await Actor.updateOne(
-          { actorId: actorInfo.actorId },
-          { 
-            $set: {
-              name: actorInfo.name,
-              title: actorInfo.title,
-              description: actorInfo.description,
-              author: actorInfo.author,
-              slug: actorInfo.slug,
-              category: actorInfo.category,
-              icon: actorInfo.icon,
-              pricingModel: actorInfo.pricingModel,
-              isPublic: actorInfo.isPublic,
-              'stats.rating': actorInfo.stats.rating,
-              'stats.reviews': actorInfo.stats.reviews,
-              updatedAt: new Date()
+    if (changed.length > 0) {
+      const now = new Date();
+      const operations = changed.map(entry => ({
+        updateOne: {
+          filter: { actorId: entry.actorId },
+          update: {
+            $set: { ...entry.fields, registryHash: entry.hash, updatedAt: now },
+            $setOnInsert: {
+              userId: null, // Public actors have no owner
+              isBookmarked: false,
+              'stats.runs': 0,
+              createdAt: now
             }
-          }
-        );
-        updated++;
-      } else {
-        // Create new actor
-        const newActor = new Actor({
-          ...actorInfo,
-          userId: null, // Public actors have no owner
-          isBookmarked: false,
-          createdAt: new Date(),
-          updatedAt: new Date()
-        });
-        await newActor.save();
-        created++;
+          },
+          upsert: true
+        }
+      }));
+      
+      try {
+        const result = await Actor.bulkWrite(operations, { ordered: false });
+        created = result.upsertedCount;
+        updated = result.modifiedCount;
+      } catch (error) {
+        // Another node inserted the same actor first; its write has the same content
+        const writeErrors = error.writeErrors || [];
+        if (writeErrors.length === 0 || writeErrors.some(e => e.code !== DUPLICATE_KEY)) throw error;
+        created = error.result?.upsertedCount || 0;
+        updated = error.result?.modifiedCount || 0;
       }
     }
     
-    console.log(`✅ Actor sync complete: ${created} created, ${updated} updated`);
+    console.log(`✅ Actor sync complete: ${created} created, ${updated} updated, ${entries.length - changed.length} unchanged (${Date.now() - start}ms)`);
   } catch (error) {
     console.error('❌ Error syncing actors:', error);
     throw error;
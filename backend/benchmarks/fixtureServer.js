@@ -0,0 +1,314 @@
+/**
+ * GOOGLE MAPS FIXTURE SERVER
+ * Serves deterministic Maps-like pages so googleMapsUltimate can be
+ * benchmarked offline:
+ *   /maps/search/:query  - results feed that loads more places on scroll
+ *   /maps/place/...      - place detail pages (same selectors as live Maps)
+ *   /site/:id            - business websites with emails, socials and JSON-LD
+ * Images, a web font and a tracker script are served too, so resource
+ * blocking has something to block.
+ *
+ * Usage: node benchmarks/fixtureServer.js
+ *        GOOGLE_MAPS_BASE_URL=http://localhost:8099 node server.js
+ */
+
+const express = require('express');
+
+const NAMES = ['Luigi', 'Golden', 'Harbor', 'Maple', 'Copper', 'Blue Door', 'Corner', 'Sunset', 'Olive', 'Brick'];
+const KINDS = ['Pizza', 'Coffee', 'Bistro', 'Bakery', 'Noodle Bar', 'Taqueria', 'Grill', 'Diner'];
+const STREETS = ['Main St', 'Oak Ave', 'Pine St', 'Elm St', 'Broadway', 'Market St'];
+const DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'];
+
+function envNumber(name, fallback) {
+  const value = parseFloat(process.env[name]);
+  return Number.isFinite(value) ? value : fallback;
+}
+
+function defaultConfig() {
+  return {
+    port: envNumber('FIXTURE_PORT', 8099),
+    places: envNumber('FIXTURE_PLACES', 120),
+    pageSize: envNumber('FIXTURE_PAGE_SIZE', 20),
+    latencyMs: envNumber('FIXTURE_LATENCY_MS', 0),
+    jitterMs: envNumber('FIXTURE_JITTER_MS', 0),
+    failureRate: envNumber('FIXTURE_FAILURE_RATE', 0),
+    blockRate: envNumber('FIXTURE_BLOCK_RATE', 0),
+    imageBytes: envNumber('FIXTURE_IMAGE_BYTES', 40000)
+  };
+}
+
+const delay = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+const escapeHtml = value => String(value)
+  .replace(/&/g, '&amp;')
+  .replace(/</g, '&lt;')
+  .replace(/>/g, '&gt;')
+  .replace(/"/g, '&quot;');
+
+/**
+ * Deterministic place record for a feed position
+ */
+function fixturePlace(index) {
+  const name = `${NAMES[index % NAMES.length]} ${KINDS[index % KINDS.length]} ${index + 1}`;
+  const id = String(index + 1).padStart(6, '0');
+  return {
+    index,
+    id,
+    name,
+    slug: encodeURIComponent(name).replace(/%20/g, '+'),
+    category: KINDS[index % KINDS.length],
+    rating: (3.5 + (index % 15) / 10).toFixed(1),
+    reviews: (index * 37 + 12).toLocaleString('en-US'),
+    address: `${100 + index} ${STREETS[index % STREETS.length]}, Springfield, IL 627${String(index % 100).padStart(2, '0')}, United States`,
+    phone: `(555) 01${String(index % 100).padStart(2, '0')}-${String(1000 + index).slice(-4)}`,
+    lat: (39.7817 + index / 1000).toFixed(6),
+    lng: (-89.6501 - index / 1000).toFixed(6),
+    placeId: `ChIJfixture${id}`
+  };
+}
+
+function placePath(place) {
+  return `/maps/place/${place.slug}/data=!3d${place.lat}!4d${place.lng}!1s${place.placeId}`;
+}
+
+function feedEntries(start, end) {
+  let html = '';
+  for (let i = start; i < end; i++) {
+    const place = fixturePlace(i);
+    html += `<div class="Nv2PK" style="height:110px;border-bottom:1px solid #eee">
+      <a class="hfpxzc" aria-label="${escapeHtml(place.name)}" href="${placePath(place)}"></a>
+      <div class="qBF1Pd">${escapeHtml(place.name)}</div>
+      <img src="/fixture/img/thumb-${place.id}.jpg" width="80" height="80">
+    </div>`;
+  }
+  return html;
+}
+
+function pageShell(title, body, head = '') {
+  return `<!DOCTYPE html><html><head><meta charset="utf-8"><title>${escapeHtml(title)}</title>
+<link rel="preload" href="/fixture/font.woff2" as="font" type="font/woff2" crossorigin>
+<style>@font-face{font-family:Fixture;src:url(/fixture/font.woff2) format("woff2")}body{font-family:Fixture,sans-serif}</style>
+<script async src="/fixture/google-analytics.com/analytics.js"></script>
+${head}</head><body>${body}</body></html>`;
+}
+
+function searchPage(query, config) {
+  const firstPage = Math.min(config.pageSize, config.places);
+  const endMarker = `<div class="m6QErb"><span class="HlvSq">You've reached the end of the list.</span></div>`;
+  return pageShell(`${query} - Google Maps`, `
+<div role="feed" aria-label="Results for ${escapeHtml(query)}" style="height:700px;overflow-y:auto">
+${feedEntries(0, firstPage)}${firstPage >= config.places ? endMarker : ''}
+</div>
+<script>
+  (function () {
+    var feed = document.querySelector('[role="feed"]');
+    var offset = ${firstPage};
+    var total = ${config.places};
+    var loading = false;
+    feed.addEventListener('scroll', function () {
+      if (loading || offset >= total) return;
+      if (feed.scrollTop + feed.clientHeight < feed.scrollHeight - 50) return;
+      loading = true;
+      fetch('/fixture/feed?offset=' + offset)
+        .then(function (res) { return res.json(); })
+        .then(function (page) {
+          feed.insertAdjacentHTML('beforeend', page.html);
+          offset = page.next;
+          if (offset >= total) feed.insertAdjacentHTML('beforeend', ${JSON.stringify(endMarker)});
+        })
+        .catch(function () {})
+        .then(function () { loading = false; });
+    });
+  })();
+</script>`);
+}
+
+function placePage(place, origin) {
+  const hours = DAYS.map(day => `<tr><th>${day}</th><td>${day === 'Sunday' ? 'Closed' : '9 AM–10 PM'}</td></tr>`).join('');
+  const photos = [1, 2, 3, 4, 5].map(n =>
+    `<button jsaction="pane.image.photo"><img src="${origin}/fixture/img/${place.id}-${n}.jpg" width="200" height="150"></button>`
+  ).join('');
+  return pageShell(`${place.name} - Google Maps`, `
+<div role="main" aria-label="${escapeHtml(place.name)}">
+  <h1>${escapeHtml(place.name)}</h1>
+  <div jsaction="pane.reviewChart.moreReviews"><span aria-hidden="true">${place.rating}</span> <span>(${place.reviews})</span></div>
+  <button jsaction="pane.rating.category">${place.category} restaurant</button>
+  <button jsaction="pane.rating.category">Takeout</button>
+  <span aria-label="Price: Moderate">$$</span>
+  <img alt="Verified business" src="${origin}/fixture/img/verified.png" width="16" height="16">
+  <span aria-label="Open now">Open ⋅ Closes 10 PM</span>
+  <button data-item-id="address"><div class="Io6YTe">${escapeHtml(place.address)}</div></button>
+  <button data-item-id="phone:tel:+1555${place.id}"><div class="Io6YTe">${place.phone}</div></button>
+  <a data-item-id="authority" href="${origin}/site/${place.id}">place-${place.id}.test</a>
+  <a href="${origin}/site/${place.id}/menu">Menu</a>
+  <a href="${origin}/site/${place.id}/order">Order online</a>
+  <table aria-label="Hours">${hours}</table>
+  <div aria-label="${20 + place.index % 80} photos">${photos}</div>
+  <div role="region" aria-label="Amenities">
+    <div role="listitem">Dine-in</div>
+    <div role="listitem">Takeout</div>
+    <div role="listitem">Delivery</div>
+    <button aria-label="Dine-in: Yes"></button>
+    <button aria-label="Outdoor seating: ${place.index % 2 ? 'Yes' : 'No'}"></button>
+  </div>
+  <span aria-label="Wheelchair accessible entrance"></span>
+</div>`);
+}
+
+function websitePage(place, origin) {
+  const structured = {
+    '@context': 'https://schema.org',
+    '@type': 'Restaurant',
+    name: place.name,
+    telephone: place.phone,
+    address: place.address
+  };
+  return pageShell(place.name, `
+<header><img src="${origin}/fixture/img/logo-${place.id}.jpg" width="300" height="120"></header>
+<main>
+  <h1>Welcome to ${escapeHtml(place.name)}</h1>
+  <p id="about">Family-run ${place.category.toLowerCase()} serving Springfield with seasonal food since ${2000 + place.index % 20}.</p>
+  <p>Founded by Jane Fixture</p>
+  <p>Contact us: info@place-${place.id}.test or bookings@place-${place.id}.test</p>
+</main>
+<footer>
+  <a href="https://www.facebook.com/place${place.id}">Facebook</a>
+  <a href="https://www.instagram.com/place${place.id}">Instagram</a>
+  <a href="https://www.yelp.com/biz/place-${place.id}">Yelp</a>
+  <p>© ${2010 + place.index % 10} ${escapeHtml(place.name)}</p>
+</footer>`,
+  `<meta name="description" content="${escapeHtml(place.name)} - ${place.category} in Springfield, IL. Order online or book a table.">
+<script type="application/ld+json">${JSON.stringify(structured)}</script>`);
+}
+
+/**
+ * Build the fixture app; options override the FIXTURE_* environment
+ */
+function createFixtureApp(options = {}) {
+  const config = { ...defaultConfig(), ...options };
+  const app = express();
+  const stats = { requests: 0, byKind: {}, failures: 0, blocks: 0 };
+
+  const count = kind => {
+    stats.requests++;
+    stats.byKind[kind] = (stats.byKind[kind] || 0) + 1;
+  };
+
+  const latency = async (req, res, next) => {
+    const ms = config.latencyMs + Math.random() * config.jitterMs;
+    if (ms > 0) await delay(ms);
+    next();
+  };
+
+  // Drop the connection so the browser sees a network error, like a flaky upstream
+  const failures = (req, res, next) => {
+    if (config.failureRate > 0 && Math.random() < config.failureRate) {
+      stats.failures++;
+      return req.socket.destroy();
+    }
+    next();
+  };
+
+  const origin = req => `${req.protocol}://${req.get('host')}`;
+
+  app.get('/maps/search/:query', latency, (req, res) => {
+    count('search');
+    res.type('html').send(searchPage(req.params.query, config));
+  });
+
+  app.get('/fixture/feed', latency, failures, (req, res) => {
+    count('feed');
+    const offset = Math.max(0, parseInt(req.query.offset) || 0);
+    const next = Math.min(config.places, offset + config.pageSize);
+    res.json({ html: feedEntries(offset, next), next });
+  });
+
+  app.get('/maps/place/*', latency, failures, (req, res) => {
+    count('place');
+    if (config.blockRate > 0 && Math.random() < config.blockRate) {
+      stats.blocks++;
+      return res.redirect(`/sorry/index?continue=${encodeURIComponent(req.originalUrl)}`);
+    }
+    const match = req.path.match(/ChIJfixture(\d+)/);
+    const index = match ? parseInt(match[1]) - 1 : -1;
+    if (index < 0 || index >= config.places) return res.status(404).send('Place not found');
+    res.type('html').send(placePage(fixturePlace(index), origin(req)));
+  });
+
+  app.get('/sorry/index', (req, res) => {
+    count('sorry');
+    res.status(429).type('html').send(pageShell('Sorry', `<p>Our systems have detected unusual traffic from your computer network.</p>`));
+  });
+
+  app.get('/site/:id/:section?', latency, failures, (req, res) => {
+    count('site');
+    const index = parseInt(req.params.id) - 1;
+    if (!(index >= 0 && index < config.places)) return res.status(404).send('Site not found');
+    res.type('html').send(websitePage(fixturePlace(index), origin(req)));
+  });
+
+  app.get('/fixture/img/:file', latency, (req, res) => {
+    count('image');
+    res.set('Cache-Control', 'no-store');
+    res.type(req.params.file.endsWith('.png') ? 'png' : 'jpeg').send(Buffer.alloc(config.imageBytes, 0x5a));
+  });
+
+  app.get('/fixture/font.woff2', (req, res) => {
+    count('font');
+    res.set('Cache-Control', 'no-store');
+    res.type('font/woff2').send(Buffer.alloc(24000, 0x33));
+  });
+
+  app.get('/fixture/google-analytics.com/analytics.js', (req, res) => {
+    count('tracker');
+    res.type('application/javascript').send('window.__fixtureTracker = true;');
+  });
+
+  app.get('/fixture/stats', (req, res) => {
+    res.json({ config, stats });
+  });
+
+  return { app, config, stats };
+}
+
+/**
+ * Start a fixture server; port 0 picks a free port.
+ * Resolves with { url, config, stats, close }
+ */
+function startFixtureServer(options = {}) {
+  const { app, config, stats } = createFixtureApp(options);
+  return new Promise((resolve, reject) => {
+    const server = app.listen(config.port, '127.0.0.1', () => {
+      const url = `http://127.0.0.1:${server.address().port}`;
+      resolve({
+        url,
+        config,
+        stats,
+        close: () => new Promise(done => {
+          server.close(() => done());
+          // Browsers keep connections alive; drop them so close() resolves
+          if (server.closeAllConnections) server.closeAllConnections();
+        })
+      });
+    });
+    server.on('error', reject);
+  });
+}
+
+module.exports = {
+  createFixtureApp,
+  startFixtureServer,
+  fixturePlace
+};
+
+if (require.main === module) {
+  startFixtureServer()
+    .then(({ url, config }) => {
+      console.log(`🧪 Google Maps fixture server on ${url} (${config.places} places, ${config.latencyMs}ms latency, ${config.failureRate * 100}% failures)`);
+      console.log(`   Point the scraper at it with GOOGLE_MAPS_BASE_URL=${url}`);
+    })
+    .catch(err => {
+      console.error('❌ Fixture server failed to start:', err.message);
+      process.exit(1);
+    });
+}
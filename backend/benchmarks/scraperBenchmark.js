@@ -0,0 +1,162 @@
+/**
+ * GOOGLE MAPS SCRAPER BENCHMARK
+ * Runs googleMapsUltimate against the offline fixture server for every
+ * combination of enrichment concurrency and resource blocking, and reports
+ * places/sec, per-stage timings, bytes transferred and Chromium RSS.
+ *
+ * Usage:
+ *   node benchmarks/scraperBenchmark.js --places=40 --concurrency=2,4,8 --blocking=on,off \
+ *     --latency=150 --jitter=100 --failure-rate=0.02 --output=bench.json
+ *
+ * --adaptive lets the pool adapt below each concurrency instead of pinning it.
+ */
+
+const fs = require('fs');
+const browserManager = require('../utils/browserManager');
+const { sampleRss } = require('../utils/processStats');
+const { getResourceBlocking } = require('../actors/registry');
+const googleMapsUltimate = require('../scrapers/googleMapsUltimate');
+const { startFixtureServer } = require('./fixtureServer');
+
+function parseArgs(argv) {
+  const args = {};
+  argv.forEach(arg => {
+    const match = arg.match(/^--([^=]+)(?:=(.*))?$/);
+    if (match) args[match[1]] = match[2] === undefined ? true : match[2];
+  });
+  const list = (value, fallback) => (value ? String(value).split(',').map(s => s.trim()).filter(Boolean) : fallback);
+
+  return {
+    places: parseInt(args.places) || 30,
+    concurrency: list(args.concurrency, ['2', '4', '8']).map(n => parseInt(n)).filter(n => n > 0),
+    blocking: list(args.blocking, ['on', 'off']).map(v => v === 'on' || v === 'true'),
+    repeat: parseInt(args.repeat) || 1,
+    adaptive: !!args.adaptive,
+    output: args.output || null,
+    fixture: {
+      port: 0,
+      places: Math.max(parseInt(args.places) || 30, parseInt(args['fixture-places']) || 0),
+      latencyMs: parseFloat(args.latency) || 0,
+      jitterMs: parseFloat(args.jitter) || 0,
+      failureRate: parseFloat(args['failure-rate']) || 0,
+      blockRate: parseFloat(args['block-rate']) || 0
+    }
+  };
+}
+
+const mb = bytes => parseFloat((bytes / 1024 / 1024).toFixed(1));
+const avg = (total, count) => (count > 0 ? Math.round(total / count) : 0);
+
+async function runScenario(fixture, options, concurrency, blocking) {
+  const requestsBefore = { ...fixture.stats.byKind };
+  const rss = sampleRss(() => browserManager.pids());
+  const start = Date.now();
+
+  const [summary] = await googleMapsUltimate(
+    { query: 'benchmark restaurants', location: '', maxResults: options.places },
+    {
+      baseUrl: fixture.url,
+      resourceBlocking: blocking ? getResourceBlocking('google-maps') : null,
+      concurrency: {
+        initial: concurrency,
+        min: options.adaptive ? 1 : concurrency,
+        max: concurrency
+      }
+    }
+  );
+
+  const wallMs = Date.now() - start;
+  const memory = rss.stop();
+  const timings = summary.timings || {};
+  const fixtureRequests = {};
+  Object.entries(fixture.stats.byKind).forEach(([kind, count]) => {
+    fixtureRequests[kind] = count - (requestsBefore[kind] || 0);
+  });
+
+  return {
+    concurrency,
+    blocking,
+    places: summary.totalResults,
+    detailed: summary.detailedResults,
+    failed: summary.totalResults - summary.detailedResults,
+    wallMs,
+    placesPerSec: parseFloat((summary.totalResults / (wallMs / 1000)).toFixed(3)),
+    stages: {
+      searchMs: timings.searchMs,
+      enrichMs: timings.enrichMs,
+      avgDetailMs: avg(timings.detailMs, timings.detailPages),
+      avgWebsiteMs: avg(timings.websiteMs, timings.websitePages)
+    },
+    enrichment: summary.enrichment,
+    network: {
+      blockedRequests: summary.resources?.blockedRequests || 0,
+      transferredMB: mb(summary.resources?.transferredBytes || 0),
+      estimatedSavedMB: mb(summary.resources?.estimatedBlockedBytes || 0),
+      fixtureRequests
+    },
+    chromiumRss: {
+      peakMB: mb(memory.peakBytes),
+      avgMB: mb(memory.avgBytes),
+      samples: memory.samples
+    }
+  };
+}
+
+async function main() {
+  const options = parseArgs(process.argv.slice(2));
+  const fixture = await startFixtureServer(options.fixture);
+  console.log(`🧪 Fixture server on ${fixture.url} (${fixture.config.places} places)`);
+
+  await browserManager.warmUp();
+  const results = [];
+
+  try {
+    for (let round = 1; round <= options.repeat; round++) {
+      for (const concurrency of options.concurrency) {
+        for (const blocking of options.blocking) {
+          console.log(`\n⏱️  Round ${round}: concurrency ${concurrency}, blocking ${blocking ? 'on' : 'off'}`);
+          const result = await runScenario(fixture, options, concurrency, blocking);
+          results.push({ round, ...result });
+          console.log(`   ${result.places} places in ${result.wallMs}ms = ${result.placesPerSec} places/sec, Chromium peak ${result.chromiumRss.peakMB}MB`);
+        }
+      }
+    }
+  } finally {
+    await browserManager.closeBrowser();
+    await fixture.close();
+  }
+
+  const report = {
+    node: process.version,
+    browserPoolSize: browserManager.poolSize,
+    fixture: fixture.config,
+    adaptive: options.adaptive,
+    results
+  };
+
+  console.log('\n📊 Summary');
+  console.table(results.map(r => ({
+    concurrency: r.concurrency,
+    blocking: r.blocking ? 'on' : 'off',
+    places: r.places,
+    'places/sec': r.placesPerSec,
+    'search ms': r.stages.searchMs,
+    'detail ms': r.stages.avgDetailMs,
+    'website ms': r.stages.avgWebsiteMs,
+    'MB transferred': r.network.transferredMB,
+    'RSS peak MB': r.chromiumRss.peakMB
+  })));
+
+  const json = JSON.stringify(report, null, 2);
+  if (options.output) {
+    fs.writeFileSync(options.output, json + '\n');
+    console.log(`💾 Report written to ${options.output}`);
+  } else {
+    console.log(json);
+  }
+}
+
+main().catch(err => {
+  console.error('❌ Benchmark failed:', err);
+  process.exit(1);
+});
@@ -1,7 +1,4 @@
-const jwt = require('jsonwebtoken');
-const User = require('../models/User');
-
-const JWT_SECRET = process.env.JWT_SECRET || 'scrapi-jwt-secret-key-change-in-production';
+const authCache = require('../utils/authCache');
 
 const authMiddleware = async (req, res, next) => {
   try {
@@ -12,11 +9,11 @@ const authMiddleware = async (req, res, next) => {
       return res.status(401).json({ error: 'No authentication token provided' });
     }
 
-    // Verify token
-    const decoded = jwt.verify(token, JWT_SECRET);
+    // Verify token (cached until it expires)
+    const decoded = authCache.verifyToken(token);
     
-    // Find user
-    const user = await User.findById(decoded.userId).select('-password');
+    // Find user (cached for AUTH_CACHE_TTL_MS, invalidated on change)
+    const user = await authCache.getUser(decoded.userId);
     
     if (!user) {
       return res.status(401).json({ error: 'User not found' });
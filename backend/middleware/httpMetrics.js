@@ -0,0 +1,26 @@
+const metrics = require('../utils/metrics');
+
+const requestDuration = metrics.histogram({
+  name: 'scrapi_http_request_duration_seconds',
+  help: 'HTTP request latency in seconds by route',
+  labelNames: ['method', 'route', 'status']
+});
+
+/**
+ * Route pattern of a handled request (e.g. /api/runs/:runId), so label
+ * values stay bounded
+ */
+function routeLabel(req) {
+  if (!req.route) return 'unmatched';
+  return req.baseUrl + req.route.path;
+}
+
+const httpMetrics = (req, res, next) => {
+  const end = requestDuration.startTimer({ method: req.method });
+  res.on('finish', () => {
+    end({ route: routeLabel(req), status: res.statusCode });
+  });
+  next();
+};
+
+module.exports = httpMetrics;
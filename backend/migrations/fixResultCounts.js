@@ -0,0 +1,39 @@
+const Run = require('../models/Run');
+
+// Recount resultCount for runs that still keep their results inline
+// (dataset runs are counted on insert). The count is computed by the
+// projection, so outputs are never sent to this process.
+module.exports = {
+  name: 'fix-result-counts',
+  model: Run,
+  filter: { 'output.0': { $exists: true } },
+  projection: {
+    runId: 1,
+    resultCount: 1,
+    actualCount: {
+      $cond: [
+        // Wrapped output ([{ ..., results: [...] }]) counts the nested results
+        { $isArray: { $let: { vars: { first: { $arrayElemAt: ['$output', 0] } }, in: '$$first.results' } } },
+        {
+          $sum: {
+            $map: {
+              input: '$output',
+              as: 'entry',
+              in: { $cond: [{ $isArray: '$$entry.results' }, { $size: '$$entry.results' }, 0] }
+            }
+          }
+        },
+        { $size: '$output' }
+      ]
+    }
+  },
+  plan(run) {
+    if (run.resultCount === run.actualCount) return null;
+    return {
+      updateOne: {
+        filter: { _id: run._id },
+        update: { $set: { resultCount: run.actualCount }, $inc: { version: 1 } }
+      }
+    };
+  }
+};
@@ -0,0 +1,53 @@
+const mongoose = require('mongoose');
+const { runMigration } = require('./runner');
+
+const MONGO_URL = process.env.MONGO_URL || 'mongodb://localhost:27017';
+const DB_NAME = process.env.DB_NAME || 'scrapi';
+
+const migrations = {
+  'fix-result-counts': require('./fixResultCounts'),
+  'move-legacy-output': require('./moveLegacyOutput')
+};
+
+/**
+ * Command line entry point:
+ *   node migrations <name> [--restart] [--dry-run] [--batch-size=N]
+ * Ctrl+C stops after the current batch; rerun to resume.
+ */
+async function cli(argv) {
+  const [name, ...flags] = argv;
+  const migration = migrations[name];
+  if (!migration) {
+    console.error(`Usage: node migrations <${Object.keys(migrations).join('|')}> [--restart] [--dry-run] [--batch-size=N]`);
+    process.exit(1);
+  }
+
+  const batchFlag = flags.find(f => f.startsWith('--batch-size='));
+  const controller = new AbortController();
+  process.once('SIGINT', () => {
+    console.log('\n⏸️  Stopping after the current batch...');
+    controller.abort();
+  });
+
+  try {
+    await mongoose.connect(`${MONGO_URL}/${DB_NAME}`);
+    console.log('✅ Connected to MongoDB');
+    await runMigration(migration, {
+      restart: flags.includes('--restart'),
+      dryRun: flags.includes('--dry-run'),
+      batchSize: batchFlag ? parseInt(batchFlag.split('=')[1]) : undefined,
+      signal: controller.signal
+    });
+    await mongoose.connection.close();
+    process.exit(0);
+  } catch (error) {
+    console.error('❌ Migration failed:', error);
+    process.exit(1);
+  }
+}
+
+module.exports = { migrations, runMigration, cli };
+
+if (require.main === module) {
+  cli(process.argv.slice(2));
+}
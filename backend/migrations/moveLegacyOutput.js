@@ -0,0 +1,33 @@
+const Run = require('../models/Run');
+const datasetStore = require('../utils/datasetStore');
+
+// Move results that pre-dataset runs keep inline (run.output) into the
+// dataset collection, so they are paged, exported and searched (text index)
+// like every other run. Items are rewritten from scratch for each run and
+// the output is only unset after they are stored, so an interrupted
+// migration can be resumed safely.
+module.exports = {
+  name: 'move-legacy-output',
+  model: Run,
+  filter: { 'output.0': { $exists: true } },
+  projection: { runId: 1, userId: 1, actorId: 1, output: 1 },
+  // Outputs are loaded in full, so keep batches small
+  batchSize: 50,
+  async plan(run, { dryRun }) {
+    const { meta, items } = datasetStore.splitOutput(run.output);
+    if (!dryRun) {
+      await datasetStore.clearItems(run.runId);
+      await datasetStore.appendItems(run, items);
+    }
+    return {
+      updateOne: {
+        filter: { _id: run._id },
+        update: {
+          $set: { outputMeta: meta, resultCount: items.length },
+          $unset: { output: 1 },
+          $inc: { version: 1 }
+        }
+      }
+    };
+  }
+};
@@ -0,0 +1,119 @@
+const MigrationCheckpoint = require('../models/MigrationCheckpoint');
+
+const DEFAULT_BATCH_SIZE = 1000;
+const PROGRESS_INTERVAL_MS = 5000;
+
+// Batched, resumable data migrations.
+// A migration streams documents in _id order through a cursor (with a
+// projection, so large fields never leave the database unless needed),
+// turns each into zero or more bulkWrite operations and writes them in
+// batches. After every batch the last _id is checkpointed; a restarted
+// migration continues from there, so operations must be idempotent.
+//
+// A migration is { name, model, filter, projection, batchSize, plan(doc, { dryRun }) }
+// where plan returns a bulkWrite operation, an array of them, or null.
+// A plan that writes to other collections itself must skip that on dry runs.
+
+function formatRate(count, ms) {
+  return ms > 0 ? Math.round(count / (ms / 1000)) : 0;
+}
+
+/**
+ * Run a migration; resolves with { scanned, modified, resumed, completed }
+ * Options: restart (ignore the checkpoint), dryRun (plan without writing),
+ * batchSize, and signal (an AbortSignal that stops after the current batch).
+ */
+async function runMigration(migration, options = {}) {
+  const { name, model, filter = {}, projection = null } = migration;
+  const batchSize = options.batchSize || migration.batchSize || DEFAULT_BATCH_SIZE;
+  const dryRun = !!options.dryRun;
+
+  // A finished migration starts over on the next run; dry runs always scan everything
+  let checkpoint = dryRun ? null : await MigrationCheckpoint.findOne({ name }).lean();
+  if (options.restart || checkpoint?.completedAt) checkpoint = null;
+  const resumeAfter = checkpoint?.lastId ?? null;
+  if (!dryRun && !checkpoint) {
+    const now = new Date();
+    await MigrationCheckpoint.updateOne(
+      { name },
+      { $set: { lastId: null, scanned: 0, modified: 0, startedAt: now, updatedAt: now, completedAt: null } },
+      { upsert: true }
+    );
+  }
+
+  const resumed = resumeAfter !== null;
+  const query = resumed ? { $and: [filter, { _id: { $gt: resumeAfter } }] } : filter;
+  const remaining = await model.countDocuments(query);
+  console.log(`🚚 ${name}: ${remaining} documents to scan${resumed ? ` (resuming after ${resumeAfter})` : ''}${dryRun ? ' [dry run]' : ''}`);
+
+  const started = Date.now();
+  let lastReport = started;
+  let scanned = 0;
+  let modified = 0;
+  let pendingScanned = 0;
+  let reportedModified = 0;
+  let stopped = false;
+  let batch = [];
+  let lastId = resumeAfter;
+
+  const flush = async () => {
+    if (dryRun) {
+      modified += batch.length;
+    } else if (batch.length > 0) {
+      const result = await model.bulkWrite(batch, { ordered: false });
+      modified += result.modifiedCount + result.upsertedCount + result.deletedCount + result.insertedCount;
+    }
+    batch = [];
+
+    if (!dryRun) {
+      await MigrationCheckpoint.updateOne({ name }, {
+        $set: { lastId, updatedAt: new Date() },
+        $inc: { scanned: pendingScanned, modified: modified - reportedModified }
+      });
+    }
+    pendingScanned = 0;
+    reportedModified = modified;
+
+    if (Date.now() - lastReport >= PROGRESS_INTERVAL_MS) {
+      lastReport = Date.now();
+      const elapsed = lastReport - started;
+      const rate = formatRate(scanned, elapsed);
+      const eta = rate > 0 ? Math.round((remaining - scanned) / rate) : null;
+      const percent = remaining > 0 ? Math.round((scanned / remaining) * 100) : 100;
+      console.log(`📈 ${name}: ${scanned}/${remaining} (${percent}%) ${rate} docs/s, ${modified} modified${eta !== null ? `, ETA ${eta}s` : ''}`);
+    }
+  };
+
+  const cursor = model.find(query, projection).sort({ _id: 1 }).lean().cursor({ batchSize });
+
+  try {
+    for await (const doc of cursor) {
+      const planned = await migration.plan(doc, { dryRun });
+      if (planned) batch.push(...(Array.isArray(planned) ? planned : [planned]));
+      lastId = doc._id;
+      scanned++;
+      pendingScanned++;
+
+      if (pendingScanned >= batchSize || batch.length >= batchSize) {
+        await flush();
+        if (options.signal?.aborted) {
+          stopped = true;
+          break;
+        }
+      }
+    }
+    if (!stopped) await flush();
+  } finally {
+    await cursor.close();
+  }
+
+  const elapsed = Date.now() - started;
+  if (!stopped && !dryRun) {
+    await MigrationCheckpoint.updateOne({ name }, { $set: { completedAt: new Date() } });
+  }
+  console.log(`${stopped ? '⏸️ ' : '✅'} ${name}: scanned ${scanned}, modified ${modified} in ${(elapsed / 1000).toFixed(1)}s (${formatRate(scanned, elapsed)} docs/s)${stopped ? ' - stopped, rerun to resume' : ''}`);
+
+  return { scanned, modified, resumed, completed: !stopped };
+}
+
+module.exports = { runMigration };
@@ -26,6 +26,8 @@ const actorSchema = new mongoose.Schema({
     type: Boolean, 
     default: true // true = visible in store, false = private user actor
   },
+  // Hash of the registry fields last synced into this actor (syncActors)
+  registryHash: { type: String, default: null },
   createdAt: { type: Date, default: Date.now },
   updatedAt: { type: Date, default: Date.now }
 });
@@ -0,0 +1,12 @@
+const mongoose = require('mongoose');
+
+// A user whose cached auth data must be dropped, for API nodes sharing
+// the auth cache (AUTH_CACHE_SHARED=true). Entries expire after an hour.
+const authInvalidationSchema = new mongoose.Schema({
+  userId: { type: String, required: true },
+  createdAt: { type: Date, default: Date.now, expires: 3600 }
+}, {
+  versionKey: false
+});
+
+module.exports = mongoose.model('AuthInvalidation', authInvalidationSchema);
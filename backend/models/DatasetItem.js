@@ -0,0 +1,55 @@
+const mongoose = require('mongoose');
+
+// One scraped item per document, keyed by run and position in the run's dataset
+const datasetItemSchema = new mongoose.Schema({
+  runId: { type: String, required: true },
+  ordinal: { type: Number, required: true },
+  userId: { 
+    type: mongoose.Schema.Types.ObjectId, 
+    ref: 'User',
+    required: true
+  },
+  actorId: { type: String, required: true },
+  data: { type: Object },
+  createdAt: { type: Date, default: Date.now }
+}, {
+  versionKey: false
+});
+
+// Ordered reads of a run's dataset and user-level listings
+datasetItemSchema.index({ runId: 1, ordinal: 1 }, { unique: true });
+datasetItemSchema.index({ userId: 1, createdAt: -1 });
+
+// Ranked full-text search over a user's items. Field names differ between
+// scraper versions (title/name, address/fullAddress, ...), so both spellings
+// are indexed. The text fields are prefixed by userId, so every search
+// query must match userId exactly.
+datasetItemSchema.index({
+  userId: 1,
+  'data.title': 'text',
+  'data.name': 'text',
+  'data.categoryName': 'text',
+  'data.mainCategory': 'text',
+  'data.address': 'text',
+  'data.fullAddress': 'text',
+  'data.city': 'text',
+  'data.emails': 'text',
+  'data.website': 'text'
+}, {
+  name: 'item_search',
+  weights: {
+    'data.title': 10,
+    'data.name': 10,
+    'data.categoryName': 5,
+    'data.mainCategory': 5,
+    'data.city': 4,
+    'data.address': 2,
+    'data.fullAddress': 2,
+    'data.emails': 2,
+    'data.website': 2
+  },
+  // Scraped items may carry their own "language" field
+  language_override: 'searchLanguage'
+});
+
+module.exports = mongoose.model('DatasetItem', datasetItemSchema);
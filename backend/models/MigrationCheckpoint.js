@@ -0,0 +1,17 @@
+const mongoose = require('mongoose');
+
+// Progress of a data migration, so an interrupted run resumes after the
+// last batch it wrote
+const migrationCheckpointSchema = new mongoose.Schema({
+  name: { type: String, required: true, unique: true },
+  lastId: { type: mongoose.Schema.Types.Mixed, default: null },
+  scanned: { type: Number, default: 0 },
+  modified: { type: Number, default: 0 },
+  startedAt: { type: Date, default: Date.now },
+  updatedAt: { type: Date, default: Date.now },
+  completedAt: { type: Date, default: null }
+}, {
+  versionKey: false
+});
+
+module.exports = mongoose.model('MigrationCheckpoint', migrationCheckpointSchema);
@@ -9,19 +9,64 @@ const runSchema = new mongoose.Schema({
     ref: 'User',
     required: true // Runs are ALWAYS user-specific
   },
-  status: { type: String, enum: ['running', 'succeeded', 'failed'], default: 'running' },
+  status: { type: String, enum: ['queued', 'running', 'succeeded', 'failed'], default: 'queued' },
   input: { type: Object },
-  output: { type: Array, default: [] },
+  // Set when the run was started by a schedule
+  scheduleId: { type: String, default: null },
+  // Legacy inline results - new runs store items in the DatasetItem collection
+  output: { type: Array, default: undefined },
+  // Scraper output summary without the items (e.g. searchString, totals)
+  outputMeta: { type: Array, default: undefined },
   resultCount: { type: Number, default: 0 },
+  // Live counters reported by the scraper while the run executes
+  progress: {
+    collected: { type: Number, default: 0 },
+    enriched: { type: Number, default: 0 },
+    failed: { type: Number, default: 0 },
+    updatedAt: { type: Date }
+  },
+  // Cost in USD of the metered compute units
   usage: { type: Number, default: 0 },
+  // Resources metered while the run executed (see utils/runMeter)
+  stats: {
+    wallMs: { type: Number, default: 0 },
+    cpuMs: { type: Number, default: 0 },
+    peakRssBytes: { type: Number, default: 0 },
+    avgRssBytes: { type: Number, default: 0 },
+    pagesLoaded: { type: Number, default: 0 },
+    requests: { type: Number, default: 0 },
+    blockedRequests: { type: Number, default: 0 },
+    transferredBytes: { type: Number, default: 0 },
+    items: { type: Number, default: 0 },
+    computeUnits: { type: Number, default: 0 }
+  },
+  // Span timeline (utils/tracer), served by GET /api/runs/:runId/trace only
+  trace: { type: Object, select: false },
+  // Bumped by every update clients can observe (status, counters, progress);
+  // used as the run's ETag
+  version: { type: Number, default: 0 },
   duration: { type: String },
+  queuedAt: { type: Date, default: Date.now },
   startedAt: { type: Date, default: Date.now },
   finishedAt: { type: Date },
-  error: { type: String }
+  error: { type: String },
+  // Queue bookkeeping - a worker owns a run while its lease is valid
+  lease: {
+    owner: { type: String, default: null },
+    expiresAt: { type: Date, default: null }
+  },
+  attempts: { type: Number, default: 0 }
 });
 
 // Index for efficient user-specific queries
 runSchema.index({ userId: 1, startedAt: -1 });
 runSchema.index({ runId: 1 });
+// Scraped-data listing: newest finished runs first, resultCount for page offsets
+runSchema.index({ userId: 1, status: 1, finishedAt: -1, _id: -1, resultCount: 1 });
+// Active runs per schedule (overlap and concurrency caps)
+runSchema.index({ scheduleId: 1, status: 1 });
+// Indexes for the run queue (claiming queued runs and expired leases)
+runSchema.index({ status: 1, queuedAt: 1 });
+runSchema.index({ status: 1, 'lease.expiresAt': 1 });
 
-module.exports = mongoose.model('Run', runSchema);
\ No newline at end of file
+module.exports = mongoose.model('Run', runSchema);
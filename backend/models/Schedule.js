@@ -0,0 +1,44 @@
+const mongoose = require('mongoose');
+
+// A recurring run of one actor with a fixed input
+const scheduleSchema = new mongoose.Schema({
+  scheduleId: { type: String, required: true, unique: true },
+  userId: { 
+    type: mongoose.Schema.Types.ObjectId, 
+    ref: 'User',
+    required: true
+  },
+  name: { type: String, required: true, trim: true },
+  actorId: { type: String, required: true },
+  actorName: { type: String, required: true },
+  input: { type: Object, default: {} },
+  // 5-field cron expression, evaluated in UTC
+  cron: { type: String, required: true },
+  enabled: { type: Boolean, default: true },
+  // Each run starts a random 0..jitterSecs after its cron time, so schedules
+  // sharing a cron expression do not all hit the browser pool at once
+  jitterSecs: { type: Number, default: 0, min: 0 },
+  // Fires missed while no scheduler was running (or deferred past the grace
+  // period): skip them, run once, or run each one (bounded)
+  catchUp: { type: String, enum: ['skip', 'once', 'all'], default: 'once' },
+  // When maxConcurrentRuns runs of this schedule are still queued/running:
+  // skip the fire, or delay it until one finishes
+  overlap: { type: String, enum: ['skip', 'delay'], default: 'skip' },
+  maxConcurrentRuns: { type: Number, default: 1, min: 1 },
+  // nextFireAt is the cron time, nextRunAt the jittered time the scheduler acts on
+  nextFireAt: { type: Date, default: null },
+  nextRunAt: { type: Date, default: null },
+  lastRunAt: { type: Date, default: null },
+  lastRunId: { type: String, default: null },
+  runCount: { type: Number, default: 0 },
+  skippedCount: { type: Number, default: 0 },
+  lastError: { type: String, default: null },
+  createdAt: { type: Date, default: Date.now },
+  updatedAt: { type: Date, default: Date.now }
+});
+
+scheduleSchema.index({ userId: 1, createdAt: -1 });
+// Due schedules for the scheduler tick
+scheduleSchema.index({ enabled: 1, nextRunAt: 1 });
+
+module.exports = mongoose.model('Schedule', scheduleSchema);
@@ -33,7 +33,9 @@ const userSchema = new mongoose.Schema({
     enum: ['free', 'starter', 'scale', 'business', 'enterprise'],
     default: 'free'
   },
+  // Rolled up from the metered stats of finished runs
   usage: {
+    // Peak Chromium memory attributed to a single run
     ramUsedMB: {
       type: Number,
       default: 0
@@ -53,6 +55,30 @@ const userSchema = new mongoose.Schema({
     storageUsedMB: {
       type: Number,
       default: 0
+    },
+    computeUnits: {
+      type: Number,
+      default: 0
+    },
+    cpuMs: {
+      type: Number,
+      default: 0
+    },
+    runs: {
+      type: Number,
+      default: 0
+    },
+    pagesLoaded: {
+      type: Number,
+      default: 0
+    },
+    transferredBytes: {
+      type: Number,
+      default: 0
+    },
+    items: {
+      type: Number,
+      default: 0
     }
   },
   apiTokens: [{
@@ -4,6 +4,7 @@ const Actor = require('../models/Actor');
 const Run = require('../models/Run');
 const User = require('../models/User');
 const authMiddleware = require('../middleware/auth');
+const authCache = require('../utils/authCache');
 const { getInputFields, getOutputFields } = require('../actors/registry');
 
 // Get all actors (protected)
@@ -128,6 +129,7 @@ router.patch('/:actorId/bookmark', authMiddleware, async (req, res) => {
     }
     
     await user.save();
+    await authCache.invalidateUser(user._id);
     
     res.json({ 
       actorId: req.params.actorId,
@@ -4,6 +4,7 @@ const jwt = require('jsonwebtoken');
 const { v4: uuidv4 } = require('uuid');
 const User = require('../models/User');
 const authMiddleware = require('../middleware/auth');
+const authCache = require('../utils/authCache');
 
 const router = express.Router();
 const JWT_SECRET = process.env.JWT_SECRET || 'scrapi-jwt-secret-key-change-in-production';
@@ -98,6 +99,7 @@ router.post('/login', async (req, res) => {
     // Update last login
     user.lastLogin = new Date();
     await user.save();
+    await authCache.invalidateUser(user._id);
 
     // Generate JWT token
     const token = jwt.sign(
@@ -156,7 +158,7 @@ router.get('/me', authMiddleware, async (req, res) => {
 router.put('/profile', authMiddleware, async (req, res) => {
   try {
     const { fullName, username } = req.body;
-    const user = req.user;
+    const user = await User.findById(req.userId);
 
     if (username && username !== user.username) {
       // Check if username is already taken
@@ -172,6 +174,7 @@ router.put('/profile', authMiddleware, async (req, res) => {
     }
 
     await user.save();
+    await authCache.invalidateUser(user._id);
 
     const userData = {
       id: user._id,
@@ -217,6 +220,7 @@ router.put('/password', authMiddleware, async (req, res) => {
     // Hash and save new password
     user.password = await bcrypt.hash(newPassword, 10);
     await user.save();
+    await authCache.invalidateUser(user._id);
 
     res.json({ message: 'Password changed successfully' });
   } catch (error) {
@@ -246,6 +250,7 @@ router.post('/api-tokens', authMiddleware, async (req, res) => {
     });
 
     await user.save();
+    await authCache.invalidateUser(user._id);
 
     res.status(201).json({
       message: 'API token created successfully',
@@ -290,6 +295,7 @@ router.delete('/api-tokens/:tokenId', authMiddleware, async (req, res) => {
 
     user.apiTokens = user.apiTokens.filter(t => t._id.toString() !== tokenId);
     await user.save();
+    await authCache.invalidateUser(user._id);
 
     res.json({ message: 'API token deleted successfully' });
   } catch (error) {
@@ -310,6 +316,7 @@ router.put('/notifications', authMiddleware, async (req, res) => {
     if (billing !== undefined) user.notifications.billing = billing;
 
     await user.save();
+    await authCache.invalidateUser(user._id);
 
     res.json({
       message: 'Notification preferences updated successfully',
@@ -2,10 +2,43 @@ const express = require('express');
 const router = express.Router();
 const Run = require('../models/Run');
 const Actor = require('../models/Actor');
-const { v4: uuidv4 } = require('uuid');
-const { getScraperFunction } = require('../actors/registry');
+const runQueue = require('../utils/runQueue');
+const datasetStore = require('../utils/datasetStore');
+const datasetExport = require('../utils/datasetExport');
+const runEvents = require('../utils/runEvents');
+const tracer = require('../utils/tracer');
+
+const MAX_WAIT_FOR_FINISH_SECS = 60;
+const SSE_HEARTBEAT_MS = 15000;
 const authMiddleware = require('../middleware/auth');
 
+const STATUS_FIELDS = 'runId status resultCount progress version startedAt finishedAt duration error';
+
+/**
+ * Tag a run response with its version; returns true (after sending a 304)
+ * when the client's cached copy is still current. Each representation of
+ * the run gets its own tag.
+ */
+function notModified(req, res, run, variant) {
+  res.set({
+    'ETag': `"${run.runId}-${run.version || 0}-${variant}"`,
+    'Cache-Control': 'private, no-cache'
+  });
+  if (!req.fresh) return false;
+  res.status(304).end();
+  return true;
+}
+
+/**
+ * Long-poll helper shared by the run and status endpoints
+ */
+async function waitIfRequested(req) {
+  const waitSecs = Math.min(MAX_WAIT_FOR_FINISH_SECS, parseInt(req.query.waitForFinish) || 0);
+  if (waitSecs > 0) {
+    await runEvents.waitForFinish(req.params.runId, req.userId, waitSecs * 1000);
+  }
+}
+
 // Get all runs (protected - user-specific)
 router.get('/', authMiddleware, async (req, res) => {
   try {
@@ -17,6 +50,7 @@ router.get('/', authMiddleware, async (req, res) => {
     
     const skip = (parseInt(page) - 1) * parseInt(limit);
     const runs = await Run.find(query)
+      .select('-output -outputMeta')
       .sort({ startedAt: -1 })
       .limit(parseInt(limit))
       .skip(skip);
@@ -38,112 +72,229 @@ router.get('/', authMiddleware, async (req, res) => {
 });
 
 // Get run by ID (protected - user-specific)
+// ?includeOutput=false returns only the run and its output summary (outputMeta);
+// use /:runId/items to page through the results
+// ?waitForFinish=N long-polls up to N seconds (max 60) for the run to finish
+// Honors If-None-Match: the version is checked before the run body is loaded
 router.get('/:runId', authMiddleware, async (req, res) => {
   try {
-    const run = await Run.findOne({ 
+    await waitIfRequested(req);
+    
+    const filter = {
       runId: req.params.runId,
       userId: req.userId // Only user's runs
-    });
+    };
+    const includeOutput = req.query.includeOutput !== 'false';
+    if (req.headers['if-none-match']) {
+      const current = await Run.findOne(filter, { runId: 1, version: 1 }).lean();
+      if (!current) return res.status(404).json({ error: 'Run not found' });
+      if (notModified(req, res, current, includeOutput ? 'full' : 'summary')) return;
+    }
+    
+    const run = await Run.findOne(filter);
     if (!run) return res.status(404).json({ error: 'Run not found' });
-    res.json(run);
+    if (notModified(req, res, run, includeOutput ? 'full' : 'summary')) return;
+    
+    const runData = run.toObject();
+    // Lease renewals do not bump the version, so keep them out of the body
+    delete runData.lease;
+    if (!includeOutput) {
+      if (datasetStore.isLegacyRun(run)) runData.outputMeta = datasetStore.splitOutput(run.output).meta;
+      delete runData.output;
+      return res.json(runData);
+    }
+    
+    // Items live in the dataset collection; rebuild the output for clients
+    runData.output = await datasetStore.hydrateOutput(run);
+    delete runData.outputMeta;
+    res.json(runData);
   } catch (error) {
     res.status(500).json({ error: error.message });
   }
 });
 
-// Create and execute a run (protected)
-router.post('/', authMiddleware, async (req, res) => {
+// Lightweight run status: status, counters, progress and version
+// (protected - user-specific). Supports waitForFinish and If-None-Match.
+router.get('/:runId/status', authMiddleware, async (req, res) => {
   try {
-    const { actorId, input } = req.body;
+    await waitIfRequested(req);
     
-    // Find actor
-    const actor = await Actor.findOne({ actorId });
-    if (!actor) return res.status(404).json({ error: 'Actor not found' });
+    const run = await Run.findOne(
+      { runId: req.params.runId, userId: req.userId },
+      STATUS_FIELDS
+    ).lean();
+    if (!run) return res.status(404).json({ error: 'Run not found' });
+    if (notModified(req, res, run, 'status')) return;
     
-    // Check if user has access to this actor
-    if (!actor.isPublic && actor.userId && actor.userId.toString() !== req.userId) {
-      return res.status(403).json({ error: 'Access denied to this actor' });
-    }
+    delete run._id;
+    res.json(run);
+  } catch (error) {
+    res.status(500).json({ error: error.message });
+  }
+});
+
+// Stream run status as Server-Sent Events (protected - user-specific)
+// Emits a 'status' event on every change (status, counters, progress) and
+// closes the stream once the run has finished
+router.get('/:runId/events', authMiddleware, async (req, res) => {
+  try {
+    const initial = await runEvents.snapshot(req.params.runId, req.userId);
+    if (!initial) return res.status(404).json({ error: 'Run not found' });
     
-    // Create run with userId
-    const run = new Run({
-      runId: uuidv4(),
-      actorId,
-      actorName: actor.name,
-      userId: req.userId, // Set user ownership
-      input,
-      status: 'running'
+    res.set({
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache',
+      'Connection': 'keep-alive',
+      'X-Accel-Buffering': 'no'
     });
+    res.flushHeaders();
     
-    await run.save();
+    let lastCount = 0;
+    let stop = null;
+    const heartbeat = setInterval(() => res.write(': ping\n\n'), SSE_HEARTBEAT_MS);
+    const close = () => {
+      clearInterval(heartbeat);
+      if (stop) stop();
+    };
+    req.on('close', close);
     
-    // Execute scraper asynchronously (fire and forget)
-    executeScraper(run._id, actorId, input).catch(err => {
-      console.error('Scraper error:', err);
+    stop = runEvents.watch(req.params.runId, req.userId, run => {
+      const payload = {
+        runId: run.runId,
+        status: run.status,
+        resultCount: run.resultCount,
+        newItems: Math.max(0, run.resultCount - lastCount),
+        progress: run.progress || {},
+        version: run.version || 0,
+        finishedAt: run.finishedAt || null,
+        duration: run.duration || null,
+        error: run.error || null
+      };
+      lastCount = run.resultCount;
+      res.write(`event: status\ndata: ${JSON.stringify(payload)}\n\n`);
+      
+      if (runEvents.isTerminal(run.status)) {
+        close();
+        res.end();
+      }
     });
+  } catch (error) {
+    if (res.headersSent) return res.end();
+    res.status(500).json({ error: error.message });
+  }
+});
+
+// Get a page of run items (protected - user-specific)
+// ?offset=0&limit=100&fields=name,city,location.lat
+router.get('/:runId/items', authMiddleware, async (req, res) => {
+  try {
+    const run = await Run.findOne(
+      { runId: req.params.runId, userId: req.userId },
+      { runId: 1, resultCount: 1, output: 1 }
+    );
+    if (!run) return res.status(404).json({ error: 'Run not found' });
     
-    res.status(201).json(run);
+    const { offset, limit, fields } = datasetStore.parseItemsQuery(req.query);
+    const { items, total } = await datasetStore.getItems(run, { offset, limit, fields });
+    
+    res.json({
+      items,
+      total,
+      offset,
+      limit,
+      count: items.length
+    });
   } catch (error) {
-    res.status(400).json({ error: error.message });
+    res.status(500).json({ error: error.message });
   }
 });
 
-// Execute scraper function
-async function executeScraper(runDbId, actorId, input) {
-  const startTime = Date.now();
-  
+// Top-level keys of every run item, in order of first appearance (protected - user-specific);
+// the column list of a CSV export, and the schema of client-side Parquet exports
+router.get('/:runId/items/keys', authMiddleware, async (req, res) => {
   try {
-    const run = await Run.findById(runDbId);
-    if (!run) return;
+    const run = await Run.findOne(
+      { runId: req.params.runId, userId: req.userId },
+      { runId: 1, output: 1 }
+    );
+    if (!run) return res.status(404).json({ error: 'Run not found' });
     
-    // Get scraper function from registry
-    const scraperFunc = getScraperFunction(actorId);
-    if (!scraperFunc) {
-      throw new Error(`No scraper implementation found for actor: ${actorId}`);
+    res.json({ keys: await datasetStore.itemKeys(run) });
+  } catch (error) {
+    res.status(500).json({ error: error.message });
+  }
+});
+
+// Stream every run item as a download (protected - user-specific)
+// ?format=ndjson|csv&fields=name,city,location.lat
+router.get('/:runId/items/export', authMiddleware, async (req, res) => {
+  try {
+    const format = String(req.query.format || 'ndjson').toLowerCase();
+    if (!datasetExport.FORMATS[format]) {
+      return res.status(400).json({ error: `Unsupported format "${format}". Use ndjson or csv` });
     }
     
-    // Execute scraper
-    const results = await scraperFunc(input);
-    
-    // Update run with results
-    const duration = Math.round((Date.now() - startTime) / 1000);
-    run.status = 'succeeded';
-    run.output = results;
-    
-    // Calculate actual result count - check if results have a nested 'results' array
-    let actualResultCount = results.length;
-    if (results.length > 0 && results[0].results && Array.isArray(results[0].results)) {
-      // If output has results array, count items in those arrays
-      actualResultCount = results.reduce((total, item) => {
-        return total + (item.results ? item.results.length : 0);
-      }, 0);
+    const run = await Run.findOne(
+      { runId: req.params.runId, userId: req.userId },
+      { runId: 1, resultCount: 1, output: 1 }
+    );
+    if (!run) return res.status(404).json({ error: 'Run not found' });
+    
+    const { fields } = datasetStore.parseItemsQuery(req.query);
+    await datasetExport.streamExport(run, res, { format, fields });
+  } catch (error) {
+    // Mid-stream failures can only be signalled by cutting the connection
+    if (res.headersSent) return res.destroy();
+    res.status(500).json({ error: error.message });
+  }
+});
+
+// Span timeline of a run in Chrome trace format; open it in Perfetto
+// (ui.perfetto.dev), chrome://tracing or speedscope
+router.get('/:runId/trace', authMiddleware, async (req, res) => {
+  try {
+    const run = await Run.findOne(
+      { runId: req.params.runId, userId: req.userId },
+      { runId: 1, actorId: 1, actorName: 1, status: 1, trace: 1 }
+    );
+    if (!run) return res.status(404).json({ error: 'Run not found' });
+    if (!run.trace) return res.status(404).json({ error: 'No trace recorded for this run' });
+    
+    if (req.query.download === 'true') {
+      res.setHeader('Content-Disposition', `attachment; filename="trace-${run.runId}.json"`);
     }
-    run.resultCount = actualResultCount;
+    res.json(tracer.toChromeTrace(run.trace, {
+      runId: run.runId,
+      actorId: run.actorId,
+      actorName: run.actorName,
+      status: run.status
+    }));
+  } catch (error) {
+    res.status(500).json({ error: error.message });
+  }
+});
+
+// Create and queue a run (protected)
+router.post('/', authMiddleware, async (req, res) => {
+  try {
+    const { actorId, input } = req.body;
     
-    run.duration = `${duration}s`;
-    run.finishedAt = new Date();
-    run.usage = parseFloat((Math.random() * 0.5).toFixed(2));
+    // Find actor
+    const actor = await Actor.findOne({ actorId });
+    if (!actor) return res.status(404).json({ error: 'Actor not found' });
     
-    await run.save();
+    // Check if user has access to this actor
+    if (!actor.isPublic && actor.userId && actor.userId.toString() !== req.userId) {
+      return res.status(403).json({ error: 'Access denied to this actor' });
+    }
     
-    // Update actor stats
-    await Actor.updateOne(
-      { actorId },
-      { $inc: { 'stats.runs': 1 } }
-    );
+    // Queue run with userId - the worker pool picks it up when a slot frees
+    const run = await runQueue.enqueue({ actor, userId: req.userId, input });
     
+    res.status(201).json(run);
   } catch (error) {
-    console.error('Scraper execution error:', error);
-    const run = await Run.findById(runDbId);
-    if (run) {
-      run.status = 'failed';
-      run.error = error.message;
-      run.finishedAt = new Date();
-      const duration = Math.round((Date.now() - startTime) / 1000);
-      run.duration = `${duration}s`;
-      await run.save();
-    }
+    res.status(400).json({ error: error.message });
   }
-}
+});
 
 module.exports = router;
\ No newline at end of file
@@ -0,0 +1,124 @@
+const express = require('express');
+const router = express.Router();
+const { v4: uuidv4 } = require('uuid');
+const Schedule = require('../models/Schedule');
+const Actor = require('../models/Actor');
+const authMiddleware = require('../middleware/auth');
+const scheduler = require('../utils/scheduler');
+const { parseCron, upcoming } = require('../utils/cron');
+
+const EDITABLE_FIELDS = ['name', 'input', 'cron', 'enabled', 'jitterSecs', 'catchUp', 'overlap', 'maxConcurrentRuns'];
+
+/**
+ * Editable fields from a request body; throws on an invalid cron expression
+ */
+function scheduleFields(body) {
+  const fields = {};
+  EDITABLE_FIELDS.forEach(key => {
+    if (body[key] !== undefined) fields[key] = body[key];
+  });
+  if (fields.cron !== undefined) fields.cron = parseCron(fields.cron).source;
+  return fields;
+}
+
+/**
+ * Actor the user may schedule, or null
+ */
+async function findUsableActor(actorId, userId) {
+  const actor = await Actor.findOne({ actorId });
+  if (!actor) return null;
+  if (!actor.isPublic && actor.userId && actor.userId.toString() !== userId) return null;
+  return actor;
+}
+
+// Preview the next fire times of a cron expression (protected)
+// ?cron=*/30 * * * *&count=5
+router.get('/preview', authMiddleware, async (req, res) => {
+  try {
+    const count = Math.min(Math.max(parseInt(req.query.count) || 5, 1), 20);
+    res.json({ cron: req.query.cron, nextRuns: upcoming(req.query.cron, count) });
+  } catch (error) {
+    res.status(400).json({ error: error.message });
+  }
+});
+
+// Get all schedules (protected - user-specific)
+router.get('/', authMiddleware, async (req, res) => {
+  try {
+    const schedules = await Schedule.find({ userId: req.userId }).sort({ createdAt: -1 });
+    res.json({ schedules });
+  } catch (error) {
+    res.status(500).json({ error: error.message });
+  }
+});
+
+// Get schedule by ID (protected - user-specific)
+router.get('/:scheduleId', authMiddleware, async (req, res) => {
+  try {
+    const schedule = await Schedule.findOne({ scheduleId: req.params.scheduleId, userId: req.userId });
+    if (!schedule) return res.status(404).json({ error: 'Schedule not found' });
+    res.json(schedule);
+  } catch (error) {
+    res.status(500).json({ error: error.message });
+  }
+});
+
+// Create schedule (protected)
+router.post('/', authMiddleware, async (req, res) => {
+  try {
+    const actor = await findUsableActor(req.body.actorId, req.userId);
+    if (!actor) return res.status(404).json({ error: 'Actor not found' });
+
+    const fields = scheduleFields(req.body);
+    if (!fields.cron) return res.status(400).json({ error: 'A cron expression is required' });
+
+    const schedule = new Schedule({
+      ...fields,
+      name: fields.name || actor.name,
+      scheduleId: uuidv4(),
+      userId: req.userId,
+      actorId: actor.actorId,
+      actorName: actor.name
+    });
+    Object.assign(schedule, scheduler.planNext(schedule));
+    await schedule.save();
+
+    res.status(201).json(schedule);
+  } catch (error) {
+    res.status(400).json({ error: error.message });
+  }
+});
+
+// Update schedule (protected - user-specific)
+router.put('/:scheduleId', authMiddleware, async (req, res) => {
+  try {
+    const schedule = await Schedule.findOne({ scheduleId: req.params.scheduleId, userId: req.userId });
+    if (!schedule) return res.status(404).json({ error: 'Schedule not found' });
+
+    const fields = scheduleFields(req.body);
+    const timingChanged = ['cron', 'jitterSecs', 'enabled'].some(
+      key => fields[key] !== undefined && fields[key] !== schedule[key]
+    );
+    Object.assign(schedule, fields, { updatedAt: new Date() });
+    // Re-plan from now so a re-enabled schedule does not catch up on the paused period
+    if (timingChanged) Object.assign(schedule, scheduler.planNext(schedule));
+    await schedule.save();
+
+    res.json(schedule);
+  } catch (error) {
+    res.status(400).json({ error: error.message });
+  }
+});
+
+// Delete schedule (protected - user-specific); runs already started are kept
+router.delete('/:scheduleId', authMiddleware, async (req, res) => {
+  try {
+    const { deletedCount } = await Schedule.deleteOne({ scheduleId: req.params.scheduleId, userId: req.userId });
+    if (deletedCount === 0) return res.status(404).json({ error: 'Schedule not found' });
+    res.json({ message: 'Schedule deleted successfully' });
+  } catch (error) {
+    res.status(500).json({ error: error.message });
+  }
+});
+
+module.exports = router;
@@ -1,69 +1,214 @@
 const express = require('express');
+const mongoose = require('mongoose');
 const router = express.Router();
 const Run = require('../models/Run');
 const authMiddleware = require('../middleware/auth');
+const datasetStore = require('../utils/datasetStore');
 
-// Get all scraped data (from successful runs with output)
-router.get('/', authMiddleware, async (req, res) => {
+const MAX_LIMIT = 100;
+const LISTING_SORT = { finishedAt: -1, _id: -1 };
+const RUN_META = { runId: 1, actorId: 1, actorName: 1, finishedAt: 1, usage: 1, resultCount: 1 };
+
+// Item-level listing across a user's finished runs.
+// Items are ordered by run (newest finishedAt first) and then by ordinal, and
+// a position in that order is the keyset { finishedAt, run _id, ordinal }.
+// A page is read from the (runId, ordinal) index of as many runs as it spans,
+// so deep pages never skip over items; page numbers are turned into a
+// keyset by summing resultCount over run headers only.
+
+function encodeCursor(position) {
+  return Buffer.from(JSON.stringify(position)).toString('base64url');
+}
+
+function decodeCursor(cursor) {
   try {
-    const { actorId, search, limit = 20, page = 1 } = req.query;
-    
-    // Query for successful runs with output data
-    let query = { 
-      userId: req.userId,
-      status: 'succeeded',
-      resultCount: { $gt: 0 }
-    };
-    
-    if (actorId) query.actorId = actorId;
-    
-    const skip = (parseInt(page) - 1) * parseInt(limit);
-    const runs = await Run.find(query)
-      .sort({ finishedAt: -1 })
-      .limit(parseInt(limit))
-      .skip(skip);
-    
-    // Transform runs into scraped data records
-    const scrapedDataRecords = [];
-    
-    runs.forEach(run => {
-      if (run.output && Array.isArray(run.output)) {
-        run.output.forEach((item, index) => {
-          scrapedDataRecords.push({
-            id: `${run.runId}-${index}`,
-            runId: run.runId,
-            actorId: run.actorId,
-            actorName: run.actorName,
-            dataItem: item,
-            scrapedAt: run.finishedAt,
-            usage: run.usage,
-            itemIndex: index + 1,
-            totalItems: run.output.length
-          });
+    const { f, id, o } = JSON.parse(Buffer.from(String(cursor), 'base64url').toString('utf8'));
+    if (!mongoose.Types.ObjectId.isValid(id) || !Number.isInteger(o) || o < 0) return null;
+    return { finishedAt: f ? new Date(f) : null, runId: new mongoose.Types.ObjectId(id), ordinal: o };
+  } catch (err) {
+    return null;
+  }
+}
+
+function listingQuery(userId, actorId) {
+  const query = {
+    userId: new mongoose.Types.ObjectId(userId),
+    status: 'succeeded',
+    resultCount: { $gt: 0 }
+  };
+  if (actorId) query.actorId = actorId;
+  return query;
+}
+
+/**
+ * Runs at or after a keyset position, in listing order
+ */
+function runsFrom(query, position) {
+  if (!position) return query;
+  return {
+    ...query,
+    $or: [
+      { finishedAt: { $lt: position.finishedAt } },
+      { finishedAt: position.finishedAt, _id: { $lte: position.runId } }
+    ]
+  };
+}
+
+/**
+ * Keyset position of the item at an absolute offset (walks run headers only)
+ */
+async function positionAt(query, offset) {
+  let before = 0;
+  const cursor = Run.find(query, { finishedAt: 1, resultCount: 1 }).sort(LISTING_SORT).lean().cursor();
+  try {
+    for await (const run of cursor) {
+      if (before + run.resultCount > offset) {
+        return { finishedAt: run.finishedAt, runId: run._id, ordinal: offset - before };
+      }
+      before += run.resultCount;
+    }
+  } finally {
+    await cursor.close();
+  }
+  return null;
+}
+
+/**
+ * Up to `limit` items starting at a keyset position, plus the next position
+ */
+async function listItems(query, position, limit) {
+  const records = [];
+  let next = null;
+  const cursor = Run.find(runsFrom(query, position), { ...RUN_META, output: 1 })
+    .sort(LISTING_SORT)
+    .cursor();
+  
+  try {
+    for await (const run of cursor) {
+      const start = position && run._id.equals(position.runId) ? position.ordinal : 0;
+      const take = Math.min(limit - records.length, run.resultCount - start);
+      if (take <= 0) continue;
+      
+      const { items } = await datasetStore.getItems(run, { offset: start, limit: take, fields: [] });
+      items.forEach((item, index) => {
+        records.push({
+          id: `${run.runId}-${start + index}`,
+          runId: run.runId,
+          actorId: run.actorId,
+          actorName: run.actorName,
+          dataItem: item,
+          scrapedAt: run.finishedAt,
+          usage: run.usage,
+          itemIndex: start + index + 1,
+          totalItems: run.resultCount
         });
+      });
+      
+      if (records.length >= limit) {
+        next = { f: run.finishedAt, id: String(run._id), o: start + items.length };
+        break;
       }
-    });
+    }
+  } finally {
+    await cursor.close();
+  }
+  
+  return { records, nextCursor: next ? encodeCursor(next) : null };
+}
+
+/**
+ * Total items across the listing, from the runs' maintained resultCount
+ */
+async function countItems(query) {
+  const [row] = await Run.aggregate([
+    { $match: query },
+    { $group: { _id: null, total: { $sum: '$resultCount' } } }
+  ]);
+  return row ? row.total : 0;
+}
+
+/**
+ * Ranked item search backed by the item_search text index
+ */
+async function searchScrapedData(userId, { search, actorId, page, limit }) {
+  const { items, total } = await datasetStore.searchItems(userId, search, {
+    actorId,
+    offset: (page - 1) * limit,
+    limit
+  });
+  
+  const runIds = [...new Set(items.map(item => item.runId))];
+  const runs = await Run.find(
+    { runId: { $in: runIds }, userId },
+    { runId: 1, actorId: 1, actorName: 1, finishedAt: 1, usage: 1, resultCount: 1 }
+  ).lean();
+  const runsById = new Map(runs.map(run => [run.runId, run]));
+  
+  const records = items.map(item => {
+    const run = runsById.get(item.runId) || {};
+    return {
+      id: `${item.runId}-${item.ordinal}`,
+      runId: item.runId,
+      actorId: item.actorId,
+      actorName: run.actorName,
+      dataItem: item.data,
+      scrapedAt: run.finishedAt,
+      usage: run.usage,
+      itemIndex: item.ordinal + 1,
+      totalItems: run.resultCount,
+      score: item.score
+    };
+  });
+  
+  return { records, total };
+}
+
+// Get all scraped items (from successful runs with output), newest runs first
+// ?page=&limit= or ?cursor=<pagination.nextCursor>&limit= for deep pages;
+// ?search= runs a ranked full-text search over the user's items
+router.get('/', authMiddleware, async (req, res) => {
+  try {
+    const { actorId } = req.query;
+    const search = (req.query.search || '').trim();
+    const limit = Math.min(Math.max(parseInt(req.query.limit) || 20, 1), MAX_LIMIT);
+    const page = Math.max(parseInt(req.query.page) || 1, 1);
     
-    // Apply search filter if provided
-    let filteredRecords = scrapedDataRecords;
     if (search) {
-      const searchLower = search.toLowerCase();
-      filteredRecords = scrapedDataRecords.filter(record => {
-        const dataString = JSON.stringify(record.dataItem).toLowerCase();
-        return dataString.includes(searchLower) || 
-               record.actorName.toLowerCase().includes(searchLower);
+      const { records, total } = await searchScrapedData(req.userId, { search, actorId, page, limit });
+      return res.json({
+        data: records,
+        pagination: {
+          page,
+          limit,
+          total,
+          pages: Math.ceil(total / limit)
+        }
       });
     }
     
-    const total = filteredRecords.length;
+    const query = listingQuery(req.userId, actorId);
+    let position = null;
+    if (req.query.cursor) {
+      position = decodeCursor(req.query.cursor);
+      if (!position) return res.status(400).json({ error: 'Invalid cursor' });
+    } else if (page > 1) {
+      position = await positionAt(query, (page - 1) * limit);
+    }
+    
+    // A page number past the end has no position and no items
+    const [total, listing] = await Promise.all([
+      countItems(query),
+      position || page === 1 ? listItems(query, position, limit) : { records: [], nextCursor: null }
+    ]);
     
     res.json({
-      data: filteredRecords,
+      data: listing.records,
       pagination: {
-        page: parseInt(page),
-        limit: parseInt(limit),
+        page,
+        limit,
         total,
-        pages: Math.ceil(total / parseInt(limit))
+        pages: Math.ceil(total / limit),
+        nextCursor: listing.nextCursor
       }
     });
   } catch (error) {
@@ -72,7 +217,7 @@ router.get('/', authMiddleware, async (req, res) => {
   }
 });
 
-// Get scraped data by run ID
+// Get scraped data by run ID, one page at a time (?offset=&limit=&fields=)
 router.get('/:runId', authMiddleware, async (req, res) => {
   try {
     const run = await Run.findOne({ 
@@ -84,16 +229,24 @@ router.get('/:runId', authMiddleware, async (req, res) => {
       return res.status(404).json({ error: 'Run not found' });
     }
     
-    if (run.status !== 'succeeded' || !run.output) {
+    if (run.status !== 'succeeded') {
       return res.status(404).json({ error: 'No scraped data available for this run' });
     }
     
+    const { offset, limit, fields } = datasetStore.parseItemsQuery(req.query);
+    const { items, total } = await datasetStore.getItems(run, { offset, limit, fields });
+    
     res.json({
       runId: run.runId,
       actorId: run.actorId,
       actorName: run.actorName,
-      data: run.output,
+      data: items,
       resultCount: run.resultCount,
+      pagination: {
+        offset,
+        limit,
+        total
+      },
       finishedAt: run.finishedAt,
       usage: run.usage
     });
@@ -1,7 +1,7 @@
 const browserManager = require('../utils/browserManager');
 
 // Amazon Scraper with Puppeteer - Comprehensive product data
-async function amazonScraperV2(input) {
+async function amazonScraperV2(input, options = {}) {
   const { query, maxResults = 20, domain = 'amazon.com' } = input;
   
   if (!query) throw new Error('Query is required');
@@ -9,7 +9,7 @@ async function amazonScraperV2(input) {
   let page = null;
   
   try {
-    page = await browserManager.getPage(false);
+    page = await browserManager.getPage(false, options.resourceBlocking);
     
     // Build search URL
     const searchUrl = `https://www.${domain}/s?k=${encodeURIComponent(query)}`;
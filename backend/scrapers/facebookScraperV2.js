@@ -1,7 +1,7 @@
 const browserManager = require('../utils/browserManager');
 
 // Facebook Scraper with Puppeteer - Page and posts data
-async function facebookScraperV2(input) {
+async function facebookScraperV2(input, options = {}) {
   const { pageUrl, maxPosts = 30 } = input;
   
   if (!pageUrl) throw new Error('Page URL is required');
@@ -9,7 +9,7 @@ async function facebookScraperV2(input) {
   let page = null;
   
   try {
-    page = await browserManager.getPage(false);
+    page = await browserManager.getPage(false, options.resourceBlocking);
     
     console.log(`Navigating to: ${pageUrl}`);
     
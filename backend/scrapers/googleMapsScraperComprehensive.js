@@ -5,7 +5,7 @@ const browserManager = require('../utils/browserManager');
  * Extracts 50+ fields including detailed business information, 
  * service options, amenities, opening hours, reviews, and more
  */
-async function googleMapsScraperComprehensive(input) {
+async function googleMapsScraperComprehensive(input, options = {}) {
   const { query, location = 'United States', maxResults = 20 } = input;
   
   if (!query) throw new Error('Query is required');
@@ -13,7 +13,7 @@ async function googleMapsScraperComprehensive(input) {
   let page = null;
   
   try {
-    page = await browserManager.getPage(false);
+    page = await browserManager.getPage(false, options.resourceBlocking);
     
     // Build search URL
     const searchQuery = `${query} ${location}`;
@@ -5,7 +5,7 @@ const browserManager = require('../utils/browserManager');
  * Extracts 50+ fields including detailed additionalInfo, accessibility, amenities,
  * service options, and social media links from business websites
  */
-async function googleMapsScraperEnhanced(input) {
+async function googleMapsScraperEnhanced(input, options = {}) {
   const { query, location = 'United States', maxResults = 5 } = input;
   
   if (!query) throw new Error('Query is required');
@@ -13,7 +13,7 @@ async function googleMapsScraperEnhanced(input) {
   let page = null;
   
   try {
-    page = await browserManager.getPage(false);
+    page = await browserManager.getPage(false, options.resourceBlocking);
     
     // Build search URL
     const searchQuery = `${query} ${location}`;
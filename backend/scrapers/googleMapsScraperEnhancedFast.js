@@ -7,7 +7,7 @@ const browserManager = require('../utils/browserManager');
  * - Visits individual pages ONLY for top N results (configurable)
  * - Uses modern selectors and direct URL navigation
  */
-async function googleMapsScraperEnhancedFast(input) {
+async function googleMapsScraperEnhancedFast(input, options = {}) {
   const { query, location = 'United States', maxResults = 10, detailedResults = 5 } = input;
   
   if (!query) throw new Error('Query is required');
@@ -15,7 +15,7 @@ async function googleMapsScraperEnhancedFast(input) {
   let page = null;
   
   try {
-    page = await browserManager.getPage(false);
+    page = await browserManager.getPage(false, options.resourceBlocking);
     
     // Build search URL
     const searchQuery = `${query} ${location}`;
@@ -5,7 +5,7 @@ const browserManager = require('../utils/browserManager');
  * Does NOT visit individual business pages for maximum speed
  * Perfect for getting quick results with basic information
  */
-async function googleMapsScraperFast(input) {
+async function googleMapsScraperFast(input, options = {}) {
   const { query, location = 'United States', maxResults = 10 } = input;
   
   if (!query) throw new Error('Query is required');
@@ -13,7 +13,7 @@ async function googleMapsScraperFast(input) {
   let page = null;
   
   try {
-    page = await browserManager.getPage(false);
+    page = await browserManager.getPage(false, options.resourceBlocking);
     
     // Build search URL
     const searchQuery = `${query} ${location}`;
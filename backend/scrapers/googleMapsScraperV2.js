@@ -1,7 +1,7 @@
 const browserManager = require('../utils/browserManager');
 
 // Google Maps Scraper with Puppeteer - Real comprehensive data
-async function googleMapsScraperV2(input) {
+async function googleMapsScraperV2(input, options = {}) {
   const { query, location = 'United States', maxResults = 20 } = input;
   
   if (!query) throw new Error('Query is required');
@@ -9,7 +9,7 @@ async function googleMapsScraperV2(input) {
   let page = null;
   
   try {
-    page = await browserManager.getPage(false);
+    page = await browserManager.getPage(false, options.resourceBlocking);
     
     // Build search URL
     const searchQuery = `${query} ${location}`;
@@ -4,21 +4,46 @@
  * Based on professional scraping architecture
  */
 
-const puppeteer = require('puppeteer-extra');
-const StealthPlugin = require('puppeteer-extra-plugin-stealth');
-
-puppeteer.use(StealthPlugin());
-
-const CONCURRENCY = 4; // Parallel browser tabs for enrichment
+const browserManager = require('../utils/browserManager');
+const AdaptivePool = require('../utils/adaptivePool');
+const { recordError, timeStage } = require('../utils/scraperMetrics');
+const tracer = require('../utils/tracer');
+
+// Scraper label on stage metrics
+const SCRAPER = 'googleMapsUltimate';
+
+// Parallel browser tabs for enrichment - adapted per run between MIN and MAX
+const CONCURRENCY = parseInt(process.env.ENRICH_CONCURRENCY) || 4;
+const MIN_CONCURRENCY = 1;
+const MAX_CONCURRENCY = parseInt(process.env.ENRICH_MAX_CONCURRENCY) || 8;
+const TARGET_LATENCY_MS = parseInt(process.env.ENRICH_TARGET_LATENCY_MS) || 20000;
+
+// Search feed loading: wait up to FEED_IDLE_MS for new results after each
+// scroll and keep scrolling until Google renders FEED_END_SELECTOR ("You've
+// reached the end of the list."), maxResults is reached, or no new result
+// has appeared for FEED_IDLE_BUDGET_MS (a slow feed can stall for a while).
+const FEED_IDLE_MS = parseInt(process.env.FEED_IDLE_MS) || 4000;
+const FEED_IDLE_BUDGET_MS = parseInt(process.env.FEED_IDLE_BUDGET_MS) || 90000;
+const FEED_END_SELECTOR = 'span.HlvSq';
+
+// Origin serving /maps/search and /maps/place (point at a fixture server for benchmarks)
+const DEFAULT_BASE_URL = process.env.GOOGLE_MAPS_BASE_URL || 'https://www.google.com';
 
 /**
  * Main scraper function
+ * options.resourceBlocking - request blocking rules for every page
+ * options.sink - dataset sink; places are pushed as soon as they are enriched
+ * options.baseUrl - Google Maps origin override (defaults to GOOGLE_MAPS_BASE_URL)
+ * options.concurrency - { initial, min, max } enrichment tab limits
+ * input.feedIdleSeconds - stop scrolling the results after this long without
+ *   new places (defaults to FEED_IDLE_BUDGET_MS)
  */
-async function googleMapsUltimate(input) {
+async function googleMapsUltimate(input, options = {}) {
   const { 
     query, 
     location = 'United States', 
-    maxResults = 20 
+    maxResults = 20,
+    feedIdleSeconds
   } = input;
   
   if (!query) {
@@ -29,122 +54,249 @@ async function googleMapsUltimate(input) {
   console.log(`🚀 Starting Ultimate Google Maps Scraper: "${searchQuery}"`);
   console.log(`📊 Target: ${maxResults} results with full enrichment`);
 
-  const results = await ultimateScrape(searchQuery, maxResults);
+  const baseUrl = (options.baseUrl || DEFAULT_BASE_URL).replace(/\/+$/, '');
+  const feedIdleBudgetMs = feedIdleSeconds > 0 ? feedIdleSeconds * 1000 : options.feedIdleBudgetMs;
+  const results = await ultimateScrape(searchQuery, maxResults, { ...options, baseUrl, feedIdleBudgetMs });
   
   return [{
     searchString: searchQuery,
-    searchUrl: `https://www.google.com/maps/search/${encodeURIComponent(searchQuery)}`,
-    totalResults: results.results.length,
-    detailedResults: results.results.filter(r => r.hasDetailedData).length,
+    searchUrl: searchUrl(baseUrl, searchQuery),
+    totalResults: results.total,
+    detailedResults: results.detailed,
     scrapedAt: results.scrapedAt,
+    enrichment: results.enrichment,
+    resources: results.resources,
+    timings: results.timings,
     results: results.results
   }];
 }
 
 /**
- * Ultimate Scraper with parallel enrichment
+ * Ultimate Scraper with parallel enrichment.
+ * With a sink, enriched places are streamed out and not kept in memory.
  */
-async function ultimateScrape(query, max) {
-  const browser = await puppeteer.launch({
-    headless: true,
-    args: [
-      '--no-sandbox', 
-      '--disable-setuid-sandbox', 
-      '--disable-dev-shm-usage',
-      '--disable-blink-features=AutomationControlled',
-      '--window-size=1920,1080'
-    ],
-    // Let puppeteer use bundled Chromium
-    defaultViewport: { width: 1920, height: 1080 }
+async function ultimateScrape(query, max, options = {}) {
+  const { sink } = options;
+  const concurrency = options.concurrency || {};
+  const baseUrl = options.baseUrl || DEFAULT_BASE_URL;
+  // Per-stage wall times; detail/website are summed over places
+  const timings = { searchMs: 0, enrichMs: 0, detailMs: 0, detailPages: 0, websiteMs: 0, websitePages: 0 };
+
+  // Borrow an incognito context from the warm browser pool
+  const session = await browserManager.acquireContext({
+    setupPage,
+    resourceBlocking: options.resourceBlocking
   });
+  const enriched = [];
+  const counts = { collected: 0, enriched: 0, failed: 0, detailed: 0 };
+  let enrichment = null;
 
-  const page = await browser.newPage();
-  await setupPage(page);
-
-  // Step 1: Search and collect place URLs
-  const placeUrls = await searchAndCollect(page, query, max);
-  console.log(`✅ Found ${placeUrls.length} places. Starting enrichment...`);
+  try {
+    const page = await session.newPage();
+
+    // Step 1: Search and collect place URLs
+    const searchStart = Date.now();
+    const placeUrls = await timeStage(SCRAPER, 'searchAndCollect', () =>
+      searchAndCollect(page, searchUrl(baseUrl, query), max, collected => {
+        if (sink) sink.setProgress({ collected });
+      }, options.feedIdleBudgetMs)
+    );
+    await session.releasePage(page);
+    timings.searchMs = Date.now() - searchStart;
+    counts.collected = placeUrls.length;
+    if (sink) sink.setProgress({ collected: counts.collected });
+    console.log(`✅ Found ${placeUrls.length} places. Starting enrichment...`);
+
+    // Step 2: Parallel enrichment - the next place starts as soon as a tab frees
+    const pool = new AdaptivePool({
+      initial: concurrency.initial || CONCURRENCY,
+      min: concurrency.min || MIN_CONCURRENCY,
+      max: concurrency.max || MAX_CONCURRENCY,
+      targetLatencyMs: TARGET_LATENCY_MS,
+      classify: classifyEnrichment,
+      collectResults: false,
+      onSettled: (data) => {
+        if (!data) return;
+        if (data.error) counts.failed++;
+        else counts.enriched++;
+        if (data.hasDetailedData) counts.detailed++;
+
+        if (sink) {
+          sink.push(data);
+          sink.setProgress({ enriched: counts.enriched, failed: counts.failed });
+        } else {
+          enriched.push(data);
+        }
+        console.log(`📊 Progress: ${counts.enriched + counts.failed}/${placeUrls.length} (parallelism ${pool.slots()})`);
+      }
+    });
 
-  // Step 2: Parallel enrichment
-  const enriched = [];
-  for (let i = 0; i < placeUrls.length; i += CONCURRENCY) {
-    const batch = placeUrls.slice(i, i + CONCURRENCY);
-    const promises = batch.map((url, idx) => 
-      enrichUltimate(browser, url, query, i + idx + 1)
+    const enrichStart = Date.now();
+    await pool.run(placeUrls, (url, idx) =>
+      tracer.lane(() => tracer.span('place', () =>
+        enrichUltimate(session, url, query, idx + 1, timings), { rank: idx + 1 }
+      ))
     );
-    const batchResults = await Promise.all(promises);
-    enriched.push(...batchResults.filter(r => r));
-    console.log(`📊 Progress: ${enriched.length}/${placeUrls.length}`);
-    await delay(1200);
+    timings.enrichMs = Date.now() - enrichStart;
+
+    enrichment = pool.stats();
+    console.log(`⚡ Enrichment: ${enrichment.tasks} places in ${enrichment.wallMs}ms, effective parallelism ${enrichment.effectiveParallelism} (peak ${enrichment.peakParallelism}, final limit ${enrichment.finalLimit})`);
+  } finally {
+    await session.close();
   }
 
-  await browser.close();
+  const resources = session.resourceStats.toJSON();
+  console.log(`🧱 Resources: ${resources.blockedRequests} blocked (~${Math.round(resources.estimatedBlockedBytes / 1024)}KB saved), ${Math.round(resources.transferredBytes / 1024)}KB transferred`);
 
   return {
     query,
-    total: enriched.length,
+    total: counts.enriched + counts.failed,
+    detailed: counts.detailed,
     scrapedAt: new Date().toISOString(),
+    enrichment,
+    resources,
+    timings,
     results: enriched
   };
 }
 
+function searchUrl(baseUrl, query) {
+  return `${baseUrl}/maps/search/${encodeURIComponent(query)}`;
+}
+
 /**
- * Search and collect place URLs
+ * Search and collect place URLs.
+ * The feed is watched from inside the page: every scroll waits for the
+ * next batch of appended place links (or the end-of-list marker) instead of
+ * sleeping for a fixed time, and only links not seen before come back.
+ * Scrolling stops at the end-of-list marker, at max places, or after
+ * idleBudgetMs without a new place.
  */
-async function searchAndCollect(page, query, max) {
+async function searchAndCollect(page, url, max, onProgress, idleBudgetMs = FEED_IDLE_BUDGET_MS) {
+  const urls = new Set();
   try {
-    await page.goto(`https://www.google.com/maps/search/${encodeURIComponent(query)}`, {
+    await tracer.span('search.goto', () => page.goto(url, {
       waitUntil: 'networkidle2',
       timeout: 60000
-    });
-
-    const urls = new Set();
-    let lastCount = 0;
-    let attempts = 0;
-    const maxAttempts = 50;
-
-    while (urls.size < max && attempts < maxAttempts) {
-      // Scroll the results panel
-      await page.evaluate(() => {
-        const panel = document.querySelector('[role="feed"]');
-        if (panel) panel.scrollTop = panel.scrollHeight;
-      });
-      
-      await delay(1800);
-
-      // Extract place URLs
-      const links = await page.$$eval('a[href*="maps/place"]', els =>
-        els.map(el => el.href).filter(h => h.includes('/maps/place/'))
-      );
+    }), { url });
+    await page.evaluate(installFeedCollector, FEED_END_SELECTOR);
+
+    let lastNewAt = Date.now();
+    let scrolls = 0;
+    let ended = false;
+
+    while (urls.size < max && !ended && Date.now() - lastNewAt < idleBudgetMs) {
+      // Filled in during the iteration; the span records it when it ends
+      const scroll = { iteration: ++scrolls, places: 0 };
+      const batch = await tracer.span('search.scroll', async () => {
+        let result = await page.evaluate(nextFeedBatch, FEED_IDLE_MS);
+        if (result.missing) {
+          // The page navigated and dropped the collector; watch the new document
+          await page.evaluate(installFeedCollector, FEED_END_SELECTOR);
+          result = await page.evaluate(nextFeedBatch, FEED_IDLE_MS);
+        }
+        result.links.forEach(l => urls.add(l));
+        scroll.places = urls.size;
+        scroll.ended = result.ended;
+        return result;
+      }, scroll);
 
-      links.forEach(l => urls.add(l));
-      
-      // Check if we're still loading new results
-      if (urls.size === lastCount) {
-        attempts++;
-      } else {
-        attempts = 0;
-        lastCount = urls.size;
-      }
+      // Idle rounds re-scroll, which also retries a feed request that failed
+      if (batch.links.length > 0) lastNewAt = Date.now();
+      ended = batch.ended;
 
       console.log(`📍 Loaded ${urls.size} places...`);
-      
-      if (urls.size >= max) break;
+      if (onProgress) onProgress(Math.min(urls.size, max));
     }
+    if (ended) console.log(`🏁 Reached the end of the results list (${urls.size} places)`);
+    else if (urls.size < max) console.warn(`⚠️  No new places for ${Math.round(idleBudgetMs / 1000)}s, stopping with ${urls.size}`);
 
-    return Array.from(urls).slice(0, max);
+    // A loaded results page without place links means the feed markup changed
+    if (urls.size === 0) recordError(SCRAPER, 'searchAndCollect', 'selector-miss');
   } catch (error) {
     console.error('Search collection error:', error.message);
-    return [];
+    recordError(SCRAPER, 'searchAndCollect', error);
   }
+  // Places collected before a failure are still enriched
+  return Array.from(urls).slice(0, max);
+}
+
+/**
+ * In-page: watch the results feed and queue place links as they are appended.
+ * Runs in the browser, so it must not reference anything outside itself.
+ */
+function installFeedCollector(endSelector) {
+  if (window.__scrapiFeed) return;
+  const feed = document.querySelector('[role="feed"]');
+  const state = {
+    root: feed || document.body,
+    scroller: feed || document.scrollingElement,
+    seen: new Set(),
+    queue: [],
+    ended: false,
+    wake: null
+  };
+  const placeSelector = 'a[href*="/maps/place/"]';
+
+  const scan = node => {
+    if (node.nodeType !== 1) return;
+    const anchors = node.matches(placeSelector) ? [node] : node.querySelectorAll(placeSelector);
+    anchors.forEach(a => {
+      if (!state.seen.has(a.href)) {
+        state.seen.add(a.href);
+        state.queue.push(a.href);
+      }
+    });
+    if (!state.ended && (node.matches(endSelector) || node.querySelector(endSelector) ||
+        /reached the end of the list/i.test(node.textContent || ''))) {
+      state.ended = true;
+    }
+  };
+
+  scan(state.root);
+  new MutationObserver(records => {
+    records.forEach(record => record.addedNodes.forEach(scan));
+    if (state.wake && (state.queue.length > 0 || state.ended)) state.wake();
+  }).observe(state.root, { childList: true, subtree: true });
+  window.__scrapiFeed = state;
+}
+
+/**
+ * In-page: return the queued links, or scroll the feed and wait until new
+ * links or the end marker appear (at most idleMs)
+ */
+function nextFeedBatch(idleMs) {
+  const state = window.__scrapiFeed;
+  if (!state) return { links: [], ended: false, missing: true };
+
+  const drain = () => {
+    const links = state.queue;
+    state.queue = [];
+    state.wake = null;
+    return { links, ended: state.ended };
+  };
+  if (state.queue.length > 0 || state.ended) return drain();
+
+  return new Promise(resolve => {
+    const timer = setTimeout(() => resolve(drain()), idleMs);
+    state.wake = () => {
+      clearTimeout(timer);
+      resolve(drain());
+    };
+    // Step back from the bottom first so a feed already scrolled down still
+    // fires the scroll event that loads the next page
+    const scroller = state.scroller;
+    scroller.scrollTop = Math.max(0, scroller.scrollHeight - scroller.clientHeight - 200);
+    setTimeout(() => { scroller.scrollTop = scroller.scrollHeight; }, 50);
+  });
 }
 
 /**
  * Ultimate enrichment for each place
+ * timings - optional accumulator for detail/website page times
  */
-async function enrichUltimate(browser, url, query, rank) {
-  const page = await browser.newPage();
-  await setupPage(page);
+async function enrichUltimate(session, url, query, rank, timings = null) {
+  const page = await session.newPage();
   
   const data = { 
     placeUrl: url, 
@@ -155,20 +307,39 @@ async function enrichUltimate(browser, url, query, rank) {
 
   try {
     // === 1. GOOGLE MAPS EXTRACTION ===
-    await page.goto(url, { waitUntil: 'networkidle2', timeout: 35000 });
-    await delay(2000); // Let dynamic content load
+    const detailStart = Date.now();
+    await tracer.span('place.goto', () => page.goto(url, { waitUntil: 'networkidle2', timeout: 35000 }), { url });
+    if (await isBlocked(page)) {
+      data.blocked = true;
+      throw new Error('Blocked by Google (unusual traffic page)');
+    }
+    await tracer.span('place.settle', () => delay(2000)); // Let dynamic content load
     
-    Object.assign(data, await extractGoogleMapsUltimate(page));
+    Object.assign(data, await tracer.span('place.extract', () =>
+      timeStage(SCRAPER, 'extractGoogleMapsUltimate', () => extractGoogleMapsUltimate(page))
+    ));
+    if (!data.name) recordError(SCRAPER, 'extractGoogleMapsUltimate', 'selector-miss');
     data.hasDetailedData = true;
+    if (timings) {
+      timings.detailMs += Date.now() - detailStart;
+      timings.detailPages++;
+    }
 
     // === 2. WEBSITE ENRICHMENT ===
     if (data.website && data.website.startsWith('http')) {
+      const websiteStart = Date.now();
       try {
-        const websiteData = await enrichWebsite(browser, data.website);
+        const websiteData = await tracer.span('website', () =>
+          timeStage(SCRAPER, 'enrichWebsite', () => enrichWebsite(session, data.website))
+        );
         Object.assign(data, websiteData);
       } catch (err) {
         console.log(`⚠️ Website enrichment failed for ${data.website}`);
       }
+      if (timings) {
+        timings.websiteMs += Date.now() - websiteStart;
+        timings.websitePages++;
+      }
     }
 
     // === 3. AI SUMMARY ===
@@ -183,8 +354,9 @@ async function enrichUltimate(browser, url, query, rank) {
   } catch (err) {
     console.error(`❌ Failed ${url}:`, err.message);
     data.error = err.message;
+    recordError(SCRAPER, 'enrichUltimate', data.blocked ? 'blocked' : err);
   } finally {
-    await page.close();
+    await session.releasePage(page);
   }
 
   return data;
@@ -380,19 +552,18 @@ async function extractGoogleMapsUltimate(page) {
 /**
  * Website enrichment - extract emails, social media, structured data
  */
-async function enrichWebsite(browser, url) {
-  const page = await browser.newPage();
-  await setupPage(page);
+async function enrichWebsite(session, url) {
+  const page = await session.newPage();
   const data = {};
 
   try {
-    await page.goto(url, { 
-      waitUntil: 'domcontentloaded', 
-      timeout: 25000 
-    });
+    await tracer.span('website.goto', () => page.goto(url, {
+      waitUntil: 'domcontentloaded',
+      timeout: 25000
+    }), { url });
 
     // === EMAILS ===
-    data.emails = await page.evaluate(() => {
+    data.emails = await tracer.span('website.emails', () => page.evaluate(() => {
       const text = document.body.innerText;
       const regex = /[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}/g;
       const matches = text.match(regex) || [];
@@ -401,10 +572,10 @@ async function enrichWebsite(browser, url) {
         !e.includes('wix.com') &&
         !e.includes('sentry.io')
       ).slice(0, 5);
-    });
+    }));
 
     // === SOCIAL LINKS ===
-    data.social = await page.evaluate(() => {
+    data.social = await tracer.span('website.social', () => page.evaluate(() => {
       const links = Array.from(document.querySelectorAll('a[href]'));
       const platforms = {
         facebook: /facebook\.com\/(?!sharer)/i,
@@ -422,10 +593,10 @@ async function enrichWebsite(browser, url) {
         found[platform] = link?.href || null;
       }
       return found;
-    });
+    }));
 
     // === STRUCTURED DATA (JSON-LD) ===
-    data.structuredData = await page.evaluate(() => {
+    data.structuredData = await tracer.span('website.structuredData', () => page.evaluate(() => {
       const scripts = document.querySelectorAll('script[type="application/ld+json"]');
       const data = [];
       scripts.forEach(script => {
@@ -435,10 +606,10 @@ async function enrichWebsite(browser, url) {
         } catch (e) { /* ignore */ }
       });
       return data.length > 0 ? data : null;
-    });
+    }));
 
     // === ABOUT/DESCRIPTION ===
-    data.about = await page.evaluate(() => {
+    data.about = await tracer.span('website.about', () => page.evaluate(() => {
       const selectors = [
         'meta[name="description"]',
         'meta[property="og:description"]',
@@ -454,10 +625,10 @@ async function enrichWebsite(browser, url) {
         }
       }
       return null;
-    });
+    }));
 
     // === FOUNDER/OWNER ===
-    data.founder = await page.evaluate(() => {
+    data.founder = await tracer.span('website.founder', () => page.evaluate(() => {
       const text = document.body.innerText.toLowerCase();
       const patterns = [
         /(founded by|owner|ceo|founder)[:\s]+([a-z\s]{2,30})/i,
@@ -468,10 +639,10 @@ async function enrichWebsite(browser, url) {
         if (match) return match[2].trim();
       }
       return null;
-    });
+    }));
 
     // === YEAR FOUNDED ===
-    data.yearFounded = await page.evaluate(() => {
+    data.yearFounded = await tracer.span('website.yearFounded', () => page.evaluate(() => {
       const text = document.body.innerText;
       const patterns = [
         /©\s*(\d{4})/,
@@ -489,12 +660,13 @@ async function enrichWebsite(browser, url) {
         }
       }
       return null;
-    });
+    }));
 
   } catch (err) {
     console.log(`Website enrichment error: ${err.message}`);
+    recordError(SCRAPER, 'enrichWebsite', err);
   } finally {
-    await page.close();
+    await session.releasePage(page);
   }
 
   return data;
@@ -524,6 +696,27 @@ function generateAISummary(data) {
   return parts.join(' • ');
 }
 
+/**
+ * Detect Google's captcha / unusual traffic interstitial
+ */
+async function isBlocked(page) {
+  if (page.url().includes('/sorry/')) return true;
+  return page.evaluate(() =>
+    /unusual traffic|not a robot/i.test(document.body?.innerText || '')
+  ).catch(() => false);
+}
+
+/**
+ * Map an enrichment outcome to a congestion signal for the adaptive pool
+ */
+function classifyEnrichment(data, error) {
+  if (error) return 'error';
+  if (data?.blocked) return 'blocked';
+  if (data?.error && /timeout/i.test(data.error)) return 'timeout';
+  if (data?.error) return 'error';
+  return 'ok';
+}
+
 /**
  * Classify phone type
  */
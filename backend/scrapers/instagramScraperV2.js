@@ -1,7 +1,7 @@
 const browserManager = require('../utils/browserManager');
 
 // Instagram Scraper with Puppeteer - Profile and posts data
-async function instagramScraperV2(input) {
+async function instagramScraperV2(input, options = {}) {
   const { username, maxPosts = 20 } = input;
   
   if (!username) throw new Error('Username is required');
@@ -9,7 +9,7 @@ async function instagramScraperV2(input) {
   let page = null;
   
   try {
-    page = await browserManager.getPage(false);
+    page = await browserManager.getPage(false, options.resourceBlocking);
     
     const profileUrl = `https://www.instagram.com/${username}/`;
     console.log(`Navigating to: ${profileUrl}`);
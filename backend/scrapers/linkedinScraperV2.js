@@ -1,7 +1,7 @@
 const browserManager = require('../utils/browserManager');
 
 // LinkedIn Scraper with Puppeteer - Profile data
-async function linkedinScraperV2(input) {
+async function linkedinScraperV2(input, options = {}) {
   const { profileUrl } = input;
   
   if (!profileUrl) throw new Error('Profile URL is required');
@@ -9,7 +9,7 @@ async function linkedinScraperV2(input) {
   let page = null;
   
   try {
-    page = await browserManager.getPage(false);
+    page = await browserManager.getPage(false, options.resourceBlocking);
     
     console.log(`Navigating to: ${profileUrl}`);
     
@@ -0,0 +1,82 @@
+/**
+ * STUB SCRAPER - synthetic places without a browser
+ * Stands in for every actor when SCRAPER_STUB=true so the API, run queue and
+ * dataset storage can be load-tested without Chromium or network access.
+ */
+
+const STUB_DELAY_MS = parseInt(process.env.SCRAPER_STUB_DELAY_MS) || 50;
+const STUB_FAILURE_RATE = parseFloat(process.env.SCRAPER_STUB_FAILURE_RATE) || 0;
+
+const delay = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+/**
+ * Build one Maps-shaped place record
+ */
+function stubPlace(query, rank) {
+  const id = `${Date.now().toString(36)}${rank}`;
+  return {
+    name: `${query} #${rank}`,
+    rating: parseFloat((3 + (rank % 20) / 10).toFixed(1)),
+    reviewsCount: rank * 7,
+    mainCategory: 'Restaurant',
+    categories: ['Restaurant', 'Cafe'],
+    fullAddress: `${rank} Main St, Springfield, IL 62701, United States`,
+    street: `${rank} Main St`,
+    city: 'Springfield',
+    state: 'IL',
+    zip: '62701',
+    country: 'United States',
+    phone: `+1 555-01${String(rank % 100).padStart(2, '0')}`,
+    website: `https://example.com/place-${id}`,
+    hasWebsite: true,
+    emails: [`info@place-${id}.example.com`],
+    location: { lat: 39.78 + rank / 10000, lng: -89.65 - rank / 10000 },
+    placeId: `stub-${id}`,
+    searchQuery: query,
+    searchRank: rank,
+    placeUrl: `https://www.google.com/maps/place/stub-${id}`,
+    hasDetailedData: true,
+    scrapedAt: new Date().toISOString()
+  };
+}
+
+/**
+ * Main scraper function - same contract as the real scrapers:
+ * places go through options.sink when present, otherwise they are returned
+ */
+async function stubScraper(input, options = {}) {
+  const { query = 'stub', location = '', maxResults = 20 } = input;
+  const { sink } = options;
+  const searchQuery = location ? `${query} ${location}` : query;
+  const total = Math.max(1, parseInt(maxResults) || 20);
+  const results = [];
+
+  console.log(`🧪 Stub scraper: "${searchQuery}" (${total} places, ${STUB_DELAY_MS}ms each)`);
+  if (sink) sink.setProgress({ collected: total });
+
+  for (let rank = 1; rank <= total; rank++) {
+    await delay(STUB_DELAY_MS);
+    if (STUB_FAILURE_RATE > 0 && Math.random() < STUB_FAILURE_RATE) {
+      throw new Error(`Stub scraper injected failure at place ${rank}`);
+    }
+
+    const place = stubPlace(searchQuery, rank);
+    if (sink) {
+      sink.push(place);
+      sink.setProgress({ enriched: rank });
+    } else {
+      results.push(place);
+    }
+  }
+
+  return [{
+    searchString: searchQuery,
+    totalResults: total,
+    detailedResults: total,
+    scrapedAt: new Date().toISOString(),
+    stub: true,
+    results
+  }];
+}
+
+module.exports = stubScraper;
@@ -1,7 +1,7 @@
 const browserManager = require('../utils/browserManager');
 
 // TikTok Scraper with Puppeteer - User and videos data
-async function tiktokScraperV2(input) {
+async function tiktokScraperV2(input, options = {}) {
   const { username, maxVideos = 20 } = input;
   
   if (!username) throw new Error('Username is required');
@@ -9,7 +9,7 @@ async function tiktokScraperV2(input) {
   let page = null;
   
   try {
-    page = await browserManager.getPage(false);
+    page = await browserManager.getPage(false, options.resourceBlocking);
     
     const profileUrl = `https://www.tiktok.com/@${username.replace('@', '')}`;
     console.log(`Navigating to: ${profileUrl}`);
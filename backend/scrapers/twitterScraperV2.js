@@ -1,7 +1,7 @@
 const browserManager = require('../utils/browserManager');
 
 // Twitter Scraper with Puppeteer - Tweets and user data
-async function twitterScraperV2(input) {
+async function twitterScraperV2(input, options = {}) {
   const { query, maxTweets = 50, searchType = 'top' } = input;
   
   if (!query) throw new Error('Query (search term, hashtag, or @username) is required');
@@ -9,7 +9,7 @@ async function twitterScraperV2(input) {
   let page = null;
   
   try {
-    page = await browserManager.getPage(false);
+    page = await browserManager.getPage(false, options.resourceBlocking);
     
     // Build search URL
     const isUser = query.startsWith('@');
@@ -2,6 +2,10 @@ const express = require('express');
 const cors = require('cors');
 const mongoose = require('mongoose');
 const dotenv = require('dotenv');
+const startupTimer = require('./utils/startupTimer');
+const metrics = require('./utils/metrics');
+const httpMetrics = require('./middleware/httpMetrics');
+const { instrumentMongo } = require('./utils/mongoMetrics');
 
 dotenv.config();
 
@@ -9,20 +13,44 @@ const app = express();
 const PORT = process.env.PORT || 8001;
 
 // Middleware
-app.use(cors());
+// Expose the headers clients read from run and export responses
+app.use(cors({ exposedHeaders: ['ETag', 'Content-Disposition', 'X-Total-Count'] }));
 app.use(express.json());
+app.use(httpMetrics);
 
 // MongoDB Connection
 mongoose.connect(process.env.MONGO_URL + '/' + process.env.DB_NAME, {
   useNewUrlParser: true,
   useUnifiedTopology: true,
+  // Command events feed the Mongo latency metrics
+  monitorCommands: true
 })
 .then(async () => {
   console.log('✅ MongoDB connected successfully');
+  instrumentMongo(mongoose.connection.getClient());
+  startupTimer.mark('mongo connected');
   
   // Auto-sync actors from registry
   const syncActors = require('./actors/syncActors');
   await syncActors();
+  startupTimer.mark('actors synced');
+  
+  // Start run queue worker pool (disable with RUN_WORKER=false for API-only nodes)
+  if (process.env.RUN_WORKER !== 'false') {
+    if (require('./actors/registry').useStubScrapers()) {
+      console.log('🧪 SCRAPER_STUB=true - actors run on synthetic data, no browser pool');
+    } else {
+      // Warm the shared browser pool before the first run is claimed
+      await require('./utils/browserManager').warmUp();
+    }
+    require('./utils/runQueue').start();
+    startupTimer.mark('worker started');
+  }
+  
+  // Start recurring runs (every node may run it; each fire is claimed once)
+  if (process.env.SCHEDULER_ENABLED !== 'false') {
+    require('./utils/scheduler').start();
+  }
 })
 .catch(err => console.error('❌ MongoDB connection error:', err));
 
@@ -32,6 +60,8 @@ const runRoutes = require('./routes/runs');
 const scraperRoutes = require('./routes/scrapers');
 const authRoutes = require('./routes/auth');
 const scrapedDataRoutes = require('./routes/scrapedData');
+const scheduleRoutes = require('./routes/schedules');
+startupTimer.mark('routes loaded');
 
 // API Routes
 app.use('/api/auth', authRoutes);
@@ -39,12 +69,34 @@ app.use('/api/actors', actorRoutes);
 app.use('/api/runs', runRoutes);
 app.use('/api/scrapers', scraperRoutes);
 app.use('/api/scraped-data', scrapedDataRoutes);
+app.use('/api/schedules', scheduleRoutes);
 
 // Health check
 app.get('/api/', (req, res) => {
-  res.json({ message: 'Scrapi Backend API Running' });
+  res.json({
+    message: 'Scrapi Backend API Running',
+    uptimeSeconds: Math.round(process.uptime()),
+    startup: startupTimer.report(),
+    scraperModules: require('./actors/registry').loadedScrapers()
+  });
 });
 
+// Prometheus scrape endpoint (also under /api for deployments that only route /api
+// to the backend); set METRICS_TOKEN to require "Authorization: Bearer <token>"
+const metricsHandler = async (req, res) => {
+  if (process.env.METRICS_TOKEN && req.header('Authorization') !== `Bearer ${process.env.METRICS_TOKEN}`) {
+    return res.status(401).json({ error: 'Invalid metrics token' });
+  }
+  try {
+    res.set('Content-Type', metrics.contentType);
+    res.send(await metrics.expose());
+  } catch (error) {
+    res.status(500).json({ error: error.message });
+  }
+};
+app.get('/metrics', metricsHandler);
+app.get('/api/metrics', metricsHandler);
+
 // Error handling middleware
 app.use((err, req, res, next) => {
   console.error(err.stack);
@@ -53,4 +105,5 @@ app.use((err, req, res, next) => {
 
 app.listen(PORT, '0.0.0.0', () => {
   console.log(`🚀 Scrapi backend running on http://0.0.0.0:${PORT}`);
+  startupTimer.mark('listening');
 });
\ No newline at end of file
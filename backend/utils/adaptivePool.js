@@ -0,0 +1,141 @@
+// Adaptive work pool - runs tasks from a shared queue and starts the next one
+// as soon as a slot frees. The number of slots follows AIMD (additive
+// increase, multiplicative decrease): it grows by roughly one slot per
+// window of fast successes and is cut back on timeouts, block signals or
+// latency above the target.
+class AdaptivePool {
+  constructor(options = {}) {
+    this.min = options.min || 1;
+    this.max = options.max || 8;
+    this.limit = Math.min(this.max, Math.max(this.min, options.initial || 4));
+    this.targetLatencyMs = options.targetLatencyMs || 20000;
+    this.decreaseFactor = options.decreaseFactor || 0.5;
+    // classify(result, error, latencyMs) -> 'ok' | 'timeout' | 'blocked' | 'error'
+    this.classify = options.classify || ((result, error) => (error ? 'error' : 'ok'));
+    this.onSettled = options.onSettled || null;
+    // Streaming callers consume results in onSettled and keep memory flat
+    this.collectResults = options.collectResults !== false;
+
+    this.active = 0;
+    this.lastDecreaseAt = 0;
+    this.counts = { tasks: 0, ok: 0, slow: 0, timeout: 0, blocked: 0, error: 0, decreases: 0 };
+    this.latencyTotalMs = 0;
+    this.peakParallelism = 0;
+    this.minLimitSeen = this.limit;
+    this.maxLimitSeen = this.limit;
+    this.busyArea = 0; // integral of active tasks over time (task*ms)
+    this.lastChangeAt = null;
+    this.startedAt = null;
+    this.finishedAt = null;
+  }
+
+  slots() {
+    return Math.max(this.min, Math.floor(this.limit));
+  }
+
+  /**
+   * Account the time spent at the current parallelism before it changes
+   */
+  tick() {
+    const now = Date.now();
+    if (this.lastChangeAt !== null) this.busyArea += this.active * (now - this.lastChangeAt);
+    this.lastChangeAt = now;
+  }
+
+  record(signal, latencyMs, startedAt) {
+    this.counts.tasks++;
+    this.latencyTotalMs += latencyMs;
+
+    const slow = signal === 'ok' && latencyMs > this.targetLatencyMs;
+    if (slow) this.counts.slow++;
+    else this.counts[signal] = (this.counts[signal] || 0) + 1;
+
+    if (signal === 'timeout' || signal === 'blocked' || slow) {
+      // Only tasks started after the last cut may cut again, otherwise one
+      // congested burst would collapse the limit straight to the minimum
+      if (startedAt >= this.lastDecreaseAt) {
+        this.limit = Math.max(this.min, this.limit * this.decreaseFactor);
+        this.lastDecreaseAt = Date.now();
+        this.counts.decreases++;
+      }
+    } else if (signal === 'ok') {
+      this.limit = Math.min(this.max, this.limit + 1 / this.slots());
+    }
+
+    this.minLimitSeen = Math.min(this.minLimitSeen, this.limit);
+    this.maxLimitSeen = Math.max(this.maxLimitSeen, this.limit);
+  }
+
+  /**
+   * Run worker(item, index) for every item; resolves with results in input order
+   */
+  run(items, worker) {
+    const results = this.collectResults ? new Array(items.length) : [];
+    let next = 0;
+    this.startedAt = Date.now();
+    this.lastChangeAt = this.startedAt;
+
+    return new Promise(resolve => {
+      const pump = () => {
+        while (this.active < this.slots() && next < items.length) {
+          start(next++);
+        }
+        if (this.active === 0 && next >= items.length) {
+          this.tick();
+          this.finishedAt = Date.now();
+          resolve(results);
+        }
+      };
+
+      const start = (index) => {
+        this.tick();
+        this.active++;
+        this.peakParallelism = Math.max(this.peakParallelism, this.active);
+        const startedAt = Date.now();
+
+        Promise.resolve()
+          .then(() => worker(items[index], index))
+          .then(
+            result => ({ result, error: null }),
+            error => ({ result: null, error })
+          )
+          .then(({ result, error }) => {
+            const latencyMs = Date.now() - startedAt;
+            if (this.collectResults) results[index] = result;
+            this.record(this.classify(result, error, latencyMs), latencyMs, startedAt);
+            this.tick();
+            this.active--;
+            try {
+              if (this.onSettled) this.onSettled(result, error, index);
+            } catch (err) {
+              console.error('Adaptive pool onSettled error:', err.message);
+            }
+            pump();
+          });
+      };
+
+      pump();
+    });
+  }
+
+  stats() {
+    const wallMs = (this.finishedAt || Date.now()) - (this.startedAt || Date.now());
+    return {
+      tasks: this.counts.tasks,
+      wallMs,
+      effectiveParallelism: wallMs > 0 ? parseFloat((this.busyArea / wallMs).toFixed(2)) : 0,
+      peakParallelism: this.peakParallelism,
+      finalLimit: parseFloat(this.limit.toFixed(2)),
+      minLimit: parseFloat(this.minLimitSeen.toFixed(2)),
+      maxLimit: parseFloat(this.maxLimitSeen.toFixed(2)),
+      avgLatencyMs: this.counts.tasks > 0 ? Math.round(this.latencyTotalMs / this.counts.tasks) : 0,
+      slow: this.counts.slow,
+      timeouts: this.counts.timeout,
+      blocked: this.counts.blocked,
+      errors: this.counts.error,
+      decreases: this.counts.decreases
+    };
+  }
+}
+
+module.exports = AdaptivePool;
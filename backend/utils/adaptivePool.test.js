@@ -0,0 +1,78 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const AdaptivePool = require('./adaptivePool');
+
+const delay = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+test('returns results in input order and never exceeds the limit', async () => {
+  const pool = new AdaptivePool({ initial: 3, max: 3 });
+  let running = 0;
+  let peak = 0;
+  const results = await pool.run([30, 5, 20, 1, 10], async (ms, index) => {
+    running++;
+    peak = Math.max(peak, running);
+    await delay(ms);
+    running--;
+    return index * 10;
+  });
+
+  assert.deepEqual(results, [0, 10, 20, 30, 40]);
+  assert.equal(peak, 3);
+  assert.equal(pool.stats().peakParallelism, 3);
+});
+
+test('grows additively on fast successes up to max', async () => {
+  const pool = new AdaptivePool({ initial: 2, max: 4 });
+  await pool.run(new Array(20).fill(0), async () => 'ok');
+  assert.equal(pool.stats().finalLimit, 4);
+  assert.equal(pool.stats().decreases, 0);
+});
+
+test('cuts the limit once per congested burst, not below min', async () => {
+  const pool = new AdaptivePool({
+    initial: 8,
+    max: 8,
+    min: 2,
+    classify: (result, error) => (error ? 'timeout' : 'ok')
+  });
+  // Eight tasks started together all time out: one cut, not eight
+  await pool.run(new Array(8).fill(0), async () => {
+    await delay(5);
+    throw new Error('timeout');
+  });
+  assert.equal(pool.stats().finalLimit, 4);
+  assert.equal(pool.stats().timeouts, 8);
+  assert.equal(pool.stats().decreases, 1);
+
+  // Sequential failures each cut again until the minimum
+  for (let i = 0; i < 3; i++) {
+    await pool.run([0], async () => {
+      await delay(2);
+      throw new Error('timeout');
+    });
+  }
+  assert.equal(pool.stats().finalLimit, 2);
+});
+
+test('slow successes count as congestion', async () => {
+  const pool = new AdaptivePool({ initial: 4, targetLatencyMs: 5 });
+  await pool.run([0], () => delay(20));
+  assert.equal(pool.stats().slow, 1);
+  assert.equal(pool.stats().finalLimit, 2);
+});
+
+test('streams results through onSettled without collecting them', async () => {
+  const settled = [];
+  const pool = new AdaptivePool({
+    collectResults: false,
+    onSettled: (result, error, index) => settled.push([index, result, error && error.message])
+  });
+  const results = await pool.run([1, 2], async n => {
+    if (n === 2) throw new Error('failed');
+    return n;
+  });
+
+  assert.deepEqual(results, []);
+  assert.deepEqual(settled.sort(), [[0, 1, null], [1, null, 'failed']]);
+  assert.equal(pool.stats().errors, 1);
+});
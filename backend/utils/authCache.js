@@ -0,0 +1,123 @@
+const jwt = require('jsonwebtoken');
+const User = require('../models/User');
+const AuthInvalidation = require('../models/AuthInvalidation');
+const LruCache = require('./lruCache');
+const metrics = require('./metrics');
+
+const JWT_SECRET = process.env.JWT_SECRET || 'scrapi-jwt-secret-key-change-in-production';
+// Invalidations written by other nodes may carry a slightly different clock
+const CLOCK_SKEW_MS = 5000;
+
+// Verified tokens and user documents for the auth middleware.
+// Users are cached as plain objects and hydrated per request, so a handler
+// that modifies req.user never touches the cached copy. Routes that change
+// a user call invalidateUser(); with AUTH_CACHE_SHARED=true the
+// invalidation is also written to Mongo and picked up by the other API
+// nodes within AUTH_CACHE_SYNC_MS.
+class AuthCache {
+  constructor() {
+    const ttlMs = parseInt(process.env.AUTH_CACHE_TTL_MS ?? 30000);
+    const maxSize = parseInt(process.env.AUTH_CACHE_SIZE) || 5000;
+    this.tokens = new LruCache({ maxSize, ttlMs });
+    this.users = new LruCache({ maxSize, ttlMs });
+    this.shared = process.env.AUTH_CACHE_SHARED === 'true';
+    this.syncMs = parseInt(process.env.AUTH_CACHE_SYNC_MS) || 2000;
+    this.syncTimer = null;
+    this.lastSync = new Date();
+    this.registerMetrics();
+  }
+
+  /**
+   * Cache statistics are operational data: they are only exposed through
+   * the metrics endpoint (METRICS_TOKEN)
+   */
+  registerMetrics() {
+    const caches = { tokens: this.tokens, users: this.users };
+    const eachCache = fn => Object.entries(caches).forEach(([name, cache]) => fn(name, cache.stats()));
+    metrics.gauge({
+      name: 'scrapi_auth_cache_entries',
+      help: 'Entries in the auth caches',
+      labelNames: ['cache'],
+      collect: gauge => eachCache((name, stats) => gauge.set({ cache: name }, stats.size))
+    });
+    metrics.gauge({
+      name: 'scrapi_auth_cache_max_entries',
+      help: 'Capacity of the auth caches',
+      labelNames: ['cache'],
+      collect: gauge => eachCache((name, stats) => gauge.set({ cache: name }, stats.maxSize))
+    });
+    metrics.counter({
+      name: 'scrapi_auth_cache_lookups_total',
+      help: 'Auth cache lookups by result',
+      labelNames: ['cache', 'result'],
+      collect: counter => eachCache((name, stats) => {
+        counter.set({ cache: name, result: 'hit' }, stats.hits);
+        counter.set({ cache: name, result: 'miss' }, stats.misses);
+      })
+    });
+    metrics.counter({
+      name: 'scrapi_auth_cache_evictions_total',
+      help: 'Auth cache entries evicted to stay within capacity',
+      labelNames: ['cache'],
+      collect: counter => eachCache((name, stats) => counter.set({ cache: name }, stats.evictions))
+    });
+  }
+
+  /**
+   * Decoded JWT payload; throws like jwt.verify for bad or expired tokens
+   */
+  verifyToken(token) {
+    const cached = this.tokens.get(token);
+    if (cached) return cached;
+
+    const decoded = jwt.verify(token, JWT_SECRET);
+    const ttlMs = decoded.exp ? decoded.exp * 1000 - Date.now() : this.tokens.ttlMs;
+    this.tokens.set(token, decoded, ttlMs);
+    return decoded;
+  }
+
+  /**
+   * User document without the password, or null if the user does not exist
+   */
+  async getUser(userId) {
+    this.startSync();
+    const key = String(userId);
+    let user = this.users.get(key);
+    if (!user) {
+      user = await User.findById(userId).select('-password').lean();
+      if (!user) return null;
+      this.users.set(key, user);
+    }
+    return User.hydrate(user);
+  }
+
+  /**
+   * Drop a user's cached document after it changed
+   */
+  async invalidateUser(userId) {
+    const key = String(userId);
+    this.users.delete(key);
+    if (this.shared) {
+      await AuthInvalidation.create({ userId: key });
+    }
+  }
+
+  startSync() {
+    if (!this.shared || this.syncTimer) return;
+    this.syncTimer = setInterval(() => {
+      this.sync().catch(err => console.error('Auth cache sync error:', err.message));
+    }, this.syncMs);
+    this.syncTimer.unref();
+  }
+
+  async sync() {
+    const since = new Date(this.lastSync.getTime() - CLOCK_SKEW_MS);
+    const entries = await AuthInvalidation.find({ createdAt: { $gte: since } }, { userId: 1, createdAt: 1 }).lean();
+    entries.forEach(entry => {
+      this.users.delete(entry.userId);
+      if (entry.createdAt > this.lastSync) this.lastSync = entry.createdAt;
+    });
+  }
+}
+
+module.exports = new AuthCache();
@@ -1,99 +1,409 @@
-const puppeteer = require('puppeteer');
+const fs = require('fs');
+const path = require('path');
+const os = require('os');
+const puppeteer = require('puppeteer-extra');
+const StealthPlugin = require('puppeteer-extra-plugin-stealth');
 const proxyManager = require('./proxyManager');
+const { ResourceStats, applyResourceBlocking } = require('./resourceBlocker');
+const runMeter = require('./runMeter');
+const metrics = require('./metrics');
+const { processTreeRss } = require('./processStats');
 
-// Browser Manager for Puppeteer instances
+puppeteer.use(StealthPlugin());
+
+/**
+ * Reject if a promise does not settle within ms
+ */
+function withTimeout(promise, ms, message) {
+  let timer;
+  return Promise.race([
+    promise,
+    new Promise((_, reject) => {
+      timer = setTimeout(() => reject(new Error(message)), ms);
+    })
+  ]).finally(() => clearTimeout(timer));
+}
+
+// A run's isolated view of a pooled browser: one incognito context plus a
+// small free-list of pages that are reset to about:blank and reused.
+class BrowserSession {
+  constructor(manager, slot, context, options) {
+    this.manager = manager;
+    this.slot = slot;
+    this.context = context;
+    this.setupPage = options.setupPage || null;
+    this.resourceBlocking = options.resourceBlocking || null;
+    // Sessions opened by a run also count into the run's meter
+    const meter = runMeter.current();
+    this.resourceStats = new ResourceStats(meter ? meter.resources : null);
+    this.idlePages = [];
+    this.pageUses = new WeakMap();
+    this.pagesInUse = 0;
+    this.closed = false;
+  }
+
+  checkOut(page) {
+    this.pagesInUse++;
+    this.manager.pagesInUse++;
+    return page;
+  }
+
+  checkIn() {
+    if (this.pagesInUse === 0) return;
+    this.pagesInUse--;
+    this.manager.pagesInUse--;
+  }
+
+  async newPage() {
+    while (this.idlePages.length > 0) {
+      const page = this.idlePages.pop();
+      if (!page.isClosed()) return this.checkOut(page);
+    }
+
+    const page = await this.context.newPage();
+    this.pageUses.set(page, 0);
+    this.manager.recordPageOpened(this.slot);
+    await applyResourceBlocking(page, this.resourceBlocking, this.resourceStats);
+    if (this.setupPage) await this.setupPage(page);
+    return this.checkOut(page);
+  }
+
+  async releasePage(page) {
+    if (!page) return;
+    this.checkIn();
+    if (page.isClosed()) return;
+    const uses = (this.pageUses.get(page) || 0) + 1;
+    this.pageUses.set(page, uses);
+
+    if (this.closed || uses >= this.manager.pageReuse) {
+      await page.close().catch(() => {});
+      return;
+    }
+
+    try {
+      // Drop the previous document so its memory is released while idle
+      await page.goto('about:blank', { timeout: 5000 });
+      this.idlePages.push(page);
+    } catch (err) {
+      await page.close().catch(() => {});
+    }
+  }
+
+  async close() {
+    if (this.closed) return;
+    this.closed = true;
+    this.idlePages = [];
+    this.manager.pagesInUse -= this.pagesInUse;
+    this.pagesInUse = 0;
+    await this.context.close().catch(() => {});
+    this.manager.releaseSlot(this.slot);
+  }
+}
+
+// Browser Manager - a pool of warm Puppeteer browsers.
+// Runs borrow an incognito context from the least loaded browser instead of
+// launching their own Chromium. Browsers are recycled after maxPagesPerBrowser
+// pages and replaced when a health check fails.
 class BrowserManager {
   constructor() {
-    this.browser = null;
-  }
-
-  async getBrowser(useProxy = false) {
-    if (!this.browser || !this.browser.isConnected()) {
-      const launchOptions = {
-        headless: 'new',
-        args: [
-          '--no-sandbox',
-          '--disable-setuid-sandbox',
-          '--disable-dev-shm-usage',
-          '--disable-accelerated-2d-canvas',
-          '--no-first-run',
-          '--no-zygote',
-          '--single-process',
-          '--disable-gpu',
-          '--disable-blink-features=AutomationControlled',
-          '--disable-web-security',
-          '--disable-features=IsolateOrigins,site-per-process',
-        ],
-      };
-
-      // Try to find Chrome/Chromium executable
-      const fs = require('fs');
-      const path = require('path');
-      const os = require('os');
-      
-      // First check Puppeteer cache (most reliable)
-      const puppeteerCachePath = path.join(os.homedir(), '.cache', 'puppeteer');
-      const possiblePuppeteerPaths = [];
-      
-      if (fs.existsSync(puppeteerCachePath)) {
-        // Find chrome executable in Puppeteer cache
-        try {
-          const chromeDir = path.join(puppeteerCachePath, 'chrome');
-          if (fs.existsSync(chromeDir)) {
-            const versions = fs.readdirSync(chromeDir);
-            for (const version of versions) {
-              const chromePath = path.join(chromeDir, version, 'chrome-linux64', 'chrome');
-              if (fs.existsSync(chromePath)) {
-                possiblePuppeteerPaths.push(chromePath);
-              }
+    this.poolSize = parseInt(process.env.BROWSER_POOL_SIZE) || 2;
+    this.maxPagesPerBrowser = parseInt(process.env.BROWSER_MAX_PAGES) || 200;
+    this.pageReuse = parseInt(process.env.BROWSER_PAGE_REUSE) || 10;
+    this.healthCheckMs = parseInt(process.env.BROWSER_HEALTH_CHECK_MS) || 30000;
+
+    this.slots = [];
+    this.slotWaiters = [];
+    this.nextSlotId = 1;
+    this.executablePath = undefined;
+    this.healthTimer = null;
+    this.pagesInUse = 0;
+    runMeter.setPidSource(() => this.pids());
+    this.registerMetrics();
+  }
+
+  registerMetrics() {
+    metrics.gauge({
+      name: 'scrapi_browser_pool_size',
+      help: 'Browser slots in the pool',
+      collect: gauge => gauge.set({}, this.slots.length)
+    });
+    metrics.gauge({
+      name: 'scrapi_browsers_connected',
+      help: 'Pooled browsers that are launched and connected',
+      collect: gauge => gauge.set({}, this.slots.filter(s => s.browser && s.browser.isConnected()).length)
+    });
+    metrics.gauge({
+      name: 'scrapi_browser_sessions_active',
+      help: 'Browser contexts currently borrowed by runs',
+      collect: gauge => gauge.set({}, this.slots.reduce((total, s) => total + s.activeSessions, 0))
+    });
+    metrics.gauge({
+      name: 'scrapi_browser_pages_active',
+      help: 'Pages currently checked out by scrapers',
+      collect: gauge => gauge.set({}, this.pagesInUse)
+    });
+    metrics.gauge({
+      name: 'scrapi_browser_rss_bytes',
+      help: 'Resident memory of all pooled Chromium process trees in bytes',
+      collect: gauge => gauge.set({}, processTreeRss(this.pids()))
+    });
+    this.recycles = metrics.counter({
+      name: 'scrapi_browser_recycles_total',
+      help: 'Browsers replaced after reaching their page budget or failing a health check'
+    });
+  }
+
+  findExecutablePath() {
+    if (this.executablePath !== undefined) return this.executablePath;
+
+    // First check Puppeteer cache (most reliable)
+    const puppeteerCachePath = path.join(os.homedir(), '.cache', 'puppeteer');
+    const possiblePuppeteerPaths = [];
+
+    if (fs.existsSync(puppeteerCachePath)) {
+      // Find chrome executable in Puppeteer cache
+      try {
+        const chromeDir = path.join(puppeteerCachePath, 'chrome');
+        if (fs.existsSync(chromeDir)) {
+          const versions = fs.readdirSync(chromeDir);
+          for (const version of versions) {
+            const chromePath = path.join(chromeDir, version, 'chrome-linux64', 'chrome');
+            if (fs.existsSync(chromePath)) {
+              possiblePuppeteerPaths.push(chromePath);
             }
           }
-        } catch (err) {
-          console.warn('Could not scan Puppeteer cache:', err.message);
-        }
-      }
-      
-      // System Chrome paths as fallback
-      const systemPaths = [
-        '/usr/bin/chromium',
-        '/usr/bin/chromium-browser',
-        '/usr/bin/google-chrome',
-        '/usr/bin/google-chrome-stable'
-      ];
-      
-      const allPaths = [...possiblePuppeteerPaths, ...systemPaths];
-      
-      // Try each path
-      for (const chromePath of allPaths) {
-        if (fs.existsSync(chromePath)) {
-          launchOptions.executablePath = chromePath;
-          console.log(`🔧 Using Chrome: ${chromePath}`);
-          break;
         }
+      } catch (err) {
+        console.warn('Could not scan Puppeteer cache:', err.message);
       }
-      
+    }
+
+    // System Chrome paths as fallback
+    const systemPaths = [
+      '/usr/bin/chromium',
+      '/usr/bin/chromium-browser',
+      '/usr/bin/google-chrome',
+      '/usr/bin/google-chrome-stable'
+    ];
+
+    this.executablePath = [...possiblePuppeteerPaths, ...systemPaths].find(p => fs.existsSync(p)) || null;
+
+    if (this.executablePath) {
+      console.log(`🔧 Using Chrome: ${this.executablePath}`);
+    } else {
       // If no Chrome found, let Puppeteer use its default (will download if needed)
-      if (!launchOptions.executablePath) {
-        console.log('⚠️  No Chrome found, using Puppeteer default');
-        // Don't throw error, let Puppeteer handle it
+      console.log('⚠️  No Chrome found, using Puppeteer default');
+    }
+    return this.executablePath;
+  }
+
+  async launchBrowser() {
+    const launchOptions = {
+      headless: true,
+      args: [
+        '--no-sandbox',
+        '--disable-setuid-sandbox',
+        '--disable-dev-shm-usage',
+        '--disable-accelerated-2d-canvas',
+        '--no-first-run',
+        '--disable-gpu',
+        '--disable-blink-features=AutomationControlled',
+        '--window-size=1920,1080',
+      ],
+      defaultViewport: { width: 1920, height: 1080 }
+    };
+
+    const executablePath = this.findExecutablePath();
+    if (executablePath) launchOptions.executablePath = executablePath;
+
+    return puppeteer.launch(launchOptions);
+  }
+
+  /**
+   * Launch (or relaunch) the browser behind a slot
+   */
+  startSlot(slot) {
+    slot.launching = this.launchBrowser()
+      .then(browser => {
+        slot.browser = browser;
+        slot.pagesOpened = 0;
+        slot.retiring = false;
+        slot.launchedAt = Date.now();
+        browser.on('disconnected', () => {
+          if (slot.browser === browser) slot.browser = null;
+        });
+        this.wakeSlotWaiters();
+        return browser;
+      })
+      .finally(() => {
+        slot.launching = null;
+      });
+    return slot.launching;
+  }
+
+  addSlot() {
+    const slot = {
+      id: this.nextSlotId++,
+      browser: null,
+      launching: null,
+      pagesOpened: 0,
+      activeSessions: 0,
+      retiring: false,
+      launchedAt: null
+    };
+    this.slots.push(slot);
+    return slot;
+  }
+
+  /**
+   * Pre-launch the pool so the first runs do not pay Chromium start-up
+   */
+  async warmUp() {
+    const start = Date.now();
+    while (this.slots.length < this.poolSize) this.addSlot();
+    await Promise.all(this.slots.map(slot => this.ensureBrowser(slot).catch(err => {
+      console.error(`❌ Browser ${slot.id} failed to launch:`, err.message);
+    })));
+    this.startHealthChecks();
+    console.log(`🌐 Browser pool warm: ${this.slots.filter(s => s.browser).length}/${this.poolSize} browsers in ${Date.now() - start}ms`);
+  }
+
+  async ensureBrowser(slot) {
+    if (slot.browser && slot.browser.isConnected()) return slot.browser;
+    if (slot.launching) return slot.launching;
+    return this.startSlot(slot);
+  }
+
+  /**
+   * Least loaded slot that is not being recycled. When every slot is
+   * retiring, wait for one to be relaunched rather than growing the pool
+   * past poolSize.
+   */
+  async pickSlot() {
+    while (this.slots.length < this.poolSize) this.addSlot();
+    for (;;) {
+      const candidates = this.slots.filter(s => !s.retiring);
+      if (candidates.length > 0) {
+        return candidates.reduce((best, s) => (s.activeSessions < best.activeSessions ? s : best));
       }
+      await new Promise(resolve => this.slotWaiters.push(resolve));
+    }
+  }
 
-      // Add proxy if requested
-      if (useProxy) {
+  wakeSlotWaiters() {
+    const waiters = this.slotWaiters;
+    this.slotWaiters = [];
+    waiters.forEach(resolve => resolve());
+  }
+
+  /**
+   * Borrow an incognito context from the pool.
+   * options.setupPage(page) runs once for every freshly created page and
+   * options.resourceBlocking ({ blockTypes, denyPatterns, allowPatterns })
+   * installs request interception on it.
+   */
+  async acquireContext(options = {}) {
+    const slot = await this.pickSlot();
+    slot.activeSessions++;
+    try {
+      const browser = await this.ensureBrowser(slot);
+      const contextOptions = {};
+      if (options.useProxy) {
         const proxy = proxyManager.getNextProxy();
-        if (proxy) {
-          launchOptions.args.push(`--proxy-server=${proxy}`);
-        }
+        if (proxy) contextOptions.proxyServer = proxy;
       }
-
-      this.browser = await puppeteer.launch(launchOptions);
+      const context = await browser.createBrowserContext(contextOptions);
+      return new BrowserSession(this, slot, context, options);
+    } catch (err) {
+      this.releaseSlot(slot);
+      throw err;
     }
-    return this.browser;
   }
 
-  async getPage(useProxy = false) {
-    const browser = await this.getBrowser(useProxy);
-    const page = await browser.newPage();
+  recordPageOpened(slot) {
+    slot.pagesOpened++;
+    if (slot.pagesOpened >= this.maxPagesPerBrowser) slot.retiring = true;
+  }
+
+  releaseSlot(slot) {
+    slot.activeSessions = Math.max(0, slot.activeSessions - 1);
+    if (slot.retiring && slot.activeSessions === 0) this.recycle(slot);
+  }
+
+  /**
+   * Replace a slot's browser once nothing uses it anymore
+   */
+  recycle(slot) {
+    const browser = slot.browser;
+    slot.browser = null;
+    this.recycles.inc();
+    if (browser) browser.close().catch(() => {});
+    this.startSlot(slot).catch(err => {
+      console.error(`❌ Browser ${slot.id} relaunch failed:`, err.message);
+      // Back in rotation without a browser: the next session launches one
+      slot.retiring = false;
+      this.wakeSlotWaiters();
+    });
+  }
+
+  startHealthChecks() {
+    if (this.healthTimer) return;
+    this.healthTimer = setInterval(() => {
+      this.checkHealth().catch(err => console.error('Browser health check error:', err.message));
+    }, this.healthCheckMs);
+    this.healthTimer.unref();
+  }
+
+  async checkHealth() {
+    await Promise.all(this.slots.map(async slot => {
+      if (slot.launching) return;
+      try {
+        if (!slot.browser || !slot.browser.isConnected()) throw new Error('disconnected');
+        await withTimeout(slot.browser.version(), 5000, 'unresponsive');
+      } catch (err) {
+        console.warn(`⚠️  Browser ${slot.id} unhealthy (${err.message}), recycling`);
+        slot.retiring = true;
+        if (slot.activeSessions === 0) this.recycle(slot);
+      }
+    }));
+  }
+
+  stats() {
+    return {
+      size: this.slots.length,
+      browsers: this.slots.map(s => ({
+        id: s.id,
+        connected: !!(s.browser && s.browser.isConnected()),
+        pid: s.browser?.process()?.pid || null,
+        activeSessions: s.activeSessions,
+        pagesOpened: s.pagesOpened,
+        retiring: s.retiring
+      }))
+    };
+  }
+
+  /**
+   * Root pids of the pooled browsers (for memory sampling)
+   */
+  pids() {
+    return this.slots.map(s => s.browser?.process()?.pid).filter(Boolean);
+  }
+
+  async getBrowser() {
+    return this.ensureBrowser(await this.pickSlot());
+  }
+
+  /**
+   * Standalone page in its own pooled context; scrapers pass the run's
+   * options.resourceBlocking so the actor's rules apply to it
+   */
+  async getPage(useProxy = false, resourceBlocking = null) {
+    const session = await this.acquireContext({ useProxy, resourceBlocking });
+    const page = await session.newPage();
+    // Standalone pages own their context; closing the page returns it to the pool
+    page.once('close', () => {
+      session.close().catch(() => {});
+    });
 
     // Set random user agent
     await page.setUserAgent(proxyManager.getRandomUserAgent());
@@ -118,10 +428,11 @@ class BrowserManager {
   }
 
   async closeBrowser() {
-    if (this.browser) {
-      await this.browser.close();
-      this.browser = null;
-    }
+    clearInterval(this.healthTimer);
+    this.healthTimer = null;
+    const slots = this.slots;
+    this.slots = [];
+    await Promise.all(slots.map(s => (s.browser ? s.browser.close().catch(() => {}) : null)));
   }
 }
 
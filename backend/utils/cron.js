@@ -0,0 +1,151 @@
+// Minimal 5-field cron expressions (minute hour day-of-month month day-of-week),
+// evaluated in UTC. Supports *, lists, ranges, steps (*/15, 1-30/5), month
+// and weekday names and the @hourly/@daily/@weekly/@monthly/@yearly macros.
+// As in classic cron, when both day fields are restricted a day matches if
+// either one does.
+
+const MACROS = {
+  '@yearly': '0 0 1 1 *',
+  '@annually': '0 0 1 1 *',
+  '@monthly': '0 0 1 * *',
+  '@weekly': '0 0 * * 0',
+  '@daily': '0 0 * * *',
+  '@midnight': '0 0 * * *',
+  '@hourly': '0 * * * *'
+};
+
+const FIELDS = [
+  { name: 'minute', min: 0, max: 59 },
+  { name: 'hour', min: 0, max: 23 },
+  { name: 'dayOfMonth', min: 1, max: 31 },
+  { name: 'month', min: 1, max: 12, names: ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC'] },
+  { name: 'dayOfWeek', min: 0, max: 7, names: ['SUN', 'MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT'] }
+];
+
+// Searching further than this means the expression never matches (e.g. 30 FEB)
+const MAX_SEARCH_YEARS = 5;
+
+function parseValue(token, field) {
+  const index = field.names ? field.names.indexOf(token.toUpperCase()) : -1;
+  const value = index >= 0 ? index + (field.name === 'month' ? 1 : 0) : Number(token);
+  if (!Number.isInteger(value) || value < field.min || value > field.max) {
+    throw new Error(`Invalid ${field.name} value "${token}"`);
+  }
+  return value;
+}
+
+function parseField(text, field) {
+  const values = new Set();
+  for (const part of text.split(',')) {
+    const [range, stepText] = part.split('/');
+    const step = stepText === undefined ? 1 : Number(stepText);
+    if (!Number.isInteger(step) || step < 1) throw new Error(`Invalid step in ${field.name} "${part}"`);
+
+    let start;
+    let end;
+    if (range === '*') {
+      start = field.min;
+      end = field.max;
+    } else if (range.includes('-')) {
+      const [from, to] = range.split('-');
+      start = parseValue(from, field);
+      end = parseValue(to, field);
+      if (start > end) throw new Error(`Invalid range in ${field.name} "${part}"`);
+    } else {
+      start = parseValue(range, field);
+      end = stepText === undefined ? start : field.max;
+    }
+    for (let v = start; v <= end; v += step) values.add(v);
+  }
+  return values;
+}
+
+/**
+ * Parse an expression; throws with a readable message when it is invalid
+ */
+function parseCron(expression) {
+  const source = String(expression || '').trim();
+  const expanded = MACROS[source.toLowerCase()] || source;
+  const parts = expanded.split(/\s+/);
+  if (parts.length !== 5) {
+    throw new Error(`Cron expression "${source}" must have 5 fields (minute hour day month weekday)`);
+  }
+
+  const [minutes, hours, daysOfMonth, months, daysOfWeek] = parts.map((part, i) => parseField(part, FIELDS[i]));
+  // 7 is Sunday too
+  if (daysOfWeek.has(7)) daysOfWeek.add(0);
+
+  return {
+    source,
+    minutes,
+    hours,
+    daysOfMonth,
+    months,
+    daysOfWeek,
+    domRestricted: parts[2] !== '*',
+    dowRestricted: parts[4] !== '*'
+  };
+}
+
+function dayMatches(cron, date) {
+  const dom = cron.daysOfMonth.has(date.getUTCDate());
+  const dow = cron.daysOfWeek.has(date.getUTCDay());
+  if (cron.domRestricted && cron.dowRestricted) return dom || dow;
+  if (cron.domRestricted) return dom;
+  if (cron.dowRestricted) return dow;
+  return true;
+}
+
+/**
+ * First time strictly after `after` that matches the expression (UTC)
+ */
+function nextAfter(expression, after = new Date()) {
+  const cron = typeof expression === 'string' ? parseCron(expression) : expression;
+  const date = new Date(after.getTime());
+  date.setUTCSeconds(0, 0);
+  date.setUTCMinutes(date.getUTCMinutes() + 1);
+  const limit = after.getTime() + MAX_SEARCH_YEARS * 366 * 24 * 3600 * 1000;
+
+  while (date.getTime() <= limit) {
+    if (!cron.months.has(date.getUTCMonth() + 1)) {
+      date.setUTCMonth(date.getUTCMonth() + 1, 1);
+      date.setUTCHours(0, 0);
+      continue;
+    }
+    if (!dayMatches(cron, date)) {
+      date.setUTCDate(date.getUTCDate() + 1);
+      date.setUTCHours(0, 0);
+      continue;
+    }
+    if (!cron.hours.has(date.getUTCHours())) {
+      date.setUTCHours(date.getUTCHours() + 1, 0);
+      continue;
+    }
+    if (!cron.minutes.has(date.getUTCMinutes())) {
+      date.setUTCMinutes(date.getUTCMinutes() + 1);
+      continue;
+    }
+    return date;
+  }
+  throw new Error(`Cron expression "${cron.source}" never matches`);
+}
+
+/**
+ * The next `count` fire times after a date, for previews
+ */
+function upcoming(expression, count = 5, after = new Date()) {
+  const cron = parseCron(expression);
+  const times = [];
+  let current = after;
+  for (let i = 0; i < count; i++) {
+    current = nextAfter(cron, current);
+    times.push(current);
+  }
+  return times;
+}
+
+module.exports = {
+  parseCron,
+  nextAfter,
+  upcoming
+};
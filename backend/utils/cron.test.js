@@ -0,0 +1,57 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const { parseCron, nextAfter, upcoming } = require('./cron');
+
+const at = iso => new Date(iso);
+
+test('parseCron expands lists, ranges, steps and names', () => {
+  const cron = parseCron('0,30 9-17/4 * JAN-MAR mon-fri');
+  assert.deepEqual([...cron.minutes], [0, 30]);
+  assert.deepEqual([...cron.hours], [9, 13, 17]);
+  assert.deepEqual([...cron.months], [1, 2, 3]);
+  assert.deepEqual([...cron.daysOfWeek], [1, 2, 3, 4, 5]);
+  assert.equal(cron.domRestricted, false);
+  assert.equal(cron.dowRestricted, true);
+});
+
+test('parseCron treats 7 as Sunday and expands macros', () => {
+  assert.ok(parseCron('0 0 * * 7').daysOfWeek.has(0));
+  assert.deepEqual([...parseCron('@hourly').minutes], [0]);
+  assert.equal(parseCron('@daily').hours.size, 1);
+});
+
+test('parseCron rejects malformed expressions', () => {
+  assert.throws(() => parseCron('* * * *'), /must have 5 fields/);
+  assert.throws(() => parseCron('60 * * * *'), /Invalid minute value "60"/);
+  assert.throws(() => parseCron('*/0 * * * *'), /Invalid step/);
+  assert.throws(() => parseCron('* 10-2 * * *'), /Invalid range/);
+  assert.throws(() => parseCron('* * * FOO *'), /Invalid month/);
+});
+
+test('nextAfter returns the next matching minute strictly after the date', () => {
+  assert.deepEqual(nextAfter('*/15 * * * *', at('2026-03-10T10:07:42Z')), at('2026-03-10T10:15:00Z'));
+  assert.deepEqual(nextAfter('*/15 * * * *', at('2026-03-10T10:15:00Z')), at('2026-03-10T10:30:00Z'));
+  assert.deepEqual(nextAfter('30 2 * * *', at('2026-03-10T03:00:00Z')), at('2026-03-11T02:30:00Z'));
+});
+
+test('nextAfter rolls over months and years', () => {
+  assert.deepEqual(nextAfter('0 0 1 * *', at('2026-01-31T12:00:00Z')), at('2026-02-01T00:00:00Z'));
+  assert.deepEqual(nextAfter('@yearly', at('2026-06-01T00:00:00Z')), at('2027-01-01T00:00:00Z'));
+  assert.deepEqual(nextAfter('0 12 29 FEB *', at('2026-01-01T00:00:00Z')), at('2028-02-29T12:00:00Z'));
+});
+
+test('nextAfter matches either day field when both are restricted', () => {
+  // The 15th (a Sunday) or any Monday
+  const cron = '0 8 15 * MON';
+  assert.deepEqual(nextAfter(cron, at('2026-03-10T09:00:00Z')), at('2026-03-15T08:00:00Z'));
+  assert.deepEqual(nextAfter(cron, at('2026-03-15T09:00:00Z')), at('2026-03-16T08:00:00Z'));
+});
+
+test('nextAfter throws for expressions that never match', () => {
+  assert.throws(() => nextAfter('0 0 30 FEB *', at('2026-01-01T00:00:00Z')), /never matches/);
+});
+
+test('upcoming lists consecutive fire times', () => {
+  const times = upcoming('0 */6 * * *', 3, at('2026-03-10T05:00:00Z'));
+  assert.deepEqual(times, [at('2026-03-10T06:00:00Z'), at('2026-03-10T12:00:00Z'), at('2026-03-10T18:00:00Z')]);
+});
@@ -0,0 +1,98 @@
+const datasetStore = require('./datasetStore');
+
+// Streaming dataset export.
+// Items come off a Mongo cursor and are written as NDJSON or CSV in
+// coalesced chunks; when the socket buffer is full the cursor waits for
+// 'drain', so memory stays bounded by one cursor batch plus one chunk no
+// matter how large the run is.
+
+const CHUNK_BYTES = parseInt(process.env.EXPORT_CHUNK_BYTES) || 64 * 1024;
+
+const FORMATS = {
+  ndjson: { contentType: 'application/x-ndjson; charset=utf-8', extension: 'ndjson' },
+  csv: { contentType: 'text/csv; charset=utf-8', extension: 'csv' }
+};
+
+/**
+ * One CSV cell; objects and arrays are written as JSON
+ */
+function csvCell(value) {
+  if (value === null || value === undefined) return '';
+  const text = typeof value === 'object' ? JSON.stringify(value) : String(value);
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+}
+
+/**
+ * Value at a dotted path (location.lat)
+ */
+function valueAt(item, path) {
+  let current = item;
+  for (const key of path.split('.')) {
+    if (current === null || current === undefined) return undefined;
+    current = current[key];
+  }
+  return current;
+}
+
+/**
+ * Write a chunk, waiting for 'drain' when the socket buffer is full
+ */
+function writeChunk(res, chunk) {
+  if (res.destroyed) return Promise.reject(new Error('Client disconnected'));
+  if (res.write(chunk)) return Promise.resolve();
+
+  return new Promise((resolve, reject) => {
+    const cleanup = () => {
+      res.off('drain', onDrain);
+      res.off('close', onClose);
+    };
+    const onDrain = () => { cleanup(); resolve(); };
+    const onClose = () => { cleanup(); reject(new Error('Client disconnected')); };
+    res.on('drain', onDrain);
+    res.on('close', onClose);
+  });
+}
+
+/**
+ * Stream a run's items to an Express response; resolves with the item count.
+ * CSV columns are the requested fields, or every top-level key in the run.
+ */
+async function streamExport(run, res, { format = 'ndjson', fields = [] } = {}) {
+  const spec = FORMATS[format];
+  if (!spec) throw new Error(`Unsupported export format: ${format}`);
+
+  const columns = format === 'csv'
+    ? (fields.length > 0 ? fields : await datasetStore.itemKeys(run))
+    : null;
+
+  res.status(200).set({
+    'Content-Type': spec.contentType,
+    'Content-Disposition': `attachment; filename="run-${run.runId}.${spec.extension}"`,
+    'Cache-Control': 'no-store',
+    'X-Total-Count': String(run.resultCount || 0)
+  });
+
+  let buffer = columns ? columns.map(csvCell).join(',') + '\r\n' : '';
+  let count = 0;
+
+  for await (const item of datasetStore.iterateItems(run, { fields })) {
+    buffer += columns
+      ? columns.map(column => csvCell(valueAt(item, column))).join(',') + '\r\n'
+      : JSON.stringify(item) + '\n';
+    count++;
+
+    if (buffer.length >= CHUNK_BYTES) {
+      await writeChunk(res, buffer);
+      buffer = '';
+    }
+  }
+
+  if (buffer) await writeChunk(res, buffer);
+  res.end();
+  return count;
+}
+
+module.exports = {
+  FORMATS,
+  streamExport
+};
@@ -0,0 +1,112 @@
+const Run = require('../models/Run');
+const datasetStore = require('./datasetStore');
+const runEvents = require('./runEvents');
+
+// Incremental output for a running run.
+// Scrapers push items as they are produced; the sink appends them to the
+// dataset in batches and keeps resultCount and progress counters on the run
+// up to date, so results are visible (and survive a crash) long before the
+// scraper returns.
+// With a workerId every batch checks the run lease right before it is
+// written: once another worker has re-claimed the run (and cleared its
+// dataset), this sink stops writing and push() throws, so a stalled worker
+// does not mix its items into the new attempt's dataset.
+class DatasetSink {
+  constructor(run, options = {}) {
+    this.run = run;
+    this.runFilter = options.workerId
+      ? { _id: run._id, 'lease.owner': options.workerId }
+      : { _id: run._id };
+    this.batchSize = options.batchSize || parseInt(process.env.DATASET_FLUSH_BATCH) || 10;
+    this.flushIntervalMs = options.flushIntervalMs || parseInt(process.env.DATASET_FLUSH_MS) || 2000;
+
+    this.buffer = [];
+    this.count = 0; // items handed to storage
+    this.progress = {};
+    this.progressDirty = false;
+    this.chain = Promise.resolve();
+    this.error = null;
+    this.leaseLost = false;
+    this.closed = false;
+    this.timer = setInterval(() => {
+      if (this.buffer.length > 0 || this.progressDirty) this.flush();
+    }, this.flushIntervalMs);
+  }
+
+  /**
+   * Add one item or an array of items
+   */
+  push(items) {
+    if (this.leaseLost) throw this.error;
+    if (this.closed) throw new Error('Dataset sink is closed');
+    const list = Array.isArray(items) ? items : [items];
+    this.buffer.push(...list.filter(item => item !== null && item !== undefined));
+    if (this.buffer.length >= this.batchSize) this.flush();
+  }
+
+  /**
+   * Merge progress counters, e.g. { collected, enriched, failed }
+   */
+  setProgress(patch) {
+    Object.assign(this.progress, patch);
+    this.progressDirty = true;
+  }
+
+  /**
+   * Write buffered items and counters; flushes run one at a time in order
+   */
+  flush() {
+    const items = this.buffer;
+    this.buffer = [];
+    const startOrdinal = this.count;
+    this.count += items.length;
+    const progress = this.progressDirty ? { ...this.progress } : null;
+    this.progressDirty = false;
+
+    this.chain = this.chain.then(async () => {
+      if (this.leaseLost) return;
+      if (items.length > 0) {
+        if (!(await Run.exists(this.runFilter))) return this.loseLease();
+        await datasetStore.appendItems(this.run, items, startOrdinal);
+      }
+
+      const $set = { resultCount: startOrdinal + items.length };
+      if (progress) {
+        Object.entries(progress).forEach(([key, value]) => { $set[`progress.${key}`] = value; });
+        $set['progress.updatedAt'] = new Date();
+      }
+      const { matchedCount } = await Run.updateOne(this.runFilter, { $set, $inc: { version: 1 } });
+      if (matchedCount === 0) return this.loseLease();
+      runEvents.publish(this.run.runId);
+    }).catch(err => {
+      console.error(`❌ Dataset flush failed for run ${this.run.runId}:`, err.message);
+      this.error = this.error || err;
+    });
+    return this.chain;
+  }
+
+  /**
+   * Another worker owns the run now: drop everything still buffered
+   */
+  loseLease() {
+    console.warn(`⚠️  Run ${this.run.runId} lease lost, dataset sink stopped`);
+    this.leaseLost = true;
+    this.error = this.error || new Error(`Run ${this.run.runId} lease lost to another worker`);
+    this.buffer = [];
+    clearInterval(this.timer);
+  }
+
+  /**
+   * Final flush; rejects if any batch failed to persist
+   */
+  async close() {
+    if (this.closed) return this.count;
+    this.closed = true;
+    clearInterval(this.timer);
+    await this.flush();
+    if (this.error) throw this.error;
+    return this.count;
+  }
+}
+
+module.exports = DatasetSink;
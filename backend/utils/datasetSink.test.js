@@ -0,0 +1,77 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const Run = require('../models/Run');
+const DatasetItem = require('../models/DatasetItem');
+const DatasetSink = require('./datasetSink');
+
+// In-memory stand-ins for the run document and the dataset collection,
+// enforcing the unique (runId, ordinal) index
+function fakeStore(t) {
+  const run = { _id: 'run-doc', runId: 'run-1', userId: 'u1', actorId: 'google-maps', lease: { owner: 'worker-a' } };
+  const items = new Map();
+  const owns = filter => filter._id === run._id &&
+    (filter['lease.owner'] === undefined || filter['lease.owner'] === run.lease.owner);
+
+  const stub = (target, name, impl) => {
+    const original = target[name];
+    target[name] = impl;
+    t.after(() => { target[name] = original; });
+  };
+  stub(Run, 'exists', async filter => (owns(filter) ? { _id: run._id } : null));
+  stub(Run, 'updateOne', async (filter, update) => {
+    if (!owns(filter)) return { matchedCount: 0, modifiedCount: 0 };
+    Object.assign(run, update.$set);
+    return { matchedCount: 1, modifiedCount: 1 };
+  });
+  stub(DatasetItem, 'insertMany', async docs => {
+    for (const doc of docs) {
+      const key = `${doc.runId}:${doc.ordinal}`;
+      if (items.has(key)) throw new Error(`E11000 duplicate key error ${key}`);
+      items.set(key, doc.data);
+    }
+  });
+  stub(DatasetItem, 'deleteMany', async ({ runId }) => {
+    for (const key of items.keys()) if (key.startsWith(`${runId}:`)) items.delete(key);
+  });
+  return { run, items };
+}
+
+test('a stale sink stops writing once the run is re-claimed', async t => {
+  t.mock.method(console, 'warn', () => {});
+  const { run, items } = fakeStore(t);
+  const options = { batchSize: 100, flushIntervalMs: 60000 };
+
+  const stale = new DatasetSink(run, { ...options, workerId: 'worker-a' });
+  stale.push([{ n: 'a0' }, { n: 'a1' }]);
+  await stale.flush();
+  assert.equal(items.size, 2);
+
+  // Lease expired: worker b claims the run and starts over (runExecutor clears the dataset)
+  run.lease.owner = 'worker-b';
+  await DatasetItem.deleteMany({ runId: run.runId });
+  const fresh = new DatasetSink(run, { ...options, workerId: 'worker-b' });
+
+  // The stalled worker wakes up and keeps flushing
+  stale.push([{ n: 'a2' }, { n: 'a3' }]);
+  await stale.flush();
+  assert.throws(() => stale.push({ n: 'a4' }), /lease lost/);
+  await assert.rejects(stale.close(), /lease lost/);
+
+  fresh.push([{ n: 'b0' }, { n: 'b1' }, { n: 'b2' }]);
+  assert.equal(await fresh.close(), 3);
+
+  assert.deepEqual([...items.values()].map(item => item.n), ['b0', 'b1', 'b2']);
+  assert.equal(run.resultCount, 3);
+});
+
+test('the owning sink writes items, counters and progress', async t => {
+  const { run, items } = fakeStore(t);
+  const sink = new DatasetSink(run, { workerId: 'worker-a', batchSize: 2, flushIntervalMs: 60000 });
+  sink.setProgress({ collected: 5 });
+  sink.push([{ n: 1 }, { n: 2 }, { n: 3 }]);
+
+  assert.equal(await sink.close(), 3);
+  assert.equal(items.size, 3);
+  assert.equal(run.resultCount, 3);
+  assert.equal(run['progress.collected'], 5);
+});
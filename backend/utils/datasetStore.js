@@ -0,0 +1,225 @@
+const DatasetItem = require('../models/DatasetItem');
+
+const INSERT_BATCH_SIZE = 500;
+const DEFAULT_PAGE_SIZE = 100;
+const MAX_PAGE_SIZE = 1000;
+const CURSOR_BATCH_SIZE = 500;
+const FIELD_NAME = /^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)*$/;
+
+/**
+ * Whether a run still keeps its results inline in run.output (pre-dataset runs)
+ */
+function isLegacyRun(run) {
+  return Array.isArray(run.output) && run.output.length > 0;
+}
+
+/**
+ * Split scraper output into summary metadata and dataset items.
+ * Scrapers that wrap their items (e.g. [{ searchString, ..., results: [...] }])
+ * keep the wrapper fields as metadata; flat outputs are stored as items.
+ */
+function splitOutput(results) {
+  if (!Array.isArray(results) || results.length === 0) {
+    return { meta: [], items: [] };
+  }
+  if (results[0] && Array.isArray(results[0].results)) {
+    return {
+      meta: results.map(({ results: nested, ...rest }) => rest),
+      items: results.flatMap(item => item.results || [])
+    };
+  }
+  return { meta: [], items: results };
+}
+
+/**
+ * Bulk insert items for a run starting at the given ordinal
+ */
+async function appendItems(run, items, startOrdinal = 0) {
+  for (let i = 0; i < items.length; i += INSERT_BATCH_SIZE) {
+    const docs = items.slice(i, i + INSERT_BATCH_SIZE).map((data, idx) => ({
+      runId: run.runId,
+      ordinal: startOrdinal + i + idx,
+      userId: run.userId,
+      actorId: run.actorId,
+      data
+    }));
+    await DatasetItem.insertMany(docs, { ordered: false, lean: true });
+  }
+  return items.length;
+}
+
+/**
+ * Remove a run's items (e.g. before a re-claimed run starts over)
+ */
+async function clearItems(runId) {
+  await DatasetItem.deleteMany({ runId });
+}
+
+/**
+ * All items of a run in dataset order, for legacy and dataset-backed runs
+ */
+async function readItems(run) {
+  if (isLegacyRun(run)) return splitOutput(run.output).items;
+  const docs = await DatasetItem.find({ runId: run.runId }, { data: 1 })
+    .sort({ ordinal: 1 })
+    .lean();
+  return docs.map(d => d.data);
+}
+
+/**
+ * Parse ?offset=&limit=&fields= into a bounded page request
+ */
+function parseItemsQuery(query) {
+  const offset = Math.max(0, parseInt(query.offset) || 0);
+  const limit = Math.min(MAX_PAGE_SIZE, Math.max(1, parseInt(query.limit) || DEFAULT_PAGE_SIZE));
+  const fields = query.fields
+    ? String(query.fields).split(',').map(f => f.trim()).filter(f => FIELD_NAME.test(f))
+    : [];
+  return { offset, limit, fields };
+}
+
+/**
+ * Copy only the requested (possibly nested) fields of an item
+ */
+function pickFields(item, fields) {
+  if (!item || fields.length === 0) return item;
+  const picked = {};
+  fields.forEach(field => {
+    const parts = field.split('.');
+    let value = item;
+    for (const part of parts) {
+      if (value === null || value === undefined) break;
+      value = value[part];
+    }
+    if (value === undefined) return;
+    let target = picked;
+    parts.slice(0, -1).forEach(part => {
+      target[part] = target[part] || {};
+      target = target[part];
+    });
+    target[parts[parts.length - 1]] = value;
+  });
+  return picked;
+}
+
+/**
+ * Mongo projection for the requested item fields (all of data when empty)
+ */
+function itemProjection(fields) {
+  const projection = { _id: 0 };
+  if (fields.length > 0) fields.forEach(f => { projection[`data.${f}`] = 1; });
+  else projection.data = 1;
+  return projection;
+}
+
+/**
+ * One page of a run's items. Ordinals are dense, so the page is a range
+ * scan on the (runId, ordinal) index rather than a skip.
+ */
+async function getItems(run, { offset, limit, fields }) {
+  if (isLegacyRun(run)) {
+    const all = splitOutput(run.output).items;
+    return {
+      items: all.slice(offset, offset + limit).map(item => pickFields(item, fields)),
+      total: all.length
+    };
+  }
+
+  const docs = await DatasetItem.find(
+    { runId: run.runId, ordinal: { $gte: offset, $lt: offset + limit } },
+    itemProjection(fields)
+  )
+    .sort({ ordinal: 1 })
+    .lean();
+
+  return {
+    items: docs.map(d => d.data || {}),
+    total: run.resultCount
+  };
+}
+
+/**
+ * Ranked full-text search over a user's dataset items (item_search index).
+ * Returns raw item documents with their text score, best matches first.
+ */
+async function searchItems(userId, search, { actorId, offset = 0, limit = 20 } = {}) {
+  const filter = { userId, $text: { $search: search } };
+  if (actorId) filter.actorId = actorId;
+
+  const [docs, total] = await Promise.all([
+    DatasetItem.find(filter, { score: { $meta: 'textScore' }, runId: 1, ordinal: 1, actorId: 1, data: 1 })
+      .sort({ score: { $meta: 'textScore' }, _id: 1 })
+      .skip(offset)
+      .limit(limit)
+      .lean(),
+    DatasetItem.countDocuments(filter)
+  ]);
+  return { items: docs, total };
+}
+
+/**
+ * Iterate a run's items in dataset order without loading them all;
+ * dataset runs are read through a cursor in batches
+ */
+async function* iterateItems(run, { fields = [] } = {}) {
+  if (isLegacyRun(run)) {
+    for (const item of splitOutput(run.output).items) yield pickFields(item, fields);
+    return;
+  }
+
+  const cursor = DatasetItem.find({ runId: run.runId }, itemProjection(fields))
+    .sort({ ordinal: 1 })
+    .lean()
+    .cursor({ batchSize: CURSOR_BATCH_SIZE });
+  try {
+    for await (const doc of cursor) yield doc.data || {};
+  } finally {
+    await cursor.close();
+  }
+}
+
+/**
+ * Top-level item keys of a run, in order of first appearance
+ */
+async function itemKeys(run) {
+  if (isLegacyRun(run)) {
+    const keys = new Set();
+    splitOutput(run.output).items.forEach(item => Object.keys(item || {}).forEach(k => keys.add(k)));
+    return [...keys];
+  }
+
+  const rows = await DatasetItem.aggregate([
+    { $match: { runId: run.runId } },
+    { $project: { ordinal: 1, keys: { $map: { input: { $objectToArray: '$data' }, in: '$$this.k' } } } },
+    { $unwind: '$keys' },
+    { $group: { _id: '$keys', first: { $min: '$ordinal' } } },
+    { $sort: { first: 1, _id: 1 } }
+  ]).allowDiskUse(true);
+  return rows.map(r => r._id);
+}
+
+/**
+ * Rebuild the original scraper output shape for API compatibility
+ */
+async function hydrateOutput(run) {
+  if (isLegacyRun(run)) return run.output;
+  const items = await readItems(run);
+  if (run.outputMeta && run.outputMeta.length > 0) {
+    return [{ ...run.outputMeta[0], results: items }];
+  }
+  return items;
+}
+
+module.exports = {
+  isLegacyRun,
+  splitOutput,
+  appendItems,
+  clearItems,
+  readItems,
+  parseItemsQuery,
+  getItems,
+  searchItems,
+  iterateItems,
+  itemKeys,
+  hydrateOutput
+};
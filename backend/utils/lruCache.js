@@ -0,0 +1,70 @@
+// Small in-process LRU cache with a per-entry TTL.
+// A Map keeps insertion order, so re-inserting on every hit makes the first
+// key the least recently used one.
+class LruCache {
+  constructor({ maxSize = 1000, ttlMs = 30000 } = {}) {
+    this.maxSize = maxSize;
+    this.ttlMs = ttlMs;
+    this.entries = new Map();
+    this.hits = 0;
+    this.misses = 0;
+    this.evictions = 0;
+  }
+
+  get enabled() {
+    return this.maxSize > 0 && this.ttlMs > 0;
+  }
+
+  get(key) {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      this.misses++;
+      return undefined;
+    }
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      this.misses++;
+      return undefined;
+    }
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return entry.value;
+  }
+
+  /**
+   * Store a value; ttlMs can only shorten the cache's TTL (e.g. token expiry)
+   */
+  set(key, value, ttlMs = this.ttlMs) {
+    if (!this.enabled) return;
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + Math.min(ttlMs, this.ttlMs) });
+    while (this.entries.size > this.maxSize) {
+      this.entries.delete(this.entries.keys().next().value);
+      this.evictions++;
+    }
+  }
+
+  delete(key) {
+    return this.entries.delete(key);
+  }
+
+  clear() {
+    this.entries.clear();
+  }
+
+  stats() {
+    const lookups = this.hits + this.misses;
+    return {
+      size: this.entries.size,
+      maxSize: this.maxSize,
+      ttlMs: this.ttlMs,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+      hitRate: lookups > 0 ? parseFloat((this.hits / lookups).toFixed(4)) : 0
+    };
+  }
+}
+
+module.exports = LruCache;
@@ -0,0 +1,62 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const LruCache = require('./lruCache');
+
+test('evicts the least recently used entry when full', () => {
+  const cache = new LruCache({ maxSize: 2, ttlMs: 60000 });
+  cache.set('a', 1);
+  cache.set('b', 2);
+  assert.equal(cache.get('a'), 1); // b is now the least recently used
+  cache.set('c', 3);
+
+  assert.equal(cache.get('b'), undefined);
+  assert.equal(cache.get('a'), 1);
+  assert.equal(cache.get('c'), 3);
+  assert.equal(cache.stats().evictions, 1);
+});
+
+test('overwriting a key refreshes it without evicting', () => {
+  const cache = new LruCache({ maxSize: 2, ttlMs: 60000 });
+  cache.set('a', 1);
+  cache.set('b', 2);
+  cache.set('a', 10);
+  cache.set('c', 3);
+
+  assert.equal(cache.get('a'), 10);
+  assert.equal(cache.get('b'), undefined);
+});
+
+test('entries expire after the TTL; a shorter per-entry TTL wins', t => {
+  t.mock.timers.enable({ apis: ['Date'] });
+  const cache = new LruCache({ maxSize: 10, ttlMs: 1000 });
+  cache.set('long', 'x', 5000); // capped at the cache TTL
+  cache.set('short', 'y', 100);
+
+  t.mock.timers.tick(150);
+  assert.equal(cache.get('short'), undefined);
+  assert.equal(cache.get('long'), 'x');
+
+  t.mock.timers.tick(900);
+  assert.equal(cache.get('long'), undefined);
+  assert.equal(cache.stats().size, 0);
+});
+
+test('a zero size or TTL disables caching', () => {
+  const cache = new LruCache({ maxSize: 0, ttlMs: 1000 });
+  cache.set('a', 1);
+  assert.equal(cache.enabled, false);
+  assert.equal(cache.get('a'), undefined);
+});
+
+test('delete and stats', () => {
+  const cache = new LruCache({ maxSize: 10, ttlMs: 60000 });
+  cache.set('u1', { name: 'Ann' });
+  cache.set('u2', { name: 'Bob' });
+
+  assert.equal(cache.delete('u1'), true);
+  cache.get('u2');
+  cache.get('u1');
+  assert.deepEqual(cache.stats(), {
+    size: 1, maxSize: 10, ttlMs: 60000, hits: 1, misses: 1, evictions: 0, hitRate: 0.5
+  });
+});
@@ -0,0 +1,210 @@
+// Prometheus-style metrics in the text exposition format (version 0.0.4).
+// Modules declare their metrics once at load time. Values that live
+// elsewhere (queue sizes, browser pool state, cache stats) are read by a
+// collect(metric) callback that runs on every scrape.
+
+const DEFAULT_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+
+function escapeLabel(value) {
+  return String(value).replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+}
+
+function formatLabels(labels) {
+  const entries = Object.entries(labels);
+  if (entries.length === 0) return '';
+  return `{${entries.map(([key, value]) => `${key}="${escapeLabel(value)}"`).join(',')}}`;
+}
+
+function formatValue(value) {
+  if (value === Infinity) return '+Inf';
+  if (value === -Infinity) return '-Inf';
+  return String(value);
+}
+
+class Metric {
+  constructor(type, { name, help, labelNames = [], collect = null }) {
+    this.type = type;
+    this.name = name;
+    this.help = help;
+    this.labelNames = labelNames;
+    this.collect = collect;
+    this.series = new Map();
+  }
+
+  /**
+   * Series for a label set, created on first use; unknown labels are ignored
+   */
+  get(labels = {}) {
+    const key = this.labelNames.map(name => labels[name] ?? '').join('\u0000');
+    let series = this.series.get(key);
+    if (!series) {
+      const picked = {};
+      this.labelNames.forEach(name => { picked[name] = labels[name] ?? ''; });
+      series = this.createSeries(picked);
+      this.series.set(key, series);
+    }
+    return series;
+  }
+
+  createSeries(labels) {
+    return { labels, value: 0 };
+  }
+
+  /**
+   * Overwrite a series value (gauges, and counters mirrored from a cumulative total)
+   */
+  set(labels, value) {
+    this.get(labels).value = value;
+  }
+
+  reset() {
+    this.series.clear();
+  }
+
+  lines() {
+    return Array.from(this.series.values()).map(s => `${this.name}${formatLabels(s.labels)} ${formatValue(s.value)}`);
+  }
+}
+
+class Counter extends Metric {
+  constructor(options) {
+    super('counter', options);
+  }
+
+  inc(labels = {}, amount = 1) {
+    this.get(labels).value += amount;
+  }
+}
+
+class Gauge extends Metric {
+  constructor(options) {
+    super('gauge', options);
+  }
+
+  inc(labels = {}, amount = 1) {
+    this.get(labels).value += amount;
+  }
+
+  dec(labels = {}, amount = 1) {
+    this.get(labels).value -= amount;
+  }
+}
+
+class Histogram extends Metric {
+  constructor(options) {
+    super('histogram', options);
+    this.buckets = (options.buckets || DEFAULT_BUCKETS).slice().sort((a, b) => a - b);
+  }
+
+  createSeries(labels) {
+    return { labels, counts: new Array(this.buckets.length).fill(0), sum: 0, count: 0 };
+  }
+
+  observe(labels, value) {
+    const series = this.get(labels);
+    series.sum += value;
+    series.count++;
+    this.buckets.forEach((bound, i) => {
+      if (value <= bound) series.counts[i]++;
+    });
+  }
+
+  /**
+   * Start timing; the returned function observes the elapsed seconds,
+   * with extra labels known only at the end (e.g. the status code)
+   */
+  startTimer(labels = {}) {
+    const start = process.hrtime.bigint();
+    return (extraLabels = {}) => {
+      const seconds = Number(process.hrtime.bigint() - start) / 1e9;
+      this.observe({ ...labels, ...extraLabels }, seconds);
+      return seconds;
+    };
+  }
+
+  lines() {
+    const lines = [];
+    for (const s of this.series.values()) {
+      this.buckets.forEach((bound, i) => {
+        lines.push(`${this.name}_bucket${formatLabels({ ...s.labels, le: formatValue(bound) })} ${s.counts[i]}`);
+      });
+      lines.push(`${this.name}_bucket${formatLabels({ ...s.labels, le: '+Inf' })} ${s.count}`);
+      lines.push(`${this.name}_sum${formatLabels(s.labels)} ${s.sum}`);
+      lines.push(`${this.name}_count${formatLabels(s.labels)} ${s.count}`);
+    }
+    return lines;
+  }
+}
+
+// Process-wide registry behind GET /metrics
+class MetricsRegistry {
+  constructor() {
+    this.contentType = 'text/plain; version=0.0.4; charset=utf-8';
+    this.metrics = new Map();
+
+    this.gauge({
+      name: 'process_resident_memory_bytes',
+      help: 'Resident memory size of the Node process in bytes',
+      collect: gauge => gauge.set({}, process.memoryUsage().rss)
+    });
+    this.counter({
+      name: 'process_cpu_seconds_total',
+      help: 'User and system CPU time of the Node process in seconds',
+      collect: counter => {
+        const { user, system } = process.cpuUsage();
+        counter.set({}, (user + system) / 1e6);
+      }
+    });
+    this.gauge({
+      name: 'process_start_time_seconds',
+      help: 'Start time of the process since the Unix epoch in seconds',
+      collect: gauge => gauge.set({}, Math.round(Date.now() / 1000 - process.uptime()))
+    });
+  }
+
+  /**
+   * Add a metric; declaring the same name again returns the existing one
+   */
+  register(metric) {
+    const existing = this.metrics.get(metric.name);
+    if (existing) return existing;
+    this.metrics.set(metric.name, metric);
+    return metric;
+  }
+
+  counter(options) {
+    return this.register(new Counter(options));
+  }
+
+  gauge(options) {
+    return this.register(new Gauge(options));
+  }
+
+  histogram(options) {
+    return this.register(new Histogram(options));
+  }
+
+  /**
+   * Every metric in the text exposition format
+   */
+  async expose() {
+    const blocks = [];
+    for (const metric of this.metrics.values()) {
+      if (metric.collect) {
+        try {
+          await metric.collect(metric);
+        } catch (error) {
+          console.error(`Metric ${metric.name} collection failed:`, error.message);
+        }
+      }
+      blocks.push([
+        `# HELP ${metric.name} ${metric.help.replace(/\\/g, '\\\\').replace(/\n/g, '\\n')}`,
+        `# TYPE ${metric.name} ${metric.type}`,
+        ...metric.lines()
+      ].join('\n'));
+    }
+    return blocks.join('\n') + '\n';
+  }
+}
+
+module.exports = new MetricsRegistry();
@@ -0,0 +1,82 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const metrics = require('./metrics');
+
+// Lines of one metric in the exposition output
+async function block(name) {
+  const text = await metrics.expose();
+  return text.split('\n').filter(line => line.startsWith(`# HELP ${name} `) ||
+    line.startsWith(`# TYPE ${name} `) || line.startsWith(name));
+}
+
+test('renders counters with HELP, TYPE and escaped labels', async () => {
+  const counter = metrics.counter({
+    name: 'test_requests_total',
+    help: 'Requests\nhandled',
+    labelNames: ['route', 'status']
+  });
+  counter.inc({ route: '/api/runs', status: 200 });
+  counter.inc({ route: '/api/runs', status: 200 }, 2);
+  counter.inc({ route: 'say "hi"\\', status: 500, ignored: 'x' });
+
+  assert.deepEqual(await block('test_requests_total'), [
+    '# HELP test_requests_total Requests\\nhandled',
+    '# TYPE test_requests_total counter',
+    'test_requests_total{route="/api/runs",status="200"} 3',
+    'test_requests_total{route="say \\"hi\\"\\\\",status="500"} 1'
+  ]);
+});
+
+test('declaring a metric twice returns the same instance', () => {
+  const first = metrics.gauge({ name: 'test_same', help: 'x' });
+  assert.equal(metrics.gauge({ name: 'test_same', help: 'x' }), first);
+});
+
+test('gauges are filled by collect on every scrape', async () => {
+  let depth = 4;
+  metrics.gauge({ name: 'test_queue_depth', help: 'Queue depth', collect: gauge => gauge.set({}, depth) });
+
+  assert.deepEqual((await block('test_queue_depth')).slice(2), ['test_queue_depth 4']);
+  depth = 7;
+  assert.deepEqual((await block('test_queue_depth')).slice(2), ['test_queue_depth 7']);
+});
+
+test('a failing collect does not break the exposition', async t => {
+  t.mock.method(console, 'error', () => {});
+  metrics.gauge({ name: 'test_broken', help: 'Broken', collect: () => { throw new Error('down'); } });
+  const text = await metrics.expose();
+  assert.match(text, /# TYPE test_broken gauge/);
+  assert.match(text, /# TYPE process_resident_memory_bytes gauge/);
+  assert.ok(text.endsWith('\n'));
+});
+
+test('histograms render cumulative buckets, sum and count', async () => {
+  const histogram = metrics.histogram({
+    name: 'test_duration_seconds',
+    help: 'Duration',
+    labelNames: ['stage'],
+    buckets: [1, 0.1]
+  });
+  histogram.observe({ stage: 'search' }, 0.05);
+  histogram.observe({ stage: 'search' }, 0.5);
+  histogram.observe({ stage: 'search' }, 2);
+
+  assert.deepEqual((await block('test_duration_seconds')).slice(2), [
+    'test_duration_seconds_bucket{stage="search",le="0.1"} 1',
+    'test_duration_seconds_bucket{stage="search",le="1"} 2',
+    'test_duration_seconds_bucket{stage="search",le="+Inf"} 3',
+    'test_duration_seconds_sum{stage="search"} 2.55',
+    'test_duration_seconds_count{stage="search"} 3'
+  ]);
+});
+
+test('startTimer observes elapsed seconds with labels known at the end', () => {
+  const histogram = metrics.histogram({ name: 'test_timer_seconds', help: 'Timer', labelNames: ['method', 'status'] });
+  const end = histogram.startTimer({ method: 'GET' });
+  const seconds = end({ status: 404 });
+
+  const series = histogram.get({ method: 'GET', status: 404 });
+  assert.equal(series.count, 1);
+  assert.equal(series.sum, seconds);
+  assert.ok(seconds >= 0);
+});
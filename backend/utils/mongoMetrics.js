@@ -0,0 +1,48 @@
+const metrics = require('./metrics');
+
+const commandDuration = metrics.histogram({
+  name: 'scrapi_mongo_command_duration_seconds',
+  help: 'MongoDB command latency in seconds',
+  labelNames: ['command', 'collection'],
+  buckets: [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5]
+});
+
+const commandErrors = metrics.counter({
+  name: 'scrapi_mongo_command_errors_total',
+  help: 'Failed MongoDB commands by class (timeout, duplicate-key, network, other)',
+  labelNames: ['command', 'class']
+});
+
+function failureClass(failure) {
+  const message = failure?.message || '';
+  if (failure?.code === 11000) return 'duplicate-key';
+  if (/timeout|timed out/i.test(message) || /Timeout/.test(failure?.name || '')) return 'timeout';
+  if (/Network/.test(failure?.name || '')) return 'network';
+  return 'other';
+}
+
+/**
+ * Time every command of a MongoClient created with monitorCommands: true
+ */
+function instrumentMongo(client) {
+  // Collection names are only on the started event
+  const collections = new Map();
+
+  client.on('commandStarted', event => {
+    const target = event.command?.[event.commandName];
+    collections.set(event.requestId, typeof target === 'string' ? target : '');
+  });
+  client.on('commandSucceeded', event => {
+    const collection = collections.get(event.requestId) || '';
+    collections.delete(event.requestId);
+    commandDuration.observe({ command: event.commandName, collection }, event.duration / 1000);
+  });
+  client.on('commandFailed', event => {
+    const collection = collections.get(event.requestId) || '';
+    collections.delete(event.requestId);
+    commandDuration.observe({ command: event.commandName, collection }, event.duration / 1000);
+    commandErrors.inc({ command: event.commandName, class: failureClass(event.failure) });
+  });
+}
+
+module.exports = { instrumentMongo };
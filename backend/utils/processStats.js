@@ -0,0 +1,133 @@
+const fs = require('fs');
+
+// Resident memory of process trees, read from /proc (Linux only).
+// Chromium spreads a browser over many processes (renderers, GPU, network
+// service), so the interesting number is the RSS of the whole tree.
+
+const PAGE_SIZE = 4096;
+// USER_HZ; 100 on every mainstream Linux build
+const CLOCK_TICKS = 100;
+
+/**
+ * Map of pid -> parent pid for every visible process
+ */
+function readParents() {
+  const parents = new Map();
+  let entries;
+  try {
+    entries = fs.readdirSync('/proc');
+  } catch (err) {
+    return parents;
+  }
+  for (const entry of entries) {
+    if (!/^\d+$/.test(entry)) continue;
+    try {
+      const stat = fs.readFileSync(`/proc/${entry}/stat`, 'utf8');
+      // comm may contain spaces and parentheses; fields resume after the last ')'
+      const fields = stat.slice(stat.lastIndexOf(')') + 2).split(' ');
+      parents.set(parseInt(entry), parseInt(fields[1]));
+    } catch (err) {
+      // process exited while scanning
+    }
+  }
+  return parents;
+}
+
+function processRss(pid) {
+  try {
+    const statm = fs.readFileSync(`/proc/${pid}/statm`, 'utf8').split(' ');
+    return parseInt(statm[1]) * PAGE_SIZE;
+  } catch (err) {
+    return 0;
+  }
+}
+
+/**
+ * The given root pids and all their descendants
+ */
+function treePids(rootPids, parents = readParents()) {
+  const roots = new Set((Array.isArray(rootPids) ? rootPids : [rootPids]).filter(Boolean));
+  if (roots.size === 0) return [];
+
+  const inTree = pid => {
+    for (let current = pid, depth = 0; current && depth < 64; depth++) {
+      if (roots.has(current)) return true;
+      current = parents.get(current);
+    }
+    return false;
+  };
+  return Array.from(parents.keys()).filter(inTree);
+}
+
+/**
+ * CPU time in ms of one process, including children it has reaped
+ * (renderers that already exited)
+ */
+function processCpuMs(pid) {
+  try {
+    const stat = fs.readFileSync(`/proc/${pid}/stat`, 'utf8');
+    const fields = stat.slice(stat.lastIndexOf(')') + 2).split(' ');
+    // utime, stime, cutime, cstime (fields 14-17) in clock ticks
+    const ticks = fields.slice(11, 15).reduce((sum, value) => sum + parseInt(value), 0);
+    return ticks * 1000 / CLOCK_TICKS;
+  } catch (err) {
+    return 0;
+  }
+}
+
+/**
+ * Total RSS in bytes of the given root pids and all their descendants
+ */
+function processTreeRss(rootPids, parents = readParents()) {
+  return treePids(rootPids, parents).reduce((total, pid) => total + processRss(pid), 0);
+}
+
+/**
+ * RSS in bytes and cumulative CPU time in ms of process trees, from one /proc scan
+ */
+function processTreeUsage(rootPids) {
+  const pids = treePids(rootPids);
+  return {
+    rssBytes: pids.reduce((total, pid) => total + processRss(pid), 0),
+    cpuMs: pids.reduce((total, pid) => total + processCpuMs(pid), 0)
+  };
+}
+
+/**
+ * Sample a tree's RSS periodically; stop() returns { peakBytes, avgBytes, samples }
+ * getPids() is called on every sample so relaunched browsers are picked up.
+ */
+function sampleRss(getPids, intervalMs = 500) {
+  let peakBytes = 0;
+  let totalBytes = 0;
+  let samples = 0;
+
+  const sample = () => {
+    const bytes = processTreeRss(getPids());
+    peakBytes = Math.max(peakBytes, bytes);
+    totalBytes += bytes;
+    samples++;
+  };
+
+  sample();
+  const timer = setInterval(sample, intervalMs);
+  timer.unref();
+
+  return {
+    stop() {
+      clearInterval(timer);
+      sample();
+      return {
+        peakBytes,
+        avgBytes: samples > 0 ? Math.round(totalBytes / samples) : 0,
+        samples
+      };
+    }
+  };
+}
+
+module.exports = {
+  processTreeRss,
+  processTreeUsage,
+  sampleRss
+};
@@ -0,0 +1,136 @@
+// Resource blocking for scraper pages.
+// Requests are aborted by resource type (image, media, font, ...) or URL
+// pattern before they hit the network. Allow patterns win over both. The
+// main document navigation is never blocked.
+
+// Typical transfer sizes used to estimate bytes saved by aborted requests
+// (an aborted request never reports its real size)
+const ESTIMATED_BYTES = {
+  image: 40 * 1024,
+  media: 500 * 1024,
+  font: 30 * 1024,
+  stylesheet: 20 * 1024,
+  script: 60 * 1024,
+  xhr: 5 * 1024,
+  fetch: 5 * 1024,
+  other: 5 * 1024
+};
+
+/**
+ * Compile a pattern list: strings match as case-insensitive substrings
+ */
+function compilePatterns(patterns = []) {
+  return patterns.map(p => {
+    if (p instanceof RegExp) return p;
+    const escaped = String(p).replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+    return new RegExp(escaped, 'i');
+  });
+}
+
+function compileConfig(config) {
+  if (!config || config.enabled === false) return null;
+  return {
+    blockTypes: new Set(config.blockTypes || []),
+    denyPatterns: compilePatterns(config.denyPatterns),
+    allowPatterns: compilePatterns(config.allowPatterns)
+  };
+}
+
+// Counters shared by every page of a session. A parent (the run's meter)
+// receives the same updates, so a run adds up all of its sessions.
+class ResourceStats {
+  constructor(parent = null) {
+    this.parent = parent;
+    this.pagesLoaded = 0;
+    this.allowedRequests = 0;
+    this.blockedRequests = 0;
+    this.blockedByType = {};
+    this.estimatedBlockedBytes = 0;
+    this.transferredBytes = 0;
+  }
+
+  recordBlocked(type) {
+    this.blockedRequests++;
+    this.blockedByType[type] = (this.blockedByType[type] || 0) + 1;
+    this.estimatedBlockedBytes += ESTIMATED_BYTES[type] || ESTIMATED_BYTES.other;
+    if (this.parent) this.parent.recordBlocked(type);
+  }
+
+  recordAllowed() {
+    this.allowedRequests++;
+    if (this.parent) this.parent.recordAllowed();
+  }
+
+  recordTransferred(bytes) {
+    this.transferredBytes += bytes;
+    if (this.parent) this.parent.recordTransferred(bytes);
+  }
+
+  recordPageLoaded() {
+    this.pagesLoaded++;
+    if (this.parent) this.parent.recordPageLoaded();
+  }
+
+  toJSON() {
+    return {
+      pagesLoaded: this.pagesLoaded,
+      allowedRequests: this.allowedRequests,
+      blockedRequests: this.blockedRequests,
+      blockedByType: this.blockedByType,
+      estimatedBlockedBytes: this.estimatedBlockedBytes,
+      transferredBytes: this.transferredBytes
+    };
+  }
+}
+
+/**
+ * Decide whether a request should be aborted
+ */
+function shouldBlock(rules, url, type) {
+  if (rules.allowPatterns.some(p => p.test(url))) return false;
+  if (rules.denyPatterns.some(p => p.test(url))) return true;
+  return rules.blockTypes.has(type);
+}
+
+/**
+ * Install request interception and byte accounting on a page
+ */
+async function applyResourceBlocking(page, config, stats) {
+  const rules = process.env.RESOURCE_BLOCKING === 'false' ? null : compileConfig(config);
+
+  if (stats) {
+    // Real bytes received over the wire for requests that were allowed
+    const client = await page.createCDPSession();
+    await client.send('Network.enable');
+    client.on('Network.loadingFinished', event => {
+      stats.recordTransferred(event.encodedDataLength || 0);
+    });
+    // Documents loaded in the tab (pooled pages are reset to about:blank between uses)
+    page.on('framenavigated', frame => {
+      if (frame === page.mainFrame() && frame.url() !== 'about:blank') stats.recordPageLoaded();
+    });
+  }
+
+  if (!rules) return;
+
+  await page.setRequestInterception(true);
+  page.on('request', request => {
+    if (request.isInterceptResolutionHandled()) return;
+
+    const type = request.resourceType();
+    const isMainDocument = request.isNavigationRequest() && request.frame() === page.mainFrame();
+
+    if (!isMainDocument && shouldBlock(rules, request.url(), type)) {
+      if (stats) stats.recordBlocked(type);
+      request.abort('blockedbyclient').catch(() => {});
+    } else {
+      if (stats) stats.recordAllowed();
+      request.continue().catch(() => {});
+    }
+  });
+}
+
+module.exports = {
+  ResourceStats,
+  applyResourceBlocking
+};
@@ -0,0 +1,80 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const { EventEmitter } = require('events');
+const { ResourceStats, applyResourceBlocking } = require('./resourceBlocker');
+
+const RULES = {
+  blockTypes: ['image', 'font'],
+  denyPatterns: ['google-analytics.com'],
+  allowPatterns: ['gstatic.com/keep']
+};
+
+// Just enough of a Puppeteer page to drive request interception
+function fakePage() {
+  const page = new EventEmitter();
+  const mainFrame = { url: () => 'https://maps.example/search' };
+  page.mainFrame = () => mainFrame;
+  page.setRequestInterception = async enabled => { page.intercepting = enabled; };
+  page.createCDPSession = async () => Object.assign(new EventEmitter(), { send: async () => {} });
+  page.request = (url, type, { navigation = false } = {}) => {
+    const request = {
+      url: () => url,
+      resourceType: () => type,
+      isNavigationRequest: () => navigation,
+      frame: () => mainFrame,
+      isInterceptResolutionHandled: () => false,
+      abort: async () => { request.outcome = 'aborted'; },
+      continue: async () => { request.outcome = 'continued'; }
+    };
+    page.emit('request', request);
+    return request.outcome;
+  };
+  return page;
+}
+
+test('blocks by type and deny pattern; allow patterns and the main document win', async () => {
+  const page = fakePage();
+  const stats = new ResourceStats();
+  await applyResourceBlocking(page, RULES, stats);
+
+  assert.equal(page.intercepting, true);
+  assert.equal(page.request('https://cdn.example/a.png', 'image'), 'aborted');
+  assert.equal(page.request('https://www.google-analytics.com/collect', 'xhr'), 'aborted');
+  assert.equal(page.request('https://gstatic.com/keep/logo.png', 'image'), 'continued');
+  assert.equal(page.request('https://maps.example/search', 'document', { navigation: true }), 'continued');
+  assert.equal(page.request('https://maps.example/app.js', 'script'), 'continued');
+
+  assert.equal(stats.blockedRequests, 2);
+  assert.equal(stats.allowedRequests, 3);
+  assert.deepEqual(stats.blockedByType, { image: 1, xhr: 1 });
+  assert.equal(stats.estimatedBlockedBytes, 45 * 1024);
+});
+
+test('no rules or a disabled rule set leaves requests alone', async () => {
+  for (const config of [null, { ...RULES, enabled: false }]) {
+    const page = fakePage();
+    await applyResourceBlocking(page, config, null);
+    assert.equal(page.intercepting, undefined);
+  }
+});
+
+test('session stats roll up into the parent', () => {
+  const run = new ResourceStats();
+  const first = new ResourceStats(run);
+  const second = new ResourceStats(run);
+  first.recordBlocked('image');
+  first.recordTransferred(1000);
+  second.recordAllowed();
+  second.recordPageLoaded();
+  second.recordTransferred(500);
+
+  assert.deepEqual(run.toJSON(), {
+    pagesLoaded: 1,
+    allowedRequests: 1,
+    blockedRequests: 1,
+    blockedByType: { image: 1 },
+    estimatedBlockedBytes: 40 * 1024,
+    transferredBytes: 1500
+  });
+  assert.equal(first.transferredBytes, 1000);
+});
@@ -0,0 +1,180 @@
+const EventEmitter = require('events');
+const Run = require('../models/Run');
+
+const TERMINAL_STATUSES = ['succeeded', 'failed'];
+const STATUS_PROJECTION = {
+  runId: 1,
+  status: 1,
+  resultCount: 1,
+  progress: 1,
+  startedAt: 1,
+  finishedAt: 1,
+  duration: 1,
+  error: 1,
+  version: 1
+};
+
+/**
+ * Cheap identity of a run's observable state
+ */
+function stateKey(run) {
+  return [
+    run.version,
+    run.status,
+    run.resultCount,
+    run.progress?.collected,
+    run.progress?.enriched,
+    run.progress?.failed
+  ].join('|');
+}
+
+// Run status notifications for server-push clients.
+// Every watched run has one shared channel, however many SSE streams and
+// long-polls follow it: one status query fans out to all of its
+// subscribers. Workers in this process publish changes immediately, so the
+// slow poll (which covers workers on other nodes) is skipped while the run
+// executes here and once it has finished.
+class RunEvents extends EventEmitter {
+  constructor() {
+    super();
+    this.setMaxListeners(0);
+    this.pollMs = parseInt(process.env.RUN_EVENTS_POLL_MS) || 2000;
+    this.channels = new Map(); // runId -> channel
+    this.localRuns = new Set(); // runIds executing in this process
+  }
+
+  isTerminal(status) {
+    return TERMINAL_STATUSES.includes(status);
+  }
+
+  /**
+   * Signal that a run changed (status, counters or progress)
+   */
+  publish(runId) {
+    this.emit(runId);
+  }
+
+  /**
+   * Mark a run as executing in this process (its changes are published locally)
+   */
+  markLocal(runId) {
+    this.localRuns.add(runId);
+  }
+
+  unmarkLocal(runId) {
+    this.localRuns.delete(runId);
+  }
+
+  async snapshot(runId, userId) {
+    return Run.findOne({ runId, userId }, STATUS_PROJECTION).lean();
+  }
+
+  channel(runId) {
+    let channel = this.channels.get(runId);
+    if (!channel) {
+      channel = {
+        runId,
+        subscribers: new Set(),
+        lastRun: null,
+        checking: false,
+        pending: false,
+        closed: false
+      };
+      channel.check = () => this.check(channel);
+      channel.timer = setInterval(() => this.poll(channel), this.pollMs);
+      this.on(runId, channel.check);
+      this.channels.set(runId, channel);
+    }
+    return channel;
+  }
+
+  closeChannel(channel) {
+    channel.closed = true;
+    clearInterval(channel.timer);
+    this.removeListener(channel.runId, channel.check);
+    this.channels.delete(channel.runId);
+  }
+
+  poll(channel) {
+    if (this.localRuns.has(channel.runId)) return;
+    if (channel.lastRun && this.isTerminal(channel.lastRun.status)) return;
+    channel.check();
+  }
+
+  /**
+   * Load the run once and deliver it to every subscriber; calls made while
+   * a load is in flight coalesce into one more load
+   */
+  async check(channel) {
+    if (channel.closed) return;
+    if (channel.checking) {
+      channel.pending = true;
+      return;
+    }
+    channel.checking = true;
+    try {
+      do {
+        channel.pending = false;
+        const run = await Run.findOne({ runId: channel.runId }, { ...STATUS_PROJECTION, userId: 1 }).lean();
+        if (channel.closed || !run) break;
+        channel.lastRun = run;
+        channel.subscribers.forEach(subscriber => this.deliver(subscriber, run));
+      } while (channel.pending && !channel.closed);
+    } catch (err) {
+      console.error(`Run watch error for ${channel.runId}:`, err.message);
+    } finally {
+      channel.checking = false;
+    }
+  }
+
+  deliver(subscriber, run) {
+    // Channels are shared between users; only the owner sees the run
+    if (String(run.userId) !== String(subscriber.userId)) return;
+    const key = stateKey(run);
+    if (key === subscriber.lastKey) return;
+    subscriber.lastKey = key;
+    const { userId, ...status } = run;
+    subscriber.onChange(status);
+  }
+
+  /**
+   * Call onChange(run) with the initial state and on every change until
+   * the returned stop function is called
+   */
+  watch(runId, userId, onChange) {
+    const channel = this.channel(runId);
+    const subscriber = { userId, onChange, lastKey: null };
+    channel.subscribers.add(subscriber);
+    // Fresh initial state for the new subscriber (coalesced with a load in flight)
+    channel.check();
+
+    return () => {
+      if (!channel.subscribers.delete(subscriber)) return;
+      if (channel.subscribers.size === 0) this.closeChannel(channel);
+    };
+  }
+
+  /**
+   * Resolve once the run reaches a terminal status or the timeout elapses
+   */
+  waitForFinish(runId, userId, timeoutMs) {
+    return new Promise(resolve => {
+      let stop = null;
+      let done = false;
+      const finish = () => {
+        if (done) return;
+        done = true;
+        clearTimeout(timer);
+        if (stop) stop();
+        resolve();
+      };
+      const timer = setTimeout(finish, timeoutMs);
+      stop = this.watch(runId, userId, run => {
+        if (this.isTerminal(run.status)) finish();
+      });
+      if (done) stop();
+    });
+  }
+}
+
+module.exports = new RunEvents();
@@ -0,0 +1,155 @@
+const Run = require('../models/Run');
+const Actor = require('../models/Actor');
+const User = require('../models/User');
+const { getScraperFunction, getResourceBlocking } = require('../actors/registry');
+const datasetStore = require('./datasetStore');
+const DatasetSink = require('./datasetSink');
+const runEvents = require('./runEvents');
+const runMeter = require('./runMeter');
+const tracer = require('./tracer');
+const authCache = require('./authCache');
+const metrics = require('./metrics');
+
+const runsFinished = metrics.counter({
+  name: 'scrapi_runs_finished_total',
+  help: 'Runs finished on this worker by status',
+  labelNames: ['actor', 'status']
+});
+const runDuration = metrics.histogram({
+  name: 'scrapi_run_duration_seconds',
+  help: 'Wall time of finished runs in seconds',
+  labelNames: ['actor', 'status'],
+  buckets: [1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600]
+});
+
+/**
+ * Count a finished run in the worker metrics
+ */
+function recordFinished(run, status, stats) {
+  runsFinished.inc({ actor: run.actorId, status });
+  runDuration.observe({ actor: run.actorId, status }, stats.wallMs / 1000);
+}
+
+/**
+ * Add a finished run's metered stats to its user's usage totals
+ */
+async function recordUsage(run, stats, usage) {
+  try {
+    await User.updateOne({ _id: run.userId }, {
+      $inc: {
+        'usage.creditsUsed': usage,
+        'usage.computeUnits': stats.computeUnits,
+        'usage.cpuMs': stats.cpuMs,
+        'usage.runs': 1,
+        'usage.pagesLoaded': stats.pagesLoaded,
+        'usage.transferredBytes': stats.transferredBytes,
+        'usage.items': stats.items
+      },
+      $max: { 'usage.ramUsedMB': Math.round(stats.peakRssBytes / 1024 / 1024) }
+    });
+    await authCache.invalidateUser(run.userId);
+  } catch (error) {
+    console.error(`Usage rollup failed for run ${run.runId}:`, error.message);
+  }
+}
+
+/**
+ * Execute a claimed run and persist its outcome.
+ * All writes are guarded by the lease owner so a worker that lost its lease
+ * (e.g. it stalled and the run was re-claimed) cannot overwrite the new owner.
+ */
+async function executeRun(run, workerId) {
+  const startTime = Date.now();
+  const owned = { _id: run._id, 'lease.owner': workerId };
+  const meter = runMeter.start();
+  const trace = tracer.start();
+  let sink = null;
+  
+  try {
+    // Get scraper function from registry
+    const scraperFunc = getScraperFunction(run.actorId);
+    if (!scraperFunc) {
+      throw new Error(`No scraper implementation found for actor: ${run.actorId}`);
+    }
+    
+    // A re-claimed run starts over with an empty dataset
+    if (run.attempts > 1) await datasetStore.clearItems(run.runId);
+    
+    // Execute scraper - streaming scrapers push items through the sink as they go
+    sink = new DatasetSink(run, { workerId });
+    const results = await meter.run(() => tracer.run(trace, () =>
+      tracer.span('run.scraper', () => scraperFunc(run.input || {}, {
+        resourceBlocking: getResourceBlocking(run.actorId),
+        sink
+      }), { actorId: run.actorId })
+    ));
+    
+    // Items returned at the end (non-streaming scrapers) go through the same sink;
+    // only the summary stays on the run
+    const { meta, items } = datasetStore.splitOutput(results);
+    sink.push(items);
+    const resultCount = await sink.close();
+    const stats = meter.stop({ items: resultCount });
+    const usage = runMeter.cost(stats);
+    
+    const duration = Math.round((Date.now() - startTime) / 1000);
+    const { modifiedCount } = await Run.updateOne(owned, {
+      $set: {
+        status: 'succeeded',
+        outputMeta: meta,
+        resultCount,
+        duration: `${duration}s`,
+        finishedAt: new Date(),
+        usage,
+        stats,
+        trace: trace.toJSON(),
+        'lease.expiresAt': null
+      },
+      $inc: { version: 1 }
+    });
+    if (modifiedCount === 0) {
+      console.warn(`⚠️  Run ${run.runId} lease lost, leaving it to the new owner`);
+      return;
+    }
+    runEvents.publish(run.runId);
+    recordFinished(run, 'succeeded', stats);
+    await recordUsage(run, stats, usage);
+    
+    // Update actor stats
+    await Actor.updateOne(
+      { actorId: run.actorId },
+      { $inc: { 'stats.runs': 1 } }
+    );
+    
+  } catch (error) {
+    console.error('Scraper execution error:', error);
+    // Keep whatever was produced before the failure
+    const resultCount = sink ? await sink.close().catch(() => 0) : 0;
+    // Failed runs used resources too and are charged the same way
+    const stats = meter.stop({ items: resultCount });
+    const usage = runMeter.cost(stats);
+    const duration = Math.round((Date.now() - startTime) / 1000);
+    const { modifiedCount } = await Run.updateOne(owned, {
+      $set: {
+        status: 'failed',
+        error: error.message,
+        finishedAt: new Date(),
+        duration: `${duration}s`,
+        usage,
+        stats,
+        trace: trace.toJSON(),
+        'lease.expiresAt': null
+      },
+      $inc: { version: 1 }
+    });
+    if (modifiedCount === 0) {
+      console.warn(`⚠️  Run ${run.runId} lease lost, leaving it to the new owner`);
+      return;
+    }
+    runEvents.publish(run.runId);
+    recordFinished(run, 'failed', stats);
+    await recordUsage(run, stats, usage);
+  }
+}
+
+module.exports = { executeRun };
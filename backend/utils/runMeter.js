@@ -0,0 +1,136 @@
+const { AsyncLocalStorage } = require('async_hooks');
+const { ResourceStats } = require('./resourceBlocker');
+const { processTreeUsage } = require('./processStats');
+
+const BYTES_PER_GB = 1024 * 1024 * 1024;
+const MS_PER_HOUR = 3600 * 1000;
+
+// Resource usage of one run. Browser sessions opened while the run executes
+// find the meter through async context and report pages and bytes into
+// `resources`; CPU and memory are attributed by the sampler below.
+class RunMeter {
+  constructor(metering) {
+    this.metering = metering;
+    this.resources = new ResourceStats();
+    this.startedAt = Date.now();
+    this.cpuMs = 0;
+    this.peakRssBytes = 0;
+    // Attributed Chromium RSS integrated over time (byte-milliseconds)
+    this.rssByteMs = 0;
+    this.stats = null;
+  }
+
+  /**
+   * Run fn with this meter as the current one
+   */
+  run(fn) {
+    return this.metering.storage.run(this, fn);
+  }
+
+  /**
+   * Stop metering and return the run's totals; later calls return the same totals
+   */
+  stop({ items = 0 } = {}) {
+    if (this.stats) return this.stats;
+    this.metering.finish(this);
+
+    const wallMs = Date.now() - this.startedAt;
+    const computeUnits = this.rssByteMs / BYTES_PER_GB / MS_PER_HOUR;
+    this.stats = {
+      wallMs,
+      cpuMs: Math.round(this.cpuMs),
+      peakRssBytes: this.peakRssBytes,
+      avgRssBytes: wallMs > 0 ? Math.round(this.rssByteMs / wallMs) : 0,
+      pagesLoaded: this.resources.pagesLoaded,
+      requests: this.resources.allowedRequests,
+      blockedRequests: this.resources.blockedRequests,
+      transferredBytes: this.resources.transferredBytes,
+      items,
+      computeUnits: parseFloat(computeUnits.toFixed(6))
+    };
+    return this.stats;
+  }
+}
+
+// Per-run resource metering.
+// Browsers are pooled and a worker executes several runs at once, so CPU
+// time (worker process + Chromium tree) and Chromium RSS are sampled for the
+// whole process and split evenly between the runs active in each interval.
+// A compute unit is 1 GB of attributed RSS held for one hour.
+class Metering {
+  constructor() {
+    this.sampleMs = parseInt(process.env.METER_SAMPLE_MS) || 1000;
+    this.usdPerComputeUnit = parseFloat(process.env.USAGE_USD_PER_COMPUTE_UNIT) || 0.4;
+    this.storage = new AsyncLocalStorage();
+    this.active = new Set();
+    this.getPids = () => [];
+    this.timer = null;
+    this.last = null;
+  }
+
+  /**
+   * Register where browser pids come from (set by the browser manager, so
+   * metering does not load Puppeteer)
+   */
+  setPidSource(getPids) {
+    this.getPids = getPids;
+  }
+
+  /**
+   * Meter of the run executing in the current async context, or null
+   */
+  current() {
+    return this.storage.getStore() || null;
+  }
+
+  start() {
+    // Close the interval before this run joins so it is not charged for it
+    this.sample();
+    const meter = new RunMeter(this);
+    this.active.add(meter);
+    if (!this.timer) {
+      this.timer = setInterval(() => this.sample(), this.sampleMs);
+      this.timer.unref();
+    }
+    return meter;
+  }
+
+  finish(meter) {
+    this.sample();
+    this.active.delete(meter);
+    if (this.active.size === 0) {
+      clearInterval(this.timer);
+      this.timer = null;
+      this.last = null;
+    }
+  }
+
+  /**
+   * Price in USD of a run's stats
+   */
+  cost(stats) {
+    return parseFloat((stats.computeUnits * this.usdPerComputeUnit).toFixed(4));
+  }
+
+  sample() {
+    const now = Date.now();
+    const worker = process.cpuUsage();
+    const browsers = processTreeUsage(this.getPids());
+    const cpuMs = (worker.user + worker.system) / 1000 + browsers.cpuMs;
+
+    if (this.last && this.active.size > 0) {
+      const elapsedMs = now - this.last.at;
+      // A recycled browser takes its CPU time with it; never charge a negative delta
+      const cpuShare = Math.max(0, cpuMs - this.last.cpuMs) / this.active.size;
+      const rssShare = browsers.rssBytes / this.active.size;
+      for (const meter of this.active) {
+        meter.cpuMs += cpuShare;
+        meter.rssByteMs += rssShare * elapsedMs;
+        meter.peakRssBytes = Math.max(meter.peakRssBytes, Math.round(rssShare));
+      }
+    }
+    this.last = { at: now, cpuMs };
+  }
+}
+
+module.exports = new Metering();
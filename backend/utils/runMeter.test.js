@@ -0,0 +1,44 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const runMeter = require('./runMeter');
+const { ResourceStats } = require('./resourceBlocker');
+
+test('current() follows the meter through async context', async () => {
+  const meter = runMeter.start();
+  assert.equal(runMeter.current(), null);
+  await meter.run(async () => {
+    await new Promise(resolve => setImmediate(resolve));
+    assert.equal(runMeter.current(), meter);
+  });
+  meter.stop();
+  assert.equal(runMeter.active.size, 0);
+  assert.equal(runMeter.timer, null);
+});
+
+test('stop() reports session resources and is idempotent', () => {
+  const meter = runMeter.start();
+  const session = new ResourceStats(meter.resources);
+  session.recordPageLoaded();
+  session.recordAllowed();
+  session.recordBlocked('image');
+  session.recordTransferred(2048);
+
+  const stats = meter.stop({ items: 12 });
+  assert.equal(stats.pagesLoaded, 1);
+  assert.equal(stats.requests, 1);
+  assert.equal(stats.blockedRequests, 1);
+  assert.equal(stats.transferredBytes, 2048);
+  assert.equal(stats.items, 12);
+  assert.ok(stats.wallMs >= 0 && stats.cpuMs >= 0);
+  assert.equal(meter.stop({ items: 99 }), stats);
+});
+
+test('compute units and cost come from attributed RSS over time', () => {
+  const meter = runMeter.start();
+  // 2 GB of browser memory held for half an hour
+  meter.rssByteMs = 2 * 1024 ** 3 * 1800 * 1000;
+  const stats = meter.stop();
+
+  assert.equal(stats.computeUnits, 1);
+  assert.equal(runMeter.cost(stats), runMeter.usdPerComputeUnit);
+});
@@ -0,0 +1,237 @@
+const os = require('os');
+const { v4: uuidv4 } = require('uuid');
+const Run = require('../models/Run');
+const { executeRun } = require('./runExecutor');
+const runEvents = require('./runEvents');
+const metrics = require('./metrics');
+
+/**
+ * Parse per-actor limits, e.g. "google-maps=1,amazon=3"
+ */
+function parseActorLimits(value) {
+  const limits = {};
+  if (!value) return limits;
+  value.split(',').forEach(pair => {
+    const [actorId, limit] = pair.split('=').map(s => s.trim());
+    const parsed = parseInt(limit);
+    if (actorId && parsed > 0) limits[actorId] = parsed;
+  });
+  return limits;
+}
+
+// Mongo-backed run queue with a bounded worker pool.
+// Runs are inserted as 'queued'; workers claim them atomically with a lease
+// that is renewed while the run executes. A run whose lease expires (worker
+// crashed or was killed) becomes claimable again, up to maxAttempts.
+class RunQueue {
+  constructor() {
+    this.workerId = `${os.hostname()}-${process.pid}-${uuidv4().slice(0, 8)}`;
+    this.concurrency = parseInt(process.env.RUN_QUEUE_CONCURRENCY) || 2;
+    // Cluster-wide running runs per actor, e.g. "google-maps=1"
+    this.actorLimits = parseActorLimits(process.env.RUN_QUEUE_ACTOR_CONCURRENCY);
+    this.leaseMs = parseInt(process.env.RUN_QUEUE_LEASE_MS) || 60000;
+    this.pollMs = parseInt(process.env.RUN_QUEUE_POLL_MS) || 2000;
+    this.maxAttempts = parseInt(process.env.RUN_QUEUE_MAX_ATTEMPTS) || 3;
+
+    this.active = new Map(); // run _id -> { runId, actorId }
+    this.activeByActor = new Map(); // actorId -> count
+    this.started = false;
+    this.filling = false;
+    this.refill = false;
+    this.pollTimer = null;
+    this.heartbeatTimer = null;
+    this.registerMetrics();
+  }
+
+  registerMetrics() {
+    metrics.gauge({
+      name: 'scrapi_run_queue_depth',
+      help: 'Runs waiting in the queue (all workers)',
+      collect: async gauge => gauge.set({}, await this.depth())
+    });
+    metrics.gauge({
+      name: 'scrapi_runs_active',
+      help: 'Runs executing on this worker',
+      labelNames: ['actor'],
+      collect: gauge => {
+        gauge.reset();
+        for (const [actorId, count] of this.activeByActor) gauge.set({ actor: actorId }, count);
+      }
+    });
+    metrics.gauge({
+      name: 'scrapi_run_queue_concurrency',
+      help: 'Maximum concurrent runs on this worker',
+      collect: gauge => gauge.set({}, this.started ? this.concurrency : 0)
+    });
+    this.queueWait = metrics.histogram({
+      name: 'scrapi_run_queue_wait_seconds',
+      help: 'Time from enqueue to claim in seconds',
+      labelNames: ['actor'],
+      buckets: [0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600]
+    });
+  }
+
+  /**
+   * Create a queued run and wake the worker pool
+   */
+  async enqueue({ actor, userId, input, scheduleId = null }) {
+    const run = new Run({
+      runId: uuidv4(),
+      actorId: actor.actorId,
+      actorName: actor.name,
+      userId,
+      input,
+      scheduleId,
+      status: 'queued',
+      queuedAt: new Date()
+    });
+    await run.save();
+    this.notify();
+    return run;
+  }
+
+  start() {
+    if (this.started) return;
+    this.started = true;
+    this.pollTimer = setInterval(() => this.notify(), this.pollMs);
+    this.heartbeatTimer = setInterval(() => {
+      this.renewLeases().catch(err => console.error('Lease renewal error:', err.message));
+    }, Math.max(1000, Math.floor(this.leaseMs / 3)));
+    console.log(`⚙️  Run queue worker ${this.workerId} started (concurrency ${this.concurrency})`);
+    this.notify();
+  }
+
+  stop() {
+    this.started = false;
+    clearInterval(this.pollTimer);
+    clearInterval(this.heartbeatTimer);
+  }
+
+  /**
+   * Request a fill pass; coalesces with a pass already in progress
+   */
+  notify() {
+    if (!this.started) return;
+    if (this.filling) {
+      this.refill = true;
+      return;
+    }
+    this.fill().catch(err => console.error('Run queue error:', err.message));
+  }
+
+  async fill() {
+    this.filling = true;
+    try {
+      do {
+        this.refill = false;
+        while (this.active.size < this.concurrency) {
+          const run = await this.claim();
+          if (!run) break;
+          this.launch(run);
+        }
+      } while (this.refill && this.started);
+    } finally {
+      this.filling = false;
+    }
+  }
+
+  /**
+   * Actors with a concurrency limit that already use all of their slots
+   * across every worker: running runs with a live lease are counted in
+   * Mongo, so the limit holds for the whole cluster. Workers claiming at
+   * the same instant can still overshoot it briefly.
+   */
+  async saturatedActors(now) {
+    const limited = Object.keys(this.actorLimits);
+    if (limited.length === 0) return [];
+    const running = await Run.aggregate([
+      { $match: { status: 'running', 'lease.expiresAt': { $gte: now }, actorId: { $in: limited } } },
+      { $group: { _id: '$actorId', count: { $sum: 1 } } }
+    ]);
+    return running.filter(r => r.count >= this.actorLimits[r._id]).map(r => r._id);
+  }
+
+  async claim() {
+    const now = new Date();
+    const filter = {
+      $or: [
+        { status: 'queued' },
+        { status: 'running', 'lease.expiresAt': { $lt: now } }
+      ]
+    };
+    const saturated = await this.saturatedActors(now);
+    if (saturated.length > 0) filter.actorId = { $nin: saturated };
+
+    const run = await Run.findOneAndUpdate(
+      filter,
+      {
+        $set: {
+          status: 'running',
+          startedAt: now,
+          'lease.owner': this.workerId,
+          'lease.expiresAt': new Date(now.getTime() + this.leaseMs)
+        },
+        $inc: { attempts: 1, version: 1 }
+      },
+      { sort: { queuedAt: 1 }, new: true }
+    );
+    if (!run) return null;
+
+    if (run.attempts > this.maxAttempts) {
+      await Run.updateOne(
+        { _id: run._id, 'lease.owner': this.workerId },
+        {
+          $set: {
+            status: 'failed',
+            error: `Run abandoned after ${this.maxAttempts} attempts`,
+            finishedAt: new Date(),
+            'lease.expiresAt': null
+          },
+          $inc: { version: 1 }
+        }
+      );
+      return this.claim();
+    }
+    return run;
+  }
+
+  launch(run) {
+    const key = run._id.toString();
+    runEvents.publish(run.runId);
+    if (run.attempts === 1 && run.queuedAt) {
+      this.queueWait.observe({ actor: run.actorId }, (Date.now() - run.queuedAt.getTime()) / 1000);
+    }
+    this.active.set(key, { runId: run.runId, actorId: run.actorId });
+    runEvents.markLocal(run.runId);
+    this.activeByActor.set(run.actorId, (this.activeByActor.get(run.actorId) || 0) + 1);
+
+    executeRun(run, this.workerId)
+      .catch(err => console.error('Scraper error:', err))
+      .finally(() => {
+        this.active.delete(key);
+        runEvents.unmarkLocal(run.runId);
+        const remaining = this.activeByActor.get(run.actorId) - 1;
+        if (remaining > 0) this.activeByActor.set(run.actorId, remaining);
+        else this.activeByActor.delete(run.actorId);
+        this.notify();
+      });
+  }
+
+  async renewLeases() {
+    if (this.active.size === 0) return;
+    await Run.updateMany(
+      {
+        _id: { $in: [...this.active.keys()] },
+        status: 'running',
+        'lease.owner': this.workerId
+      },
+      { $set: { 'lease.expiresAt': new Date(Date.now() + this.leaseMs) } }
+    );
+  }
+
+  async depth() {
+    return Run.countDocuments({ status: 'queued' });
+  }
+}
+
+module.exports = new RunQueue();
@@ -0,0 +1,140 @@
+const Schedule = require('../models/Schedule');
+const Run = require('../models/Run');
+const Actor = require('../models/Actor');
+const runQueue = require('./runQueue');
+const { nextAfter } = require('./cron');
+
+const ACTIVE_STATUSES = ['queued', 'running'];
+const MAX_CATCH_UP_RUNS = 10;
+const DUE_BATCH_SIZE = 100;
+
+// Starts runs for due schedules.
+// Every API node may run the loop: a schedule is claimed by moving its
+// nextRunAt forward with a compare-and-set on the old value, so each fire
+// is handled by exactly one node. Runs go through the normal run queue;
+// SCHEDULER_MAX_ACTIVE_RUNS caps how many scheduled runs may be queued or
+// running at once, and due schedules beyond the cap wait for a later tick.
+class Scheduler {
+  constructor() {
+    this.tickMs = parseInt(process.env.SCHEDULER_TICK_MS) || 15000;
+    this.graceMs = parseInt(process.env.SCHEDULER_GRACE_MS) || 5 * 60 * 1000;
+    this.maxActiveRuns = parseInt(process.env.SCHEDULER_MAX_ACTIVE_RUNS) || 20;
+    this.timer = null;
+    this.ticking = false;
+  }
+
+  /**
+   * Cron time and jittered start time of the first fire after a date
+   */
+  planNext(schedule, after = new Date()) {
+    const nextFireAt = nextAfter(schedule.cron, after);
+    const jitterMs = Math.floor(Math.random() * (schedule.jitterSecs || 0) * 1000);
+    return { nextFireAt, nextRunAt: new Date(nextFireAt.getTime() + jitterMs) };
+  }
+
+  start() {
+    if (this.timer) return;
+    this.timer = setInterval(() => this.tick(), this.tickMs);
+    console.log(`🗓️  Scheduler started (tick ${this.tickMs}ms, max ${this.maxActiveRuns} active scheduled runs)`);
+    this.tick();
+  }
+
+  stop() {
+    clearInterval(this.timer);
+    this.timer = null;
+  }
+
+  async tick() {
+    if (this.ticking) return;
+    this.ticking = true;
+    try {
+      const now = new Date();
+      const due = await Schedule.find({ enabled: true, nextRunAt: { $lte: now } })
+        .sort({ nextRunAt: 1 })
+        .limit(DUE_BATCH_SIZE)
+        .lean();
+      if (due.length === 0) return;
+
+      const active = await Run.countDocuments({ scheduleId: { $ne: null }, status: { $in: ACTIVE_STATUSES } });
+      let capacity = this.maxActiveRuns - active;
+
+      for (const schedule of due) {
+        if (capacity <= 0) {
+          console.log(`⏳ Scheduled run cap (${this.maxActiveRuns}) reached, deferring due schedules`);
+          break;
+        }
+        try {
+          capacity -= await this.fire(schedule, now, capacity);
+        } catch (error) {
+          console.error(`❌ Schedule ${schedule.scheduleId} failed:`, error.message);
+          await Schedule.updateOne({ _id: schedule._id }, { $set: { lastError: error.message } });
+        }
+      }
+    } catch (error) {
+      console.error('Scheduler error:', error.message);
+    } finally {
+      this.ticking = false;
+    }
+  }
+
+  /**
+   * Claim one due schedule and start its runs; returns the number started
+   */
+  async fire(schedule, now, capacity) {
+    // Cron times that are due, including ones missed while no scheduler ran
+    const fires = [schedule.nextFireAt];
+    while (fires.length < MAX_CATCH_UP_RUNS) {
+      const next = nextAfter(schedule.cron, fires[fires.length - 1]);
+      if (next > now) break;
+      fires.push(next);
+    }
+
+    const late = now - schedule.nextRunAt > this.graceMs;
+    let wanted = 1;
+    if (schedule.catchUp === 'all') wanted = fires.length;
+    else if (schedule.catchUp === 'skip' && late) wanted = 0;
+
+    const running = await Run.countDocuments({ scheduleId: schedule.scheduleId, status: { $in: ACTIVE_STATUSES } });
+    const slots = Math.max(0, schedule.maxConcurrentRuns - running);
+    // Leave the schedule due; it is retried on every tick until a run finishes
+    if (wanted > 0 && slots === 0 && schedule.overlap === 'delay') return 0;
+
+    const toStart = Math.min(wanted, slots, capacity);
+    const claimed = await Schedule.findOneAndUpdate(
+      { _id: schedule._id, enabled: true, nextRunAt: schedule.nextRunAt },
+      {
+        $set: { ...this.planNext(schedule, now), updatedAt: now },
+        $inc: { skippedCount: wanted - toStart }
+      }
+    );
+    if (!claimed) return 0; // another node handled this fire
+
+    if (toStart === 0) {
+      const reason = wanted === 0 ? 'missed fire, catch-up is off' : `${running} runs still active`;
+      console.log(`⏭️  Schedule "${schedule.name}" skipped (${reason})`);
+      return 0;
+    }
+
+    const actor = await Actor.findOne({ actorId: schedule.actorId }, { actorId: 1, name: 1 });
+    if (!actor) throw new Error(`Actor not found: ${schedule.actorId}`);
+
+    let lastRunId = null;
+    for (let i = 0; i < toStart; i++) {
+      const run = await runQueue.enqueue({
+        actor,
+        userId: schedule.userId,
+        input: schedule.input || {},
+        scheduleId: schedule.scheduleId
+      });
+      lastRunId = run.runId;
+    }
+    await Schedule.updateOne(
+      { _id: schedule._id },
+      { $set: { lastRunAt: now, lastRunId, lastError: null }, $inc: { runCount: toStart } }
+    );
+    console.log(`🗓️  Schedule "${schedule.name}" started ${toStart} run(s)`);
+    return toStart;
+  }
+}
+
+module.exports = new Scheduler();
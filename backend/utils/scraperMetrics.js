@@ -0,0 +1,61 @@
+const metrics = require('./metrics');
+
+// Scraper stages take from well under a second (extraction) to minutes
+// (scrolling a long search feed)
+const STAGE_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300];
+
+const stageDuration = metrics.histogram({
+  name: 'scrapi_scraper_stage_duration_seconds',
+  help: 'Duration of scraper stages in seconds',
+  labelNames: ['scraper', 'stage'],
+  buckets: STAGE_BUCKETS
+});
+
+const stageErrors = metrics.counter({
+  name: 'scrapi_scraper_errors_total',
+  help: 'Scraper errors by stage and class (timeout, blocked, selector-miss, network, other)',
+  labelNames: ['scraper', 'stage', 'class']
+});
+
+/**
+ * Error class used as a metric label
+ */
+function errorClass(error) {
+  if (!error) return 'other';
+  if (error.blocked) return 'blocked';
+  const message = error.message || String(error);
+  if (error.name === 'TimeoutError' || /timeout|timed out/i.test(message)) return 'timeout';
+  if (/blocked|unusual traffic|captcha|not a robot/i.test(message)) return 'blocked';
+  if (/waiting for selector|failed to find element|no element found|no node found/i.test(message)) return 'selector-miss';
+  if (/net::ERR_|ECONNRESET|ECONNREFUSED|ENOTFOUND/i.test(message)) return 'network';
+  return 'other';
+}
+
+/**
+ * Count an error; pass an Error to classify it or a class name directly
+ */
+function recordError(scraper, stage, error) {
+  const errClass = typeof error === 'string' ? error : errorClass(error);
+  stageErrors.inc({ scraper, stage, class: errClass });
+}
+
+/**
+ * Time an async stage; errors are counted and rethrown
+ */
+async function timeStage(scraper, stage, fn) {
+  const end = stageDuration.startTimer({ scraper, stage });
+  try {
+    return await fn();
+  } catch (error) {
+    recordError(scraper, stage, error);
+    throw error;
+  } finally {
+    end();
+  }
+}
+
+module.exports = {
+  errorClass,
+  recordError,
+  timeStage
+};
@@ -0,0 +1,34 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const metrics = require('./metrics');
+const { errorClass, recordError, timeStage } = require('./scraperMetrics');
+
+test('errorClass groups scraper errors', () => {
+  const timeout = new Error('Navigation took too long');
+  timeout.name = 'TimeoutError';
+  const blocked = new Error('rate limited');
+  blocked.blocked = true;
+
+  assert.equal(errorClass(timeout), 'timeout');
+  assert.equal(errorClass(new Error('Navigation timeout of 30000 ms exceeded')), 'timeout');
+  assert.equal(errorClass(blocked), 'blocked');
+  assert.equal(errorClass(new Error('Our systems have detected unusual traffic')), 'blocked');
+  assert.equal(errorClass(new Error('Waiting for selector `h1` failed')), 'selector-miss');
+  assert.equal(errorClass(new Error('net::ERR_CONNECTION_RESET at https://example.com')), 'network');
+  assert.equal(errorClass(new Error('something else')), 'other');
+  assert.equal(errorClass(null), 'other');
+});
+
+test('timeStage times the stage and counts a failure by class', async () => {
+  await timeStage('test-scraper', 'search', async () => 'ok');
+  await assert.rejects(
+    timeStage('test-scraper', 'search', async () => { throw new Error('net::ERR_ABORTED'); }),
+    /ERR_ABORTED/
+  );
+  recordError('test-scraper', 'search', 'selector-miss');
+
+  const text = await metrics.expose();
+  assert.match(text, /scrapi_scraper_stage_duration_seconds_count\{scraper="test-scraper",stage="search"\} 2/);
+  assert.match(text, /scrapi_scraper_errors_total\{scraper="test-scraper",stage="search",class="network"\} 1/);
+  assert.match(text, /scrapi_scraper_errors_total\{scraper="test-scraper",stage="search",class="selector-miss"\} 1/);
+});
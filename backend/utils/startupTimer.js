@@ -0,0 +1,25 @@
+const path = require('path');
+const { performance } = require('perf_hooks');
+
+// Startup milestones in ms since the process started (node boot and module
+// loading included), reported by the health check.
+class StartupTimer {
+  constructor() {
+    this.marks = {};
+  }
+
+  mark(name) {
+    this.marks[name] = Math.round(performance.now());
+    console.log(`⏱️  ${name} after ${this.marks[name]}ms`);
+  }
+
+  report() {
+    return {
+      marks: { ...this.marks },
+      // Whether this process has loaded Puppeteer (API-only nodes should not)
+      puppeteerLoaded: Object.keys(require.cache).some(file => file.includes(`${path.sep}puppeteer`))
+    };
+  }
+}
+
+module.exports = new StartupTimer();
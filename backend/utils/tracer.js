@@ -0,0 +1,161 @@
+const { AsyncLocalStorage } = require('async_hooks');
+const { performance } = require('perf_hooks');
+
+// Spans beyond this are counted but not kept (a run holds its trace in one document)
+const DEFAULT_MAX_SPANS = parseInt(process.env.TRACE_MAX_SPANS) || 5000;
+
+// Span timeline of one run.
+// Spans are kept as compact tuples [nameIndex, lane, startUs, durationUs, args?]
+// with names interned, so a few thousand spans stay small enough to live on
+// the run. Lanes separate concurrent work (lane 0 is the run itself, each
+// parallel task borrows the lowest free lane), which keeps spans properly
+// nested per lane in a flame graph viewer.
+class RunTrace {
+  constructor({ maxSpans = DEFAULT_MAX_SPANS } = {}) {
+    this.startedAt = new Date();
+    this.origin = performance.now();
+    this.maxSpans = maxSpans;
+    this.names = [];
+    this.nameIndex = new Map();
+    this.spans = [];
+    this.dropped = 0;
+    this.busyLanes = new Set();
+  }
+
+  now() {
+    return Math.round((performance.now() - this.origin) * 1000);
+  }
+
+  intern(name) {
+    let index = this.nameIndex.get(name);
+    if (index === undefined) {
+      index = this.names.length;
+      this.names.push(name);
+      this.nameIndex.set(name, index);
+    }
+    return index;
+  }
+
+  record(name, lane, startUs, args) {
+    if (this.spans.length >= this.maxSpans) {
+      this.dropped++;
+      return;
+    }
+    const span = [this.intern(name), lane, startUs, this.now() - startUs];
+    if (args && Object.keys(args).length > 0) span.push(args);
+    this.spans.push(span);
+  }
+
+  acquireLane() {
+    let lane = 1;
+    while (this.busyLanes.has(lane)) lane++;
+    this.busyLanes.add(lane);
+    return lane;
+  }
+
+  releaseLane(lane) {
+    this.busyLanes.delete(lane);
+  }
+
+  toJSON() {
+    return {
+      startedAt: this.startedAt,
+      names: this.names,
+      spans: this.spans,
+      dropped: this.dropped
+    };
+  }
+}
+
+// Tracing entry points for scrapers. Every call is a plain pass-through
+// when no trace is active (benchmarks, scripts), so instrumented code runs
+// the same with or without a run around it.
+class Tracer {
+  constructor() {
+    this.storage = new AsyncLocalStorage();
+  }
+
+  /**
+   * New empty trace for a run
+   */
+  start(options) {
+    return new RunTrace(options);
+  }
+
+  /**
+   * Run fn with a trace as the current one
+   */
+  run(trace, fn) {
+    return this.storage.run({ trace, lane: 0 }, fn);
+  }
+
+  current() {
+    return this.storage.getStore() || null;
+  }
+
+  /**
+   * Time fn as a span in the current lane; a thrown error is recorded on the span
+   * args - small JSON-safe details shown in the viewer (url, counts)
+   */
+  async span(name, fn, args = null) {
+    const context = this.current();
+    if (!context) return fn();
+
+    const startUs = context.trace.now();
+    try {
+      return await fn();
+    } catch (error) {
+      args = { ...args, error: error.message };
+      throw error;
+    } finally {
+      context.trace.record(name, context.lane, startUs, args);
+    }
+  }
+
+  /**
+   * Run a task that executes in parallel with others on its own lane
+   */
+  async lane(fn) {
+    const context = this.current();
+    if (!context) return fn();
+
+    const lane = context.trace.acquireLane();
+    try {
+      return await this.storage.run({ trace: context.trace, lane }, fn);
+    } finally {
+      context.trace.releaseLane(lane);
+    }
+  }
+
+  /**
+   * Chrome trace event format (chrome://tracing, Perfetto, speedscope)
+   */
+  toChromeTrace(stored, meta = {}) {
+    const pid = 1;
+    const lanes = new Set([0]);
+    const traceEvents = (stored.spans || []).map(([nameIndex, lane, ts, dur, args]) => {
+      lanes.add(lane);
+      const name = stored.names[nameIndex];
+      const event = { name, cat: name.split('.')[0], ph: 'X', ts, dur, pid, tid: lane };
+      if (args) event.args = args;
+      return event;
+    });
+
+    const metadata = [{ name: 'process_name', ph: 'M', pid, tid: 0, args: { name: meta.actorName || 'run' } }];
+    Array.from(lanes).sort((a, b) => a - b).forEach(lane => {
+      metadata.push({ name: 'thread_name', ph: 'M', pid, tid: lane, args: { name: lane === 0 ? 'run' : `worker ${lane}` } });
+    });
+
+    return {
+      traceEvents: metadata.concat(traceEvents),
+      displayTimeUnit: 'ms',
+      otherData: {
+        ...meta,
+        startedAt: stored.startedAt,
+        droppedSpans: stored.dropped || 0
+      }
+    };
+  }
+}
+
+module.exports = new Tracer();
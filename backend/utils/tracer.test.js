@@ -0,0 +1,71 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const tracer = require('./tracer');
+
+const tick = () => new Promise(resolve => setImmediate(resolve));
+
+test('spans are plain pass-throughs without an active trace', async () => {
+  assert.equal(tracer.current(), null);
+  assert.equal(await tracer.span('noop', async () => 42), 42);
+  assert.equal(await tracer.lane(async () => 'done'), 'done');
+});
+
+test('records nested spans with interned names, lanes and errors', async () => {
+  const trace = tracer.start();
+  await tracer.run(trace, () => tracer.span('run.scraper', async () => {
+    await tracer.span('search.goto', tick, { url: 'https://example.com' });
+    await Promise.all([1, 2].map(() => tracer.lane(() => tracer.span('place', tick))));
+    await tracer.span('place', async () => { throw new Error('boom'); }).catch(() => {});
+  }));
+
+  const stored = trace.toJSON();
+  assert.deepEqual(stored.names, ['search.goto', 'place', 'run.scraper']);
+  assert.equal(stored.spans.length, 5);
+
+  const byName = stored.spans.map(([nameIndex, lane, , , args]) => [stored.names[nameIndex], lane, args]);
+  assert.deepEqual(byName[0], ['search.goto', 0, { url: 'https://example.com' }]);
+  assert.deepEqual(byName.slice(1, 3).map(s => s[1]).sort(), [1, 2]);
+  assert.deepEqual(byName[3], ['place', 0, { error: 'boom' }]);
+  assert.equal(byName[4][0], 'run.scraper');
+});
+
+test('spans beyond maxSpans are dropped and counted', async () => {
+  const trace = tracer.start({ maxSpans: 2 });
+  await tracer.run(trace, async () => {
+    for (let i = 0; i < 5; i++) await tracer.span('step', async () => {});
+  });
+  assert.equal(trace.toJSON().spans.length, 2);
+  assert.equal(trace.toJSON().dropped, 3);
+});
+
+test('toChromeTrace emits metadata and complete events', () => {
+  const stored = {
+    startedAt: new Date('2026-03-10T10:00:00Z'),
+    names: ['run.scraper', 'place.goto'],
+    spans: [[0, 0, 0, 5000], [1, 2, 100, 2000, { url: 'https://example.com' }]],
+    dropped: 1
+  };
+  const chrome = tracer.toChromeTrace(stored, { runId: 'r1', actorName: 'Google Maps Scraper' });
+
+  assert.equal(chrome.displayTimeUnit, 'ms');
+  assert.deepEqual(chrome.otherData, {
+    runId: 'r1',
+    actorName: 'Google Maps Scraper',
+    startedAt: stored.startedAt,
+    droppedSpans: 1
+  });
+  assert.deepEqual(chrome.traceEvents, [
+    { name: 'process_name', ph: 'M', pid: 1, tid: 0, args: { name: 'Google Maps Scraper' } },
+    { name: 'thread_name', ph: 'M', pid: 1, tid: 0, args: { name: 'run' } },
+    { name: 'thread_name', ph: 'M', pid: 1, tid: 2, args: { name: 'worker 2' } },
+    { name: 'run.scraper', cat: 'run', ph: 'X', ts: 0, dur: 5000, pid: 1, tid: 0 },
+    { name: 'place.goto', cat: 'place', ph: 'X', ts: 100, dur: 2000, pid: 1, tid: 2, args: { url: 'https://example.com' } }
+  ]);
+});
+
+test('toChromeTrace handles a trace without spans', () => {
+  const chrome = tracer.toChromeTrace({ names: [], spans: [] });
+  assert.equal(chrome.traceEvents.length, 2);
+  assert.equal(chrome.otherData.droppedSpans, 0);
+  assert.equal(chrome.traceEvents[0].args.name, 'run');
+});
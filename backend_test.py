@@ -4,21 +4,30 @@ Backend Testing Suite for Auto-Discovery Architecture and User-Specific Data
 Tests authentication, actor registry auto-sync, user-specific data, and access control
 """
 
-import requests
+import httpx
 import json
 import time
 import sys
 from datetime import datetime
 
+from scrapi_client import ScrapiClient, ScrapiError, ScrapiTimeoutError
+from scrapi_client import quality
+
 # Configuration
 BACKEND_URL = "https://app-bootstrap-4.preview.emergentagent.com/api"
 
+# Share of places that must pass a data-quality check
+QUALITY_PASS_RATE = 0.8
+
 class BackendTester:
     def __init__(self):
         self.base_url = BACKEND_URL
         self.auth_token = None
         self.user_data = None
         self.test_results = []
+        # One pooled client for the whole suite: keep-alive connections and
+        # retries on transient failures
+        self.client = ScrapiClient(BACKEND_URL, verify=False)
         
     def log_test(self, test_name, success, message, details=None):
         """Log test results"""
@@ -38,32 +47,14 @@ class BackendTester:
     def make_request(self, method, endpoint, data=None, headers=None):
         """Make HTTP request with error handling"""
         url = f"{self.base_url}{endpoint}"
-        
-        # Default headers
-        req_headers = {'Content-Type': 'application/json'}
-        if self.auth_token:
-            req_headers['Authorization'] = f'Bearer {self.auth_token}'
-        if headers:
-            req_headers.update(headers)
+        self.client.token = self.auth_token
         
         try:
             print(f"Making {method} request to {url}")
-            if method.upper() == 'GET':
-                response = requests.get(url, headers=req_headers, timeout=60, verify=False)
-            elif method.upper() == 'POST':
-                response = requests.post(url, json=data, headers=req_headers, timeout=60, verify=False)
-            elif method.upper() == 'PUT':
-                response = requests.put(url, json=data, headers=req_headers, timeout=60, verify=False)
-            elif method.upper() == 'PATCH':
-                response = requests.patch(url, json=data, headers=req_headers, timeout=60, verify=False)
-            elif method.upper() == 'DELETE':
-                response = requests.delete(url, headers=req_headers, timeout=60, verify=False)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-            
+            response = self.client.request(method.upper(), endpoint, json=data, headers=headers)
             print(f"Response status: {response.status_code}")
             return response
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Request error for {method} {url}: {e}")
             return None
     
@@ -450,184 +441,149 @@ class BackendTester:
         
         self.log_test(f"{name} - Create Run", True, f"Run created: {run_id}")
         
-        # Wait for run to complete (longer timeout for enhanced scraping with social media)
+        # The client long-polls the run status endpoint (waitForFinish) instead of sleeping between polls
         max_wait = 180  # 3 minutes timeout for enhanced scraping with social media extraction
-        wait_time = 0
+        started = time.monotonic()
         
-        while wait_time < max_wait:
-            time.sleep(5)  # Check every 5 seconds
-            wait_time += 5
-            
-            response = self.make_request('GET', f'/runs/{run_id}')
-            
-            if not response or response.status_code != 200:
-                self.log_test(f"{name} - Check Status", False, "Failed to get run status")
-                return False
-            
-            run_status = response.json()
-            status = run_status.get('status')
-            
-            print(f"   Status: {status} ({wait_time}s elapsed)")
-            
-            if status == 'succeeded':
-                # Check output
-                output = run_status.get('output', [])
-                
-                if not output or len(output) == 0:
-                    self.log_test(f"{name} - Output", False, "No output data returned")
-                    return False
-                
-                print(f"✅ Scraped {len(output)} places successfully")
-                
-                # Analyze first result for critical fixes validation
-                first_result = output[0] if isinstance(output, list) else output
-                
-                # Count total fields in result (including nested fields)
-                total_fields_in_result = self._count_all_fields(first_result)
-                print(f"\n📊 TOTAL FIELDS EXTRACTED: {total_fields_in_result}")
-                
-                # CRITICAL VALIDATION: Check if we're extracting from business detail pages
-                print(f"\n🔍 CRITICAL NAVIGATION VALIDATION:")
-                title = first_result.get('title', '')
-                generic_titles = ['hours', 'menu', 'about', 'reviews', 'photos', 'overview']
-                is_business_page = title and title.lower() not in generic_titles
-                navigation_status = "✅" if is_business_page else "❌"
-                print(f"   {navigation_status} Business Detail Page Navigation: Title='{title}'")
-                
-                # Log sample of extracted data with critical fields check
-                print(f"\n📊 CRITICAL FIELDS VALIDATION (Target: {target_critical_validity}%+):")
-                critical_success = 0
-                for field in critical_fields:
-                    value = first_result.get(field)
-                    
-                    # Special validation for location coordinates
-                    if field == 'location':
-                        is_valid = (isinstance(value, dict) and 
-                                  value.get('lat') is not None and 
-                                  value.get('lng') is not None)
-                        display_value = f"lat: {value.get('lat')}, lng: {value.get('lng')}" if is_valid else str(value)
-                    else:
-                        is_valid = value is not None and value != '' and value != []
-                        display_value = str(value)[:100] + ('...' if len(str(value)) > 100 else '')
-                    
-                    status = "✅" if is_valid else "❌"
-                    print(f"   {status} {field}: {display_value}")
-                    if is_valid:
-                        critical_success += 1
-                
-                critical_success_rate = (critical_success / len(critical_fields)) * 100
-                
-                # Check additionalInfo categories (target: 8+ vs previous 2)
-                additional_info = first_result.get('additionalInfo', {})
-                additional_info_categories = len(additional_info) if isinstance(additional_info, dict) else 0
-                print(f"\n📊 ADDITIONAL INFO CATEGORIES: {additional_info_categories} (PREVIOUS: 2)")
-                
-                if additional_info_categories > 0:
-                    print(f"   Categories found: {list(additional_info.keys())[:8]}{'...' if additional_info_categories > 8 else ''}")
-                
-                # Verify enhanced fields are present
-                present_fields = []
-                missing_fields = []
-                
-                for field in expected_fields:
-                    if field in first_result:
-                        present_fields.append(field)
-                    else:
-                        missing_fields.append(field)
-                
-                field_coverage = len(present_fields) / len(expected_fields) * 100
-                
-                print(f"\n📈 FIELD COVERAGE: {len(present_fields)}/{len(expected_fields)} ({field_coverage:.1f}%)")
-                
-                if missing_fields:
-                    print(f"Missing fields: {missing_fields[:10]}{'...' if len(missing_fields) > 10 else ''}")
-                
-                # Validate specific enhanced data requirements
-                validation_results = self._validate_enhanced_data_2025(first_result, total_fields_in_result, additional_info_categories)
-                
-                # SUCCESS CRITERIA EVALUATION (Based on review request expectations)
-                navigation_success = is_business_page  # Must navigate to business detail pages
-                critical_validity_success = critical_success_rate >= target_critical_validity  # 80%+ critical fields valid
-                field_count_maintained = total_fields_in_result >= (target_field_count - 5)  # Allow some variance
-                additional_info_maintained = additional_info_categories >= target_additional_info_categories
-                
-                # Log main success criteria
-                self.log_test(f"{name} - Navigation Fix", navigation_success, 
-                             f"Business detail page navigation: {'SUCCESS' if is_business_page else 'FAILED - extracting from search results'}")
-                
-                self.log_test(f"{name} - Critical Field Validity", critical_validity_success, 
-                             f"Critical fields validity: {critical_success_rate:.1f}% (target: {target_critical_validity}%+)")
-                
-                self.log_test(f"{name} - Field Count Maintained", field_count_maintained, 
-                             f"Field count: {total_fields_in_result} (target: {target_field_count}+)")
-                
-                self.log_test(f"{name} - Additional Info Maintained", additional_info_maintained, 
-                             f"Additional info categories: {additional_info_categories} (target: {target_additional_info_categories}+)")
-                
-                # Log detailed validation results
-                validation_results = self._validate_critical_fixes_2025(first_result, total_fields_in_result, additional_info_categories, is_business_page)
-                for validation in validation_results:
-                    self.log_test(f"{name} - {validation['aspect']}", validation['success'], validation['message'])
-                
-                # Overall success criteria for critical fixes
-                critical_fixes_success = (
-                    navigation_success and
-                    critical_validity_success and
-                    field_count_maintained and
-                    additional_info_maintained
-                )
-                
-                if critical_fixes_success:
-                    self.log_test(f"{name} - Overall Success", True, 
-                                 f"✅ CRITICAL FIXES SUCCESSFUL: Navigation working, {critical_success_rate:.1f}% critical fields valid, {total_fields_in_result} fields extracted")
-                else:
-                    issues = []
-                    if not navigation_success:
-                        issues.append("navigation to business pages")
-                    if not critical_validity_success:
-                        issues.append(f"critical field validity ({critical_success_rate:.1f}% < {target_critical_validity}%)")
-                    if not field_count_maintained:
-                        issues.append(f"field count ({total_fields_in_result} < {target_field_count})")
-                    if not additional_info_maintained:
-                        issues.append(f"additional info categories ({additional_info_categories} < {target_additional_info_categories})")
-                    
-                    self.log_test(f"{name} - Overall Success", False, 
-                                 f"❌ CRITICAL FIXES INCOMPLETE: Issues with {', '.join(issues)}")
-                
-                # Show complete sample data for one place
-                print(f"\n📋 COMPLETE SAMPLE DATA (Place 1):")
-                self._display_sample_place_data(first_result)
-                
-                return critical_fixes_success
-                
-            elif status == 'failed':
-                error_msg = run_status.get('error', 'Unknown error')
-                self.log_test(f"{name} - Execution", False, f"Enhanced scraper failed: {error_msg}")
-                return False
+        def report(run):
+            print(f"   Status: {run.status} ({int(time.monotonic() - started)}s elapsed, "
+                  f"{run.result_count} items so far)")
+        
+        try:
+            run = self.client.wait_for_run(run_id, timeout=max_wait, on_update=report)
+        except ScrapiTimeoutError:
+            self.log_test(f"{name} - Execution", False, f"Enhanced scraper timed out after {max_wait}s")
+            return False
+        except (ScrapiError, httpx.HTTPError) as e:
+            self.log_test(f"{name} - Check Status", False, f"Failed to get run status: {e}")
+            return False
+        
+        if not run.succeeded:
+            self.log_test(f"{name} - Execution", False, f"Enhanced scraper failed: {run.error or 'Unknown error'}")
+            return False
+        
+        # Finished - load the run once with its output
+        response = self.make_request('GET', f'/runs/{run_id}')
+        if not response or response.status_code != 200:
+            self.log_test(f"{name} - Check Status", False, "Failed to get run output")
+            return False
+        run_status = response.json()
+        
+        # Check output
+        output = run_status.get('output', [])
+        
+        if not output or len(output) == 0:
+            self.log_test(f"{name} - Output", False, "No output data returned")
+            return False
+        
+        print(f"✅ Scraped {len(output)} places successfully")
+        
+        # Score every place in one columnar pass (not just the first one)
+        first_result = output[0] if isinstance(output, list) else output
+        places = output if isinstance(output, list) else [output]
+        report_frame = quality.places_frame(places, run_id)
+        report = quality.quality_report(report_frame)
+        
+        total_fields_in_result = report['field_count']['first']
+        print(f"\n📊 TOTAL FIELDS EXTRACTED: {total_fields_in_result} "
+              f"(mean {report['field_count']['mean']}, min {report['field_count']['min']} across {report['places']} places)")
+        print(f"📊 QUALITY SCORE: mean {report['quality_score']['mean']}, p10 {report['quality_score']['p10']}, "
+              f"min {report['quality_score']['min']}")
+        
+        # CRITICAL VALIDATION: Check if we're extracting from business detail pages
+        print(f"\n🔍 CRITICAL NAVIGATION VALIDATION:")
+        title = first_result.get('title') or first_result.get('name') or ''
+        name_rate = report['checks']['name_valid']
+        is_business_page = name_rate >= QUALITY_PASS_RATE
+        navigation_status = "✅" if is_business_page else "❌"
+        print(f"   {navigation_status} Business Detail Page Navigation: {name_rate:.0%} real business names (first: '{title}')")
+        
+        # Critical fields: fill rate across all places
+        print(f"\n📊 CRITICAL FIELDS VALIDATION (Target: {target_critical_validity}%+):")
+        critical_rates = quality.fill_rates(report_frame, critical_fields)
+        # A location object only counts when it holds usable coordinates
+        if "location" in critical_rates.index:
+            critical_rates["location"] = report['checks']['coords_valid']
+        for field, rate in critical_rates.items():
+            status = "✅" if rate >= QUALITY_PASS_RATE else "❌"
+            print(f"   {status} {field}: {rate:.0%} filled")
+        
+        critical_success_rate = float(critical_rates.mean()) * 100
+        
+        # Check additionalInfo categories (target: 8+ vs previous 2)
+        additional_info_categories = report['additional_info_categories']['first']
+        print(f"\n📊 ADDITIONAL INFO CATEGORIES: {additional_info_categories} "
+              f"(mean {report['additional_info_categories']['mean']}, PREVIOUS: 2)")
+        
+        # Verify enhanced fields are present
+        expected_rates = quality.fill_rates(report_frame, expected_fields)
+        present_fields = [field for field, rate in expected_rates.items() if rate > 0]
+        missing_fields = [field for field, rate in expected_rates.items() if rate == 0]
+        
+        field_coverage = len(present_fields) / len(expected_fields) * 100
+        
+        print(f"\n📈 FIELD COVERAGE: {len(present_fields)}/{len(expected_fields)} ({field_coverage:.1f}%)")
+        
+        if missing_fields:
+            print(f"Missing fields: {missing_fields[:10]}{'...' if len(missing_fields) > 10 else ''}")
+        
+        # Validate specific enhanced data requirements
+        validation_results = self._validate_enhanced_data_2025(report)
+        
+        # SUCCESS CRITERIA EVALUATION (Based on review request expectations)
+        navigation_success = is_business_page  # Must navigate to business detail pages
+        critical_validity_success = critical_success_rate >= target_critical_validity  # 80%+ critical fields valid
+        field_count_maintained = total_fields_in_result >= (target_field_count - 5)  # Allow some variance
+        additional_info_maintained = additional_info_categories >= target_additional_info_categories
+        
+        # Log main success criteria
+        self.log_test(f"{name} - Navigation Fix", navigation_success, 
+                     f"Business detail page navigation: {'SUCCESS' if is_business_page else 'FAILED - extracting from search results'}")
+        
+        self.log_test(f"{name} - Critical Field Validity", critical_validity_success, 
+                     f"Critical fields validity: {critical_success_rate:.1f}% (target: {target_critical_validity}%+)")
+        
+        self.log_test(f"{name} - Field Count Maintained", field_count_maintained, 
+                     f"Field count: {total_fields_in_result} (target: {target_field_count}+)")
+        
+        self.log_test(f"{name} - Additional Info Maintained", additional_info_maintained, 
+                     f"Additional info categories: {additional_info_categories} (target: {target_additional_info_categories}+)")
+        
+        # Log detailed validation results
+        validation_results = self._validate_critical_fixes_2025(report)
+        for validation in validation_results:
+            self.log_test(f"{name} - {validation['aspect']}", validation['success'], validation['message'])
+        
+        # Overall success criteria for critical fixes
+        critical_fixes_success = (
+            navigation_success and
+            critical_validity_success and
+            field_count_maintained and
+            additional_info_maintained
+        )
+        
+        if critical_fixes_success:
+            self.log_test(f"{name} - Overall Success", True, 
+                         f"✅ CRITICAL FIXES SUCCESSFUL: Navigation working, {critical_success_rate:.1f}% critical fields valid, {total_fields_in_result} fields extracted")
+        else:
+            issues = []
+            if not navigation_success:
+                issues.append(f"navigation to business pages ({name_rate:.0%} real business names)")
+            if not critical_validity_success:
+                issues.append(f"critical field validity ({critical_success_rate:.1f}% < {target_critical_validity}%)")
+            if not field_count_maintained:
+                issues.append(f"field count ({total_fields_in_result} < {target_field_count})")
+            if not additional_info_maintained:
+                issues.append(f"additional info categories ({additional_info_categories} < {target_additional_info_categories})")
             
-            # Still running, continue waiting
-            if wait_time % 20 == 0:  # Log every 20 seconds
-                print(f"   🔄 Enhanced scraping in progress... ({wait_time}s elapsed)")
+            self.log_test(f"{name} - Overall Success", False, 
+                         f"❌ CRITICAL FIXES INCOMPLETE: Issues with {', '.join(issues)}")
         
-        # Timeout
-        self.log_test(f"{name} - Execution", False, f"Enhanced scraper timed out after {max_wait}s")
-        return False
-    
-    def _count_all_fields(self, data, prefix=""):
-        """Count all fields including nested objects and arrays"""
-        count = 0
-        if isinstance(data, dict):
-            for key, value in data.items():
-                count += 1  # Count the key itself
-                if isinstance(value, (dict, list)) and value:
-                    count += self._count_all_fields(value, f"{prefix}{key}.")
-        elif isinstance(data, list) and data:
-            for i, item in enumerate(data[:3]):  # Count first 3 items to avoid huge arrays
-                if isinstance(item, (dict, list)):
-                    count += self._count_all_fields(item, f"{prefix}[{i}].")
-                else:
-                    count += 1
-        return count
+        # Show complete sample data for one place
+        print(f"\n📋 COMPLETE SAMPLE DATA (Place 1):")
+        self._display_sample_place_data(first_result)
+        
+        return critical_fixes_success
     
     def _display_sample_place_data(self, place_data):
         """Display a formatted sample of place data"""
@@ -655,378 +611,98 @@ class BackendTester:
                     else:
                         print(f"     {field}: {value}")
     
-    def _validate_critical_fixes_2025(self, result, total_fields, additional_info_categories, is_business_page):
+    def _rate_validation(self, aspect, rate, label, threshold=QUALITY_PASS_RATE):
+        """One validation entry from a share of passing places"""
+        success = rate >= threshold
+        return {
+            'aspect': aspect,
+            'success': success,
+            'message': f"{'✅' if success else '❌'} {rate:.0%} of places {label} (target: {threshold:.0%}+)"
+        }
+    
+    def _validate_critical_fixes_2025(self, report):
         """Validate critical navigation and data extraction fixes for Enhanced Google Maps scraper"""
-        validations = []
-        
-        # Navigation validation - most critical fix
-        if is_business_page:
-            validations.append({
-                'aspect': 'Navigation to Business Pages',
-                'success': True,
-                'message': f"✅ Successfully navigated to business detail page (title: '{result.get('title', '')[:50]}...')"
-            })
-        else:
-            validations.append({
-                'aspect': 'Navigation to Business Pages',
-                'success': False,
-                'message': f"❌ Still extracting from search results (title: '{result.get('title', '')}')"
-            })
-        
-        # Title validation - should be business name, not generic
-        title = result.get('title', '')
-        generic_titles = ['hours', 'menu', 'about', 'reviews', 'photos', 'overview']
-        title_valid = title and title.lower() not in generic_titles and len(title) > 3
-        if title_valid:
-            validations.append({
-                'aspect': 'Business Name Extraction',
-                'success': True,
-                'message': f"✅ Valid business name extracted: '{title[:50]}...'"
-            })
-        else:
-            validations.append({
-                'aspect': 'Business Name Extraction',
-                'success': False,
-                'message': f"❌ Invalid/generic title: '{title}' (indicates wrong page extraction)"
-            })
-        
-        # Address validation - should be populated with real address
-        address = result.get('address', '')
-        address_valid = address and len(address) > 10 and (',' in address or any(word in address.lower() for word in ['st', 'ave', 'rd', 'blvd', 'dr']))
-        if address_valid:
-            validations.append({
-                'aspect': 'Address Extraction',
-                'success': True,
-                'message': f"✅ Real address extracted: '{address[:50]}...'"
-            })
-        else:
-            validations.append({
-                'aspect': 'Address Extraction',
-                'success': False,
-                'message': f"❌ No valid address extracted: '{address}'"
-            })
-        
-        # Phone validation - should be populated
-        phone = result.get('phone', '')
-        phone_valid = phone and len(phone) >= 10
-        if phone_valid:
-            validations.append({
-                'aspect': 'Phone Extraction',
-                'success': True,
-                'message': f"✅ Phone number extracted: '{phone}'"
-            })
-        else:
-            validations.append({
-                'aspect': 'Phone Extraction',
-                'success': False,
-                'message': f"❌ No phone number extracted"
-            })
-        
-        # Website validation - should be populated
-        website = result.get('website', '')
-        website_valid = website and website.startswith('http')
-        if website_valid:
-            validations.append({
-                'aspect': 'Website Extraction',
-                'success': True,
-                'message': f"✅ Website URL extracted: '{website[:50]}...'"
-            })
-        else:
-            validations.append({
-                'aspect': 'Website Extraction',
-                'success': False,
-                'message': f"❌ No website URL extracted"
-            })
-        
-        # Coordinates validation - critical fix for location data
-        location = result.get('location', {})
-        coords_valid = (isinstance(location, dict) and 
-                       location.get('lat') is not None and 
-                       location.get('lng') is not None and
-                       abs(float(location.get('lat', 0))) > 0 and
-                       abs(float(location.get('lng', 0))) > 0)
-        if coords_valid:
-            validations.append({
-                'aspect': 'Coordinates Extraction',
-                'success': True,
-                'message': f"✅ Coordinates extracted: {location.get('lat')}, {location.get('lng')}"
-            })
-        else:
-            validations.append({
-                'aspect': 'Coordinates Extraction',
-                'success': False,
-                'message': f"❌ No valid coordinates extracted: {location}"
-            })
-        
-        return validations
+        checks = report['checks']
+        return [
+            self._rate_validation('Navigation to Business Pages', checks['name_valid'], "come from business detail pages"),
+            self._rate_validation('Business Name Extraction', checks['name_valid'], "have a real business name"),
+            self._rate_validation('Address Extraction', checks['address_valid'], "have a real address"),
+            self._rate_validation('Phone Extraction', checks['phone_valid'], "have a phone number"),
+            self._rate_validation('Website Extraction', checks['website_valid'], "have a website URL"),
+            self._rate_validation('Coordinates Extraction', checks['coords_valid'], "have valid coordinates"),
+        ]
 
-    def _validate_enhanced_data_2025(self, result, total_fields, additional_info_categories):
+    def _validate_enhanced_data_2025(self, report):
         """Validate enhanced data quality for 2025 Google Maps Enhanced scraper with aria-label selectors"""
-        validations = []
+        checks = report['checks']
+        fill = report['fill_rates']
         
-        # Basic info validation
-        if result.get('title') and len(result.get('title', '')) > 0:
-            validations.append({
-                'aspect': 'Basic Info',
-                'success': True,
-                'message': f"Title extracted: '{result.get('title')[:50]}...'"
-            })
-        else:
-            validations.append({
-                'aspect': 'Basic Info',
-                'success': False,
-                'message': "No title extracted"
-            })
+        def group_fill(fields):
+            # Average number of the fields present per place
+            return sum(fill.get(field, 0) for field in fields)
         
-        # Enhanced address validation (with breakdown)
         address_components = ['address', 'street', 'city', 'state', 'postalCode', 'countryCode']
-        address_found = sum(1 for field in address_components if result.get(field))
-        if address_found >= 3:
-            validations.append({
-                'aspect': 'Enhanced Address',
-                'success': True,
-                'message': f"Address breakdown: {address_found}/{len(address_components)} components"
-            })
-        else:
-            validations.append({
-                'aspect': 'Enhanced Address',
-                'success': False,
-                'message': f"Incomplete address breakdown: {address_found}/{len(address_components)} components"
-            })
-        
-        # Enhanced contact info validation
         contact_fields = ['phone', 'phoneUnformatted', 'website']
-        contact_found = sum(1 for field in contact_fields if result.get(field))
-        if contact_found >= 2:
-            validations.append({
-                'aspect': 'Enhanced Contact',
-                'success': True,
-                'message': f"Contact info: {contact_found}/{len(contact_fields)} fields"
-            })
-        else:
-            validations.append({
-                'aspect': 'Enhanced Contact',
-                'success': False,
-                'message': f"Limited contact info: {contact_found}/{len(contact_fields)} fields"
-            })
-        
-        # Enhanced location coordinates validation
-        location = result.get('location', {})
-        if isinstance(location, dict) and 'lat' in location and 'lng' in location:
-            validations.append({
-                'aspect': 'Enhanced Coordinates',
-                'success': True,
-                'message': f"Coordinates: {location.get('lat')}, {location.get('lng')}"
-            })
-        else:
-            validations.append({
-                'aspect': 'Enhanced Coordinates',
-                'success': False,
-                'message': "No coordinates extracted (enhanced extraction failed)"
-            })
-        
-        # Enhanced ratings validation
         rating_fields = ['totalScore', 'reviewsCount', 'imagesCount']
-        rating_found = sum(1 for field in rating_fields if result.get(field) is not None)
-        if rating_found >= 2:
-            validations.append({
-                'aspect': 'Enhanced Ratings',
-                'success': True,
-                'message': f"Rating data: {rating_found}/{len(rating_fields)} fields"
-            })
-        else:
-            validations.append({
-                'aspect': 'Enhanced Ratings',
-                'success': False,
-                'message': f"Limited rating data: {rating_found}/{len(rating_fields)} fields"
-            })
+        id_fields = ['placeId', 'fid', 'cid', 'kgmid']
+        field_count = report['field_count']['mean']
+        info_categories = report['additional_info_categories']['mean']
+        previous_count = 32
+        improvement_pct = ((field_count - previous_count) / previous_count) * 100
         
-        # Enhanced additional info validation (multiple categories)
-        additional_info = result.get('additionalInfo', {})
-        if isinstance(additional_info, dict) and len(additional_info) >= 3:
-            categories = list(additional_info.keys())
-            validations.append({
-                'aspect': 'Enhanced Additional Info',
-                'success': True,
-                'message': f"Multiple categories: {len(categories)} sections ({categories[:3]}...)"
-            })
-        else:
-            validations.append({
+        validations = [
+            self._rate_validation('Basic Info', fill.get('title', 0), "have a title"),
+            {
+                'aspect': 'Enhanced Address',
+                'success': group_fill(address_components) >= 3,
+                'message': f"Address breakdown: {group_fill(address_components):.1f}/{len(address_components)} components per place"
+            },
+            {
+                'aspect': 'Enhanced Contact',
+                'success': group_fill(contact_fields) >= 2,
+                'message': f"Contact info: {group_fill(contact_fields):.1f}/{len(contact_fields)} fields per place"
+            },
+            self._rate_validation('Enhanced Coordinates', checks['coords_valid'], "have coordinates"),
+            {
+                'aspect': 'Enhanced Ratings',
+                'success': group_fill(rating_fields) >= 2,
+                'message': f"Rating data: {group_fill(rating_fields):.1f}/{len(rating_fields)} fields per place"
+            },
+            {
                 'aspect': 'Enhanced Additional Info',
-                'success': False,
-                'message': f"Limited additional info: {len(additional_info) if isinstance(additional_info, dict) else 0} categories"
-            })
-        
-        # Enhanced opening hours validation (array with breakdown)
-        opening_hours = result.get('openingHours', [])
-        if isinstance(opening_hours, list) and len(opening_hours) > 0:
-            # Check if hours have proper structure
-            has_structure = any(isinstance(h, dict) and 'day' in h and 'hours' in h for h in opening_hours)
-            validations.append({
-                'aspect': 'Enhanced Opening Hours',
-                'success': has_structure,
-                'message': f"Opening hours: {len(opening_hours)} entries {'with day/hours structure' if has_structure else '(basic format)'}"
-            })
-        else:
-            validations.append({
-                'aspect': 'Enhanced Opening Hours',
-                'success': False,
-                'message': "No opening hours extracted"
-            })
-        
-        # NEW FEATURE: Social Media Links validation
-        social_media = result.get('socialMedia', {})
-        if isinstance(social_media, dict):
-            social_links = [k for k, v in social_media.items() if v]
-            if len(social_links) > 0:
-                validations.append({
-                    'aspect': 'Social Media Links',
-                    'success': True,
-                    'message': f"Social media found: {social_links}"
-                })
-            else:
-                validations.append({
-                    'aspect': 'Social Media Links',
-                    'success': False,
-                    'message': "No social media links extracted from business website"
-                })
-        else:
-            validations.append({
-                'aspect': 'Social Media Links',
-                'success': False,
-                'message': "Social media object missing or invalid"
-            })
-        
-        # Enhanced IDs validation
-        id_fields = ['placeId', 'fid', 'cid', 'kgmid']
-        id_found = sum(1 for field in id_fields if result.get(field))
-        if id_found >= 2:
-            validations.append({
-                'aspect': 'Enhanced IDs',
-                'success': True,
-                'message': f"Place IDs: {id_found}/{len(id_fields)} types"
-            })
-        else:
-            validations.append({
+                'success': info_categories >= 3,
+                'message': f"Additional info: {info_categories} categories per place"
+            },
+            self._rate_validation('Enhanced Opening Hours', fill.get('openingHours', 0), "have opening hours"),
+            self._rate_validation('Social Media Links', checks['social_valid'], "have valid social media links"),
+            {
                 'aspect': 'Enhanced IDs',
-                'success': False,
-                'message': f"Limited place IDs: {id_found}/{len(id_fields)} types"
-            })
-        
-        # Field count validation (target: 45-55 fields)
-        if total_fields >= 45:
-            validations.append({
-                'aspect': 'Field Count Target',
-                'success': True,
-                'message': f"Excellent field count: {total_fields} fields (vs 36 in previous version)"
-            })
-        elif total_fields >= 40:
-            validations.append({
-                'aspect': 'Field Count Target',
-                'success': True,
-                'message': f"Good field count: {total_fields} fields (improvement over 36)"
-            })
-        else:
-            validations.append({
+                'success': group_fill(id_fields) >= 2,
+                'message': f"Place IDs: {group_fill(id_fields):.1f}/{len(id_fields)} types per place"
+            },
+            {
                 'aspect': 'Field Count Target',
-                'success': False,
-                'message': f"Below target: {total_fields} fields (target: 45-55)"
-            })
-        
-        # Coordinates validation (enhanced with multiple extraction methods)
-        location = result.get('location', {})
-        if isinstance(location, dict) and location.get('lat') and location.get('lng'):
-            validations.append({
-                'aspect': 'Coordinates Extraction',
-                'success': True,
-                'message': f"✅ Coordinates: {location.get('lat')}, {location.get('lng')} (aria-label method working)"
-            })
-        else:
-            validations.append({
-                'aspect': 'Coordinates Extraction',
-                'success': False,
-                'message': "❌ No coordinates extracted (aria-label method failed)"
-            })
-        
-        # Enhanced additional info validation (target: 8+ categories vs previous 2)
-        if additional_info_categories >= 8:
-            validations.append({
-                'aspect': 'Additional Info Categories',
-                'success': True,
-                'message': f"✅ Excellent: {additional_info_categories} categories (vs 2 previous)"
-            })
-        elif additional_info_categories >= 5:
-            validations.append({
-                'aspect': 'Additional Info Categories',
-                'success': True,
-                'message': f"✅ Good improvement: {additional_info_categories} categories (vs 2 previous)"
-            })
-        else:
-            validations.append({
+                'success': field_count >= 40,
+                'message': f"{'Excellent' if field_count >= 45 else 'Good' if field_count >= 40 else 'Below target'}: "
+                           f"{field_count} fields per place (target: 45-55)"
+            },
+            {
                 'aspect': 'Additional Info Categories',
-                'success': False,
-                'message': f"❌ Limited: {additional_info_categories} categories (target: 8+, previous: 2)"
-            })
-        
-        # Social media extraction validation
-        social_media = result.get('socialMedia', {})
-        if isinstance(social_media, dict):
-            social_links = [k for k, v in social_media.items() if v]
-            if len(social_links) > 0:
-                validations.append({
-                    'aspect': 'Social Media Extraction',
-                    'success': True,
-                    'message': f"✅ Social media found: {social_links}"
-                })
-            else:
-                validations.append({
-                    'aspect': 'Social Media Extraction',
-                    'success': False,
-                    'message': "❌ No social media links extracted from business website"
-                })
-        else:
-            validations.append({
-                'aspect': 'Social Media Extraction',
-                'success': False,
-                'message': "❌ Social media object missing"
-            })
-        
-        # Opening hours validation (enhanced structure)
-        opening_hours = result.get('openingHours', [])
-        if isinstance(opening_hours, list) and len(opening_hours) > 0:
-            has_structure = any(isinstance(h, dict) and 'day' in h for h in opening_hours)
-            validations.append({
-                'aspect': 'Opening Hours',
-                'success': has_structure,
-                'message': f"✅ Hours: {len(opening_hours)} entries {'with day structure' if has_structure else '(basic format)'}"
-            })
-        else:
-            validations.append({
-                'aspect': 'Opening Hours',
-                'success': False,
-                'message': "❌ No opening hours extracted"
-            })
-        
-        # Overall field count improvement validation
-        previous_count = 32
-        improvement_pct = ((total_fields - previous_count) / previous_count) * 100
-        if total_fields >= 45:
-            validations.append({
-                'aspect': 'Field Count Improvement',
-                'success': True,
-                'message': f"✅ Excellent: {total_fields} fields ({improvement_pct:+.1f}% vs 32 previous)"
-            })
-        elif total_fields >= 40:
-            validations.append({
+                'success': info_categories >= 5,
+                'message': f"{'✅' if info_categories >= 5 else '❌'} {info_categories} categories per place (target: 8+, previous: 2)"
+            },
+            {
                 'aspect': 'Field Count Improvement',
-                'success': True,
-                'message': f"✅ Good: {total_fields} fields ({improvement_pct:+.1f}% vs 32 previous)"
-            })
-        else:
+                'success': field_count >= 40,
+                'message': f"{'✅' if field_count >= 40 else '❌'} {field_count} fields per place ({improvement_pct:+.1f}% vs 32 previous)"
+            },
+        ]
+        
+        if report['invalid_social_links']:
             validations.append({
-                'aspect': 'Field Count Improvement',
+                'aspect': 'Social Link Validity',
                 'success': False,
-                'message': f"❌ Limited improvement: {total_fields} fields ({improvement_pct:+.1f}% vs 32 previous)"
+                'message': f"❌ {report['invalid_social_links']} social links are not URLs on the platform's domain"
             })
         
         return validations
@@ -1039,8 +715,10 @@ class BackendTester:
             return "Basic website data extracted"
         
         elif actor_id == "google-maps":
-            if 'places' in result and len(result.get('places', [])) > 0:
-                return "Real Google Maps places found"
+            places = result.get('places', []) if isinstance(result, dict) else result
+            if places:
+                report = quality.quality_report(places)
+                return f"Real Google Maps places found (quality score {report['quality_score']['mean']})"
             return "Google Maps search attempted (limited by JS requirements)"
         
         elif actor_id == "amazon":
@@ -0,0 +1,3 @@
+"""
+Load and throughput benchmarks for the Scrapi API (run with python -m benchmarks.<name>)
+"""
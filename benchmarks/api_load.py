@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Load test for the /api/runs pipeline
+
+Ramps up concurrent virtual users. Each one registers (the same flow as
+BackendTester.test_1_authentication_setup), submits runs and follows them to
+completion over server-sent events (or by polling), then the whole session is
+summarised as JSON: submit latency percentiles, time to first result,
+runs/min, places/min and error rate.
+
+Start the backend with SCRAPER_STUB=true to measure the API, queue and
+dataset storage without Chromium:
+
+    SCRAPER_STUB=true SCRAPER_STUB_DELAY_MS=20 node server.js
+    python -m benchmarks.api_load --base-url http://localhost:8001/api --users 50 --runs-per-user 4
+
+Requires: httpx
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+
+from scrapi_client import AsyncScrapiClient, ScrapiError, ScrapiTimeoutError
+
+DEFAULT_BASE_URL = "http://localhost:8001/api"
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values):
+    """Latency summary in milliseconds"""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 1),
+        "p50": round(percentile(values, 50), 1),
+        "p95": round(percentile(values, 95), 1),
+        "p99": round(percentile(values, 99), 1),
+        "max": round(max(values), 1),
+    }
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.register_ms = []
+        self.submit_ms = []
+        self.ttfr_ms = []
+        self.run_ms = []
+        self.places = 0
+        self.runs_submitted = 0
+        self.runs_succeeded = 0
+        self.runs_failed = 0
+        self.errors = {}
+        self.operations = 0
+
+    def record_error(self, stage, error):
+        key = f"{stage}: {type(error).__name__}"
+        if isinstance(error, ScrapiError) and getattr(error, "status_code", None):
+            key = f"{stage}: HTTP {error.status_code}"
+        self.errors[key] = self.errors.get(key, 0) + 1
+
+    def run_input(self):
+        return {
+            "query": self.args.query,
+            "location": self.args.location,
+            "maxResults": self.args.max_results,
+        }
+
+    async def follow_sse(self, client, run_id, submitted_at):
+        first_result_at = None
+        last = None
+        async for event in client.stream_events(run_id, timeout=self.args.run_timeout):
+            last = event
+            if first_result_at is None and (event.get("resultCount") or 0) > 0:
+                first_result_at = time.monotonic()
+        if last is None:
+            raise ScrapiError(f"Event stream for {run_id} closed without a status")
+        return last.get("status"), last.get("resultCount") or 0, first_result_at
+
+    async def follow_poll(self, client, run_id, submitted_at):
+        first_result_at = None
+        deadline = submitted_at + self.args.run_timeout
+        run = None
+        while True:
+            # Unchanged runs answer 304 and the previous status is kept
+            run = await client.get_status(run_id, etag=run.etag if run else None) or run
+            if first_result_at is None and run.result_count > 0:
+                first_result_at = time.monotonic()
+            if run.is_finished:
+                return run.status, run.result_count, first_result_at
+            if time.monotonic() > deadline:
+                raise ScrapiTimeoutError(f"Run {run_id} did not finish within {self.args.run_timeout}s")
+            await asyncio.sleep(self.args.poll_interval)
+
+    async def user(self, user_index):
+        await asyncio.sleep(self.args.ramp_up * user_index / max(1, self.args.users))
+        suffix = uuid.uuid4().hex[:10]
+
+        # No client retries: every failed request counts as an error and no
+        # latency includes backoff or a second attempt
+        async with AsyncScrapiClient(self.args.base_url, verify=not self.args.insecure,
+                                     max_connections=self.args.runs_per_user + 2,
+                                     max_retries=0) as client:
+            self.operations += 1
+            started = time.monotonic()
+            try:
+                await client.register(f"load_{suffix}", f"load_{suffix}@example.com",
+                                      "testpassword123", "Load Test User")
+            except Exception as e:
+                self.record_error("register", e)
+                return
+            self.register_ms.append((time.monotonic() - started) * 1000)
+
+            follow = self.follow_sse if self.args.watch == "sse" else self.follow_poll
+            await asyncio.gather(*(
+                self.submit_and_follow(client, follow)
+                for _ in range(self.args.runs_per_user)
+            ))
+
+    async def submit_and_follow(self, client, follow):
+        self.operations += 1
+        submitted_at = time.monotonic()
+        try:
+            run = await client.create_run(self.args.actor, self.run_input())
+        except Exception as e:
+            self.record_error("submit", e)
+            return
+        self.submit_ms.append((time.monotonic() - submitted_at) * 1000)
+        self.runs_submitted += 1
+
+        self.operations += 1
+        try:
+            status, result_count, first_result_at = await follow(client, run.run_id, submitted_at)
+        except Exception as e:
+            self.record_error("follow", e)
+            return
+
+        self.run_ms.append((time.monotonic() - submitted_at) * 1000)
+        if first_result_at is not None:
+            self.ttfr_ms.append((first_result_at - submitted_at) * 1000)
+        if status == "succeeded":
+            self.runs_succeeded += 1
+            self.places += result_count
+        else:
+            self.runs_failed += 1
+            self.errors[f"run: {status}"] = self.errors.get(f"run: {status}", 0) + 1
+
+    async def execute(self):
+        started = time.monotonic()
+        await asyncio.gather(*(self.user(i) for i in range(self.args.users)))
+        wall = time.monotonic() - started
+        failures = sum(self.errors.values())
+        minutes = wall / 60 if wall > 0 else 1
+
+        return {
+            "config": {
+                "baseUrl": self.args.base_url,
+                "actor": self.args.actor,
+                "users": self.args.users,
+                "runsPerUser": self.args.runs_per_user,
+                "rampUpSeconds": self.args.ramp_up,
+                "maxResults": self.args.max_results,
+                "watch": self.args.watch,
+            },
+            "wallSeconds": round(wall, 2),
+            "runs": {
+                "submitted": self.runs_submitted,
+                "succeeded": self.runs_succeeded,
+                "failed": self.runs_failed,
+            },
+            "registerLatencyMs": summarize(self.register_ms),
+            "submitLatencyMs": summarize(self.submit_ms),
+            "timeToFirstResultMs": summarize(self.ttfr_ms),
+            "runDurationMs": summarize(self.run_ms),
+            "throughput": {
+                "runsPerMin": round(self.runs_succeeded / minutes, 2),
+                "placesPerMin": round(self.places / minutes, 2),
+                "places": self.places,
+            },
+            "errorRate": round(failures / self.operations, 4) if self.operations else 0,
+            "errors": self.errors,
+        }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Scrapi runs pipeline")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="API base URL including /api")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--runs-per-user", type=int, default=1)
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="seconds to start all users")
+    parser.add_argument("--actor", default="google-maps")
+    parser.add_argument("--query", default="restaurant")
+    parser.add_argument("--location", default="New York")
+    parser.add_argument("--max-results", type=int, default=20)
+    parser.add_argument("--watch", choices=["sse", "poll"], default="sse",
+                        help="follow runs over server-sent events or by polling")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--run-timeout", type=float, default=600.0)
+    parser.add_argument("--insecure", action="store_true", help="skip TLS verification")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(LoadTest(args).execute())
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    return 0 if report["runs"]["succeeded"] > 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
-import requests
 import json
 import time
 
+from scrapi_client import ScrapiClient, ScrapiError, ScrapiTimeoutError
+
 # Configuration
 BACKEND_URL = "https://app-bootstrap-4.preview.emergentagent.com/api"
 
@@ -15,93 +16,81 @@ def register_and_test():
         "fullName": "Test User"
     }
     
-    response = requests.post(f"{BACKEND_URL}/auth/register", json=test_user, verify=False)
-    if response.status_code != 201:
-        print(f"Registration failed: {response.status_code}")
+    client = ScrapiClient(BACKEND_URL, verify=False)
+    try:
+        client.register(test_user["username"], test_user["email"], test_user["password"], test_user["fullName"])
+    except ScrapiError as e:
+        print(f"Registration failed: {e}")
         return
     
-    data = response.json()
-    auth_token = data['token']
-    
     # Create Google Maps run
-    run_data = {
-        "actorId": "google-maps",
-        "input": {
+    try:
+        run = client.create_run("google-maps", {
             "query": "restaurant",
             "location": "New York", 
             "maxResults": 3
-        }
-    }
-    
-    headers = {'Authorization': f'Bearer {auth_token}'}
-    response = requests.post(f"{BACKEND_URL}/runs", json=run_data, headers=headers, verify=False)
-    
-    if response.status_code != 201:
-        print(f"Run creation failed: {response.status_code}")
+        })
+    except ScrapiError as e:
+        print(f"Run creation failed: {e}")
         return
     
-    run_info = response.json()
-    run_id = run_info['runId']
+    run_id = run.run_id
     print(f"Created run: {run_id}")
     
-    # Wait for completion
+    # Wait for completion - the client long-polls the server, which holds
+    # each request until the run finishes, so there is no client-side sleep
     max_wait = 120
-    wait_time = 0
+    started = time.monotonic()
     
-    while wait_time < max_wait:
-        time.sleep(3)
-        wait_time += 3
-        
-        response = requests.get(f"{BACKEND_URL}/runs/{run_id}", headers=headers, verify=False)
-        if response.status_code != 200:
-            print(f"Failed to get run status: {response.status_code}")
-            return
+    def report(run):
+        print(f"Waiting... ({int(time.monotonic() - started)}s, status: {run.status})")
+    
+    try:
+        run = client.wait_for_run(run_id, timeout=max_wait, on_update=report)
+    except ScrapiTimeoutError:
+        print("Timeout waiting for run completion")
+        return False
+    except ScrapiError as e:
+        print(f"Failed to get run status: {e}")
+        return
+    
+    if not run.succeeded:
+        print(f"Run failed: {run.error or 'Unknown error'}")
+        return False
+    
+    # Finished - fetch the run once more with its output
+    run_status = client.get_run(run_id).raw
+
+    output = run_status.get('output', [])
+    if output:
+        print(f"\n=== COMPREHENSIVE DATA EXTRACTED ({len(output)} places) ===")
+        first_place = output[0]
         
-        run_status = response.json()
-        status = run_status.get('status')
+        print(f"\n📍 PLACE 1: {first_place.get('title', 'Unknown')}")
+        print(f"Category: {first_place.get('categoryName', 'N/A')}")
+        print(f"Address: {first_place.get('address', 'N/A')}")
+        print(f"Phone: {first_place.get('phone', 'N/A')}")
+        print(f"Website: {first_place.get('website', 'N/A')}")
+        print(f"Rating: {first_place.get('totalScore', 'N/A')} ({first_place.get('reviewsCount', 0)} reviews)")
         
-        if status == 'succeeded':
-            output = run_status.get('output', [])
-            if output:
-                print(f"\n=== COMPREHENSIVE DATA EXTRACTED ({len(output)} places) ===")
-                first_place = output[0]
-                
-                print(f"\n📍 PLACE 1: {first_place.get('title', 'Unknown')}")
-                print(f"Category: {first_place.get('categoryName', 'N/A')}")
-                print(f"Address: {first_place.get('address', 'N/A')}")
-                print(f"Phone: {first_place.get('phone', 'N/A')}")
-                print(f"Website: {first_place.get('website', 'N/A')}")
-                print(f"Rating: {first_place.get('totalScore', 'N/A')} ({first_place.get('reviewsCount', 0)} reviews)")
-                
-                print(f"\n=== ALL EXTRACTED FIELDS ({len(first_place)} total) ===")
-                for i, key in enumerate(sorted(first_place.keys()), 1):
-                    value = first_place[key]
-                    if isinstance(value, (dict, list)) and len(str(value)) > 100:
-                        print(f"{i:2d}. {key}: {type(value).__name__} ({len(value) if hasattr(value, '__len__') else 'complex'})")
-                    else:
-                        print(f"{i:2d}. {key}: {value}")
-                
-                # Check for 50+ fields requirement
-                if len(first_place) >= 50:
-                    print(f"\n✅ REQUIREMENT MET: {len(first_place)} fields extracted (50+ required)")
-                else:
-                    print(f"\n⚠️  REQUIREMENT NOT MET: {len(first_place)} fields extracted (50+ required)")
-                
-                return True
+        print(f"\n=== ALL EXTRACTED FIELDS ({len(first_place)} total) ===")
+        for i, key in enumerate(sorted(first_place.keys()), 1):
+            value = first_place[key]
+            if isinstance(value, (dict, list)) and len(str(value)) > 100:
+                print(f"{i:2d}. {key}: {type(value).__name__} ({len(value) if hasattr(value, '__len__') else 'complex'})")
             else:
-                print("No output data")
-                return False
-                
-        elif status == 'failed':
-            error_msg = run_status.get('error', 'Unknown error')
-            print(f"Run failed: {error_msg}")
-            return False
+                print(f"{i:2d}. {key}: {value}")
         
-        if wait_time % 15 == 0:
-            print(f"Waiting... ({wait_time}s, status: {status})")
-    
-    print("Timeout waiting for run completion")
-    return False
+        # Check for 50+ fields requirement
+        if len(first_place) >= 50:
+            print(f"\n✅ REQUIREMENT MET: {len(first_place)} fields extracted (50+ required)")
+        else:
+            print(f"\n⚠️  REQUIREMENT NOT MET: {len(first_place)} fields extracted (50+ required)")
+        
+        return True
+    else:
+        print("No output data")
+        return False
 
 if __name__ == "__main__":
     register_and_test()
\ No newline at end of file
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useParams, useNavigate, Link } from 'react-router-dom';
 import { Header } from '../components/Layout';
 import { Card, CardContent, CardHeader, CardTitle } from '../components/ui/card';
@@ -10,8 +10,9 @@ import { Tabs, TabsContent, TabsList, TabsTrigger } from '../components/ui/tabs'
 import { ScrollArea } from '../components/ui/scroll-area';
 import { ArrowLeft, Download, Share2, RefreshCw } from 'lucide-react';
 import { useToast } from '../hooks/use-toast';
-import api from '../services/api';
+import api, { streamRunEvents } from '../services/api';
 
+const formatMB = (bytes) => ((bytes || 0) / 1024 / 1024).toFixed(1);
 
 export function RunDetail() {
   const { runId } = useParams();
@@ -23,38 +24,84 @@ export function RunDetail() {
   const [currentPage, setCurrentPage] = useState(1);
   const [itemsPerPage, setItemsPerPage] = useState(20);
   const [goToPageInput, setGoToPageInput] = useState('1');
+  const [items, setItems] = useState([]);
+  const [totalItems, setTotalItems] = useState(0);
+  // ETag of the last status response; unchanged runs answer 304
+  const statusEtag = useRef(null);
   
   useEffect(() => {
     fetchRun();
+  }, [runId]);
+  
+  // Live status is pushed by the server; fall back to polling if the stream fails
+  useEffect(() => {
+    if (!autoRefresh) return;
+    
+    const controller = new AbortController();
+    let interval = null;
+    let finished = false;
     
-    // Auto-refresh if running
-    const interval = setInterval(() => {
-      if (autoRefresh) {
+    const applyStatus = (status) => {
+      if (finished) return;
+      setRun((prev) => (prev ? { ...prev, ...status } : prev));
+      if (status.status === 'succeeded' || status.status === 'failed') {
+        finished = true;
+        setAutoRefresh(false);
         fetchRun(true);
       }
-    }, 3000);
+    };
+    
+    // Polls the lightweight status endpoint; nothing is transferred until the run changes
+    const pollStatus = async () => {
+      try {
+        const response = await api.get(`/api/runs/${runId}/status`, {
+          headers: statusEtag.current ? { 'If-None-Match': statusEtag.current } : {},
+          validateStatus: (code) => code === 200 || code === 304,
+          signal: controller.signal
+        });
+        if (response.status === 304) return;
+        statusEtag.current = response.headers.etag || null;
+        applyStatus(response.data);
+      } catch (error) {
+        if (!controller.signal.aborted) console.error('Error polling run status:', error);
+      }
+    };
+    
+    const fallbackToPolling = () => {
+      if (controller.signal.aborted || finished) return;
+      interval = setInterval(pollStatus, 3000);
+    };
+    
+    streamRunEvents(runId, {
+      signal: controller.signal,
+      onStatus: applyStatus
+    }).then(fallbackToPolling, (error) => {
+      if (!controller.signal.aborted) {
+        console.error('Run events stream failed, polling instead:', error);
+      }
+      fallbackToPolling();
+    });
     
-    return () => clearInterval(interval);
+    return () => {
+      controller.abort();
+      if (interval) clearInterval(interval);
+    };
   }, [runId, autoRefresh]);
   
+  // Only the current page of items is fetched from the server
+  useEffect(() => {
+    if (run) fetchItems();
+  }, [runId, currentPage, itemsPerPage, run?.resultCount]);
+  
   const fetchRun = async (silent = false) => {
     try {
-      const response = await api.get(`/api/runs/${runId}`);
+      const response = await api.get(`/api/runs/${runId}?includeOutput=false`);
       const runData = response.data;
       
-      // Parse output if it's a string
-      if (typeof runData.output === 'string') {
-        try {
-          runData.output = JSON.parse(runData.output);
-        } catch (e) {
-          console.error('Failed to parse output:', e);
-        }
-      }
-      
       setRun(runData);
       
       // Stop auto-refresh if run is completed
-      if (runData.status !== 'running') {
+      if (runData.status !== 'running' && runData.status !== 'queued') {
         setAutoRefresh(false);
       }
       
@@ -72,10 +119,32 @@ export function RunDetail() {
     }
   };
   
-  const downloadResults = () => {
-    if (!run || !run.output) return;
+  const fetchItems = async () => {
+    try {
+      const offset = (currentPage - 1) * itemsPerPage;
+      const response = await api.get(`/api/runs/${runId}/items?offset=${offset}&limit=${itemsPerPage}`);
+      setItems(response.data.items);
+      setTotalItems(response.data.total);
+    } catch (error) {
+      console.error('Error fetching run items:', error);
+    }
+  };
+  
+  const fetchAllItems = async () => {
+    const pageSize = 1000;
+    const all = [];
+    for (let offset = 0; ; offset += pageSize) {
+      const response = await api.get(`/api/runs/${runId}/items?offset=${offset}&limit=${pageSize}`);
+      all.push(...response.data.items);
+      if (response.data.items.length < pageSize) break;
+    }
+    return all;
+  };
+  
+  const downloadResults = async () => {
+    if (!run || totalItems === 0) return;
     
-    const dataStr = JSON.stringify(run.output, null, 2);
+    const dataStr = JSON.stringify(await fetchAllItems(), null, 2);
     const dataBlob = new Blob([dataStr], { type: 'application/json' });
     const url = URL.createObjectURL(dataBlob);
     const link = document.createElement('a');
@@ -93,31 +162,19 @@ export function RunDetail() {
     const colors = {
       succeeded: 'bg-green-100 text-green-700 dark:bg-green-900/30 dark:text-green-400',
       failed: 'bg-red-100 text-red-700 dark:bg-red-900/30 dark:text-red-400',
-      running: 'bg-blue-100 text-blue-700 dark:bg-blue-900/30 dark:text-blue-400'
+      running: 'bg-blue-100 text-blue-700 dark:bg-blue-900/30 dark:text-blue-400',
+      queued: 'bg-yellow-100 text-yellow-700 dark:bg-yellow-900/30 dark:text-yellow-400'
     };
     return colors[status] || colors.running;
   };
 
-  // Extract results array from output if it exists
-  const getResultsData = () => {
-    if (!run?.output || run.output.length === 0) return [];
-    
-    // Check if output items have a 'results' array property
-    if (run.output[0]?.results && Array.isArray(run.output[0].results)) {
-      // Flatten all results from all output items
-      return run.output.flatMap(item => item.results || []);
-    }
-    
-    // Otherwise return output as-is
-    return run.output;
-  };
-  
-  const resultsData = getResultsData();
+  // Summary fields of the scraper output (e.g. search string, totals)
+  const outputMeta = run?.outputMeta?.[0] || null;
   
   // Pagination handlers
-  const totalPages = Math.ceil((resultsData?.length || 0) / itemsPerPage);
+  const totalPages = Math.ceil(totalItems / itemsPerPage);
   const startIndex = (currentPage - 1) * itemsPerPage;
-  const paginatedOutput = resultsData?.slice(startIndex, startIndex + itemsPerPage) || [];
+  const paginatedOutput = items;
 
   const handleGoToPage = () => {
     let pageNum = parseInt(goToPageInput);
@@ -202,12 +259,17 @@ export function RunDetail() {
                     {run.status === 'succeeded' && '✓ '}
                     {run.status.charAt(0).toUpperCase() + run.status.slice(1)}
                   </Badge>
-                  {run.status === 'running' && (
+                  {(run.status === 'running' || run.status === 'queued') && (
                     <span className="text-sm text-muted-foreground flex items-center gap-2">
                       <RefreshCw className="h-3 w-3 animate-spin" />
                       Auto-refreshing...
                     </span>
                   )}
+                  {run.status === 'running' && run.progress && (
+                    <span className="text-sm text-muted-foreground">
+                      Collected {run.progress.collected || 0} • Enriched {run.progress.enriched || 0} • Failed {run.progress.failed || 0}
+                    </span>
+                  )}
                 </div>
                 
                 <Link to={`/actors/${run.actorId}`}>
@@ -217,7 +279,7 @@ export function RunDetail() {
                 <div className="grid grid-cols-4 gap-4 mt-4">
                   <div>
                     <p className="text-sm text-muted-foreground">Results</p>
-                    <p className="text-2xl font-bold text-blue-600 dark:text-blue-400">{resultsData?.length || run.resultCount || 0}</p>
+                    <p className="text-2xl font-bold text-blue-600 dark:text-blue-400">{totalItems || run.resultCount || 0}</p>
                   </div>
                   <div>
                     <p className="text-sm text-muted-foreground">Duration</p>
@@ -225,7 +287,7 @@ export function RunDetail() {
                   </div>
                   <div>
                     <p className="text-sm text-muted-foreground">Usage</p>
-                    <p className="text-2xl font-bold">${run.usage?.toFixed(2) || '0.00'}</p>
+                    <p className="text-2xl font-bold">${run.usage?.toFixed(4) || '0.0000'}</p>
                   </div>
                   <div>
                     <p className="text-sm text-muted-foreground">Run ID</p>
@@ -249,6 +311,31 @@ export function RunDetail() {
                     </div>
                   )}
                 </div>
+
+                {run.stats?.wallMs > 0 && (
+                  <div className="grid grid-cols-5 gap-4 mt-4 pt-4 border-t">
+                    <div>
+                      <p className="text-sm text-muted-foreground">CPU time</p>
+                      <p className="font-medium">{(run.stats.cpuMs / 1000).toFixed(1)}s</p>
+                    </div>
+                    <div>
+                      <p className="text-sm text-muted-foreground">Peak memory</p>
+                      <p className="font-medium">{formatMB(run.stats.peakRssBytes)} MB</p>
+                    </div>
+                    <div>
+                      <p className="text-sm text-muted-foreground">Pages loaded</p>
+                      <p className="font-medium">{run.stats.pagesLoaded}</p>
+                    </div>
+                    <div>
+                      <p className="text-sm text-muted-foreground">Transferred</p>
+                      <p className="font-medium">{formatMB(run.stats.transferredBytes)} MB</p>
+                    </div>
+                    <div>
+                      <p className="text-sm text-muted-foreground">Compute units</p>
+                      <p className="font-medium">{run.stats.computeUnits.toFixed(4)}</p>
+                    </div>
+                  </div>
+                )}
               </div>
             </div>
           </CardContent>
@@ -257,7 +344,7 @@ export function RunDetail() {
         {/* Tabs */}
         <Tabs defaultValue="output">
           <TabsList>
-            <TabsTrigger value="output">Output ({run.output?.length || 0})</TabsTrigger>
+            <TabsTrigger value="output">Output ({totalItems})</TabsTrigger>
             <TabsTrigger value="input">Input</TabsTrigger>
             <TabsTrigger value="log">Log</TabsTrigger>
             <TabsTrigger value="storage">Storage</TabsTrigger>
@@ -265,15 +352,15 @@ export function RunDetail() {
           
           <TabsContent value="output">
             {/* Search Metadata */}
-            {run.output && run.output.length > 0 && run.output[0]?.results && (
+            {outputMeta && (
               <Card className="mb-4">
                 <CardHeader>
                   <CardTitle className="text-base">Search Information</CardTitle>
                 </CardHeader>
                 <CardContent>
                   <div className="grid grid-cols-2 md:grid-cols-4 gap-4">
-                    {Object.entries(run.output[0]).map(([key, value]) => {
-                      if (key === 'results' || typeof value === 'object') return null;
+                    {Object.entries(outputMeta).map(([key, value]) => {
+                      if (typeof value === 'object') return null;
                       return (
                         <div key={key}>
                           <p className="text-sm text-muted-foreground mb-1">
@@ -299,8 +386,8 @@ export function RunDetail() {
             <Card>
               <CardHeader>
                 <div className="flex items-center justify-between">
-                  <CardTitle>Scraped Results ({resultsData?.length || 0} items)</CardTitle>
-                  {run.output && run.output.length > 0 && (
+                  <CardTitle>Scraped Results ({totalItems} items)</CardTitle>
+                  {totalItems > 0 && (
                     <div className="flex gap-2">
                       <Button variant="outline" size="sm" onClick={downloadResults}>
                         <Download className="h-4 w-4 mr-2" />
@@ -311,14 +398,14 @@ export function RunDetail() {
                 </div>
               </CardHeader>
               <CardContent className="p-0">
-                {resultsData && resultsData.length > 0 ? (
+                {items.length > 0 ? (
                   <>
                     <div className="overflow-x-auto">
                       <table className="w-full">
                         <thead className="border-b bg-muted/50 sticky top-0">
                           <tr className="text-sm text-muted-foreground">
                             <th className="text-left p-4 font-medium w-12 bg-muted/50">#</th>
-                            {Object.keys(resultsData[0]).map((key) => (
+                            {Object.keys(items[0]).map((key) => (
                               <th key={key} className="text-left p-4 font-medium min-w-[150px] bg-muted/50 whitespace-nowrap">
                                 {key
                                   .replace(/([A-Z])/g, ' $1')
@@ -378,7 +465,7 @@ export function RunDetail() {
                     </div>
                     
                     {/* Pagination */}
-                    {resultsData.length > 0 && (
+                    {totalItems > 0 && (
                       <div className="flex items-center justify-between p-4 border-t bg-muted/20">
                         <div className="flex items-center gap-2">
                           <span className="text-sm text-muted-foreground">Items per page:</span>
@@ -398,7 +485,7 @@ export function RunDetail() {
                             </SelectContent>
                           </Select>
                           <span className="text-sm text-muted-foreground ml-4">
-                            Showing {startIndex + 1} - {Math.min(startIndex + itemsPerPage, resultsData.length)} of {resultsData.length}
+                            Showing {startIndex + 1} - {Math.min(startIndex + itemsPerPage, totalItems)} of {totalItems}
                           </span>
                         </div>
                         
@@ -423,10 +510,10 @@ export function RunDetail() {
                   </>
                 ) : (
                   <div className="text-center py-12 text-muted-foreground">
-                    {run.status === 'running' ? (
+                    {run.status === 'running' || run.status === 'queued' ? (
                       <>
                         <RefreshCw className="h-12 w-12 mx-auto mb-4 animate-spin" />
-                        <p>Scraping in progress...</p>
+                        <p>{run.status === 'queued' ? 'Waiting for a free worker...' : 'Scraping in progress...'}</p>
                       </>
                     ) : (
                       <p>No output data available</p>
@@ -461,7 +548,7 @@ export function RunDetail() {
                     <p>[{new Date(run.startedAt).toLocaleTimeString()}] Run started</p>
                     <p>[{new Date(run.startedAt).toLocaleTimeString()}] Actor: {run.actorName}</p>
                     <p>[{new Date(run.startedAt).toLocaleTimeString()}] Input validated</p>
-                    {run.status !== 'running' && (
+                    {run.status !== 'running' && run.status !== 'queued' && (
                       <>
                         <p>[{new Date(run.finishedAt).toLocaleTimeString()}] Scraping completed</p>
                         <p>[{new Date(run.finishedAt).toLocaleTimeString()}] Results: {run.resultCount} items</p>
@@ -61,7 +61,8 @@ export function Runs() {
     const styles = {
       succeeded: 'bg-green-100 text-green-700 dark:bg-green-900/30 dark:text-green-400',
       failed: 'bg-red-100 text-red-700 dark:bg-red-900/30 dark:text-red-400',
-      running: 'bg-blue-100 text-blue-700 dark:bg-blue-900/30 dark:text-blue-400'
+      running: 'bg-blue-100 text-blue-700 dark:bg-blue-900/30 dark:text-blue-400',
+      queued: 'bg-yellow-100 text-yellow-700 dark:bg-yellow-900/30 dark:text-yellow-400'
     };
     
     return (
@@ -103,6 +104,7 @@ export function Runs() {
               <SelectItem value="succeeded">Succeeded</SelectItem>
               <SelectItem value="failed">Failed</SelectItem>
               <SelectItem value="running">Running</SelectItem>
+              <SelectItem value="queued">Queued</SelectItem>
             </SelectContent>
           </Select>
           
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
 import { Header } from '../components/Layout';
 import { Card, CardContent } from '../components/ui/card';
@@ -13,20 +13,41 @@ export function SavedTasks() {
   const navigate = useNavigate();
   const [scrapedData, setScrapedData] = useState([]);
   const [searchTerm, setSearchTerm] = useState('');
+  const [debouncedSearch, setDebouncedSearch] = useState('');
+  const [pagination, setPagination] = useState({ total: 0, pages: 0 });
+  // Keyset cursors of pages reached by paging forward (page -> cursor)
+  const pageCursors = useRef({});
   const [currentPage, setCurrentPage] = useState(1);
   const [itemsPerPage, setItemsPerPage] = useState(20);
   const [goToPageInput, setGoToPageInput] = useState('1');
   const [loading, setLoading] = useState(true);
   
+  // Search runs server-side; wait for the user to stop typing
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setDebouncedSearch(searchTerm.trim());
+      pageCursors.current = {};
+      setCurrentPage(1);
+      setGoToPageInput('1');
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
+  
   useEffect(() => {
     fetchScrapedData();
-  }, []);
+  }, [debouncedSearch, currentPage, itemsPerPage]);
   
   const fetchScrapedData = async () => {
     try {
       setLoading(true);
-      const response = await api.get('/api/scraped-data');
+      const params = { page: currentPage, limit: itemsPerPage };
+      if (debouncedSearch) params.search = debouncedSearch;
+      else if (pageCursors.current[currentPage]) params.cursor = pageCursors.current[currentPage];
+      const response = await api.get('/api/scraped-data', { params });
+      const nextPagination = response.data.pagination || { total: 0, pages: 0 };
+      if (nextPagination.nextCursor) pageCursors.current[currentPage + 1] = nextPagination.nextCursor;
       setScrapedData(response.data.data || []);
+      setPagination(nextPagination);
     } catch (error) {
       console.error('Error fetching scraped data:', error);
     } finally {
@@ -34,14 +55,8 @@ export function SavedTasks() {
     }
   };
 
-  const filteredData = scrapedData.filter(item =>
-    JSON.stringify(item.dataItem).toLowerCase().includes(searchTerm.toLowerCase()) ||
-    item.actorName.toLowerCase().includes(searchTerm.toLowerCase())
-  );
-
-  const totalPages = Math.ceil(filteredData.length / itemsPerPage);
-  const startIndex = (currentPage - 1) * itemsPerPage;
-  const paginatedData = filteredData.slice(startIndex, startIndex + itemsPerPage);
+  const totalPages = pagination.pages || 0;
+  const paginatedData = scrapedData;
 
   const handleGoToPage = () => {
     let pageNum = parseInt(goToPageInput);
@@ -106,7 +121,7 @@ export function SavedTasks() {
           </div>
           
           <div className="ml-auto text-sm font-medium">
-            {filteredData.length} Records
+            {pagination.total} Records
           </div>
         </div>
         
@@ -247,6 +262,7 @@ export function SavedTasks() {
                 <div className="flex items-center gap-2">
                   <span className="text-sm text-muted-foreground">Items per page:</span>
                   <Select value={itemsPerPage.toString()} onValueChange={(value) => {
+                    pageCursors.current = {};
                     setItemsPerPage(parseInt(value));
                     setCurrentPage(1);
                     setGoToPageInput('1');
@@ -1,17 +1,313 @@
-import React from 'react';
+import React, { useState, useEffect } from 'react';
+import { useNavigate } from 'react-router-dom';
 import { Header } from '../components/Layout';
+import { Card, CardContent, CardHeader, CardTitle } from '../components/ui/card';
+import { Button } from '../components/ui/button';
+import { Input } from '../components/ui/input';
+import { Label } from '../components/ui/label';
+import { Textarea } from '../components/ui/textarea';
+import { Switch } from '../components/ui/switch';
+import { Badge } from '../components/ui/badge';
+import { Calendar, Plus, Trash2 } from 'lucide-react';
+import { useToast } from '../hooks/use-toast';
+import api from '../services/api';
+
+const CRON_PRESETS = [
+  { label: 'Every 15 minutes', value: '*/15 * * * *' },
+  { label: 'Hourly', value: '0 * * * *' },
+  { label: 'Daily at 06:00 UTC', value: '0 6 * * *' },
+  { label: 'Weekdays at 09:00 UTC', value: '0 9 * * 1-5' },
+  { label: 'Weekly on Monday', value: '0 0 * * 1' }
+];
+
+const EMPTY_FORM = {
+  name: '',
+  actorId: '',
+  cron: '0 * * * *',
+  jitterSecs: 300,
+  maxConcurrentRuns: 1,
+  overlap: 'skip',
+  catchUp: 'once',
+  input: '{\n  "query": "",\n  "location": "",\n  "maxResults": 20\n}'
+};
+
+const selectClassName = 'flex h-10 w-full rounded-md border border-input bg-background px-3 py-2 text-sm ring-offset-background focus-visible:outline-none focus-visible:ring-2 focus-visible:ring-ring';
+
+const formatDate = (value) => (value ? new Date(value).toLocaleString() : '-');
 
 export function Schedules() {
+  const navigate = useNavigate();
+  const { toast } = useToast();
+  const [schedules, setSchedules] = useState([]);
+  const [actors, setActors] = useState([]);
+  const [loading, setLoading] = useState(true);
+  const [showForm, setShowForm] = useState(false);
+  const [form, setForm] = useState(EMPTY_FORM);
+  const [preview, setPreview] = useState({ nextRuns: [], error: null });
+  const [saving, setSaving] = useState(false);
+
+  useEffect(() => {
+    fetchSchedules();
+    fetchActors();
+  }, []);
+
+  // Preview the next fire times while the cron expression is edited
+  useEffect(() => {
+    if (!showForm) return;
+    const timer = setTimeout(async () => {
+      try {
+        const response = await api.get('/api/schedules/preview', { params: { cron: form.cron, count: 3 } });
+        setPreview({ nextRuns: response.data.nextRuns, error: null });
+      } catch (error) {
+        setPreview({ nextRuns: [], error: error.response?.data?.error || 'Invalid cron expression' });
+      }
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [form.cron, showForm]);
+
+  const fetchSchedules = async () => {
+    try {
+      const response = await api.get('/api/schedules');
+      setSchedules(response.data.schedules || []);
+    } catch (error) {
+      console.error('Error fetching schedules:', error);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const fetchActors = async () => {
+    try {
+      const response = await api.get('/api/actors');
+      setActors(response.data || []);
+    } catch (error) {
+      console.error('Error fetching actors:', error);
+    }
+  };
+
+  const updateForm = (key, value) => setForm((prev) => ({ ...prev, [key]: value }));
+
+  const createSchedule = async (e) => {
+    e.preventDefault();
+    let input;
+    try {
+      input = JSON.parse(form.input || '{}');
+    } catch (error) {
+      toast({ title: 'Invalid input', description: 'Run input must be valid JSON', variant: 'destructive' });
+      return;
+    }
+
+    try {
+      setSaving(true);
+      await api.post('/api/schedules', {
+        ...form,
+        input,
+        jitterSecs: parseInt(form.jitterSecs) || 0,
+        maxConcurrentRuns: parseInt(form.maxConcurrentRuns) || 1
+      });
+      toast({ title: 'Schedule created', description: `${form.name || 'Schedule'} will run on "${form.cron}"` });
+      setForm(EMPTY_FORM);
+      setShowForm(false);
+      fetchSchedules();
+    } catch (error) {
+      toast({
+        title: 'Error',
+        description: error.response?.data?.error || 'Failed to create schedule',
+        variant: 'destructive'
+      });
+    } finally {
+      setSaving(false);
+    }
+  };
+
+  const toggleSchedule = async (schedule) => {
+    try {
+      const response = await api.put(`/api/schedules/${schedule.scheduleId}`, { enabled: !schedule.enabled });
+      setSchedules((prev) => prev.map((s) => (s.scheduleId === schedule.scheduleId ? response.data : s)));
+    } catch (error) {
+      console.error('Error updating schedule:', error);
+    }
+  };
+
+  const deleteSchedule = async (schedule) => {
+    if (!window.confirm(`Delete schedule "${schedule.name}"?`)) return;
+    try {
+      await api.delete(`/api/schedules/${schedule.scheduleId}`);
+      setSchedules((prev) => prev.filter((s) => s.scheduleId !== schedule.scheduleId));
+    } catch (error) {
+      console.error('Error deleting schedule:', error);
+    }
+  };
+
   return (
-    <div className="flex-1 flex flex-col overflow-hidden">
-      <Header title="Schedules" />
-      <div className="flex-1 overflow-y-auto p-6">
-        <div className="flex items-center justify-center h-full">
-          <div className="text-center">
-            <h2 className="text-2xl font-semibold text-muted-foreground">Schedules</h2>
-            <p className="text-sm text-muted-foreground mt-2">This feature is coming soon</p>
-          </div>
-        </div>
+    <div className="flex-1 overflow-auto">
+      <Header
+        title="Schedules"
+        actions={
+          <Button onClick={() => setShowForm(!showForm)}>
+            <Plus className="w-4 h-4 mr-2" />
+            New schedule
+          </Button>
+        }
+      />
+
+      <div className="p-6 max-w-7xl mx-auto space-y-6">
+        {showForm && (
+          <Card>
+            <CardHeader>
+              <CardTitle>New schedule</CardTitle>
+            </CardHeader>
+            <CardContent>
+              <form onSubmit={createSchedule} className="grid grid-cols-1 md:grid-cols-2 gap-4">
+                <div className="space-y-2">
+                  <Label htmlFor="name">Name</Label>
+                  <Input id="name" value={form.name} onChange={(e) => updateForm('name', e.target.value)} placeholder="Hourly coffee shops" />
+                </div>
+                <div className="space-y-2">
+                  <Label htmlFor="actorId">Actor<span className="text-red-500 ml-1">*</span></Label>
+                  <select id="actorId" className={selectClassName} value={form.actorId} onChange={(e) => updateForm('actorId', e.target.value)} required>
+                    <option value="">Select an actor</option>
+                    {actors.map((actor) => (
+                      <option key={actor.actorId} value={actor.actorId}>{actor.name}</option>
+                    ))}
+                  </select>
+                </div>
+                <div className="space-y-2">
+                  <Label htmlFor="cron">Cron expression (UTC)<span className="text-red-500 ml-1">*</span></Label>
+                  <Input id="cron" className="font-mono" value={form.cron} onChange={(e) => updateForm('cron', e.target.value)} required />
+                  <div className="flex flex-wrap gap-2">
+                    {CRON_PRESETS.map((preset) => (
+                      <Button key={preset.value} type="button" variant="outline" size="sm" onClick={() => updateForm('cron', preset.value)}>
+                        {preset.label}
+                      </Button>
+                    ))}
+                  </div>
+                  <p className={`text-xs ${preview.error ? 'text-red-500' : 'text-muted-foreground'}`}>
+                    {preview.error || `Next: ${preview.nextRuns.map(formatDate).join(', ')}`}
+                  </p>
+                </div>
+                <div className="space-y-2">
+                  <Label htmlFor="jitterSecs">Start jitter (seconds)</Label>
+                  <Input id="jitterSecs" type="number" min="0" value={form.jitterSecs} onChange={(e) => updateForm('jitterSecs', e.target.value)} />
+                  <p className="text-xs text-muted-foreground">Each run starts at a random delay up to this value, so schedules do not start in bursts.</p>
+                </div>
+                <div className="space-y-2">
+                  <Label htmlFor="maxConcurrentRuns">Max concurrent runs</Label>
+                  <Input id="maxConcurrentRuns" type="number" min="1" value={form.maxConcurrentRuns} onChange={(e) => updateForm('maxConcurrentRuns', e.target.value)} />
+                </div>
+                <div className="space-y-2">
+                  <Label htmlFor="overlap">When previous runs are still active</Label>
+                  <select id="overlap" className={selectClassName} value={form.overlap} onChange={(e) => updateForm('overlap', e.target.value)}>
+                    <option value="skip">Skip this run</option>
+                    <option value="delay">Wait until one finishes</option>
+                  </select>
+                </div>
+                <div className="space-y-2">
+                  <Label htmlFor="catchUp">Missed runs</Label>
+                  <select id="catchUp" className={selectClassName} value={form.catchUp} onChange={(e) => updateForm('catchUp', e.target.value)}>
+                    <option value="once">Run once</option>
+                    <option value="skip">Skip</option>
+                    <option value="all">Run each (up to 10)</option>
+                  </select>
+                </div>
+                <div className="space-y-2 md:col-span-2">
+                  <Label htmlFor="input">Run input (JSON)</Label>
+                  <Textarea id="input" className="font-mono" rows={6} value={form.input} onChange={(e) => updateForm('input', e.target.value)} />
+                </div>
+                <div className="md:col-span-2 flex justify-end gap-2">
+                  <Button type="button" variant="outline" onClick={() => setShowForm(false)}>Cancel</Button>
+                  <Button type="submit" disabled={saving || !!preview.error}>{saving ? 'Saving...' : 'Create schedule'}</Button>
+                </div>
+              </form>
+            </CardContent>
+          </Card>
+        )}
+
+        <Card>
+          <CardContent className="p-0">
+            <div className="overflow-x-auto">
+              <table className="w-full min-w-[1000px]">
+                <thead className="border-b bg-muted/50">
+                  <tr className="text-sm text-muted-foreground">
+                    <th className="text-left p-4 font-medium">Name</th>
+                    <th className="text-left p-4 font-medium">Actor</th>
+                    <th className="text-left p-4 font-medium">Cron</th>
+                    <th className="text-left p-4 font-medium">Next run</th>
+                    <th className="text-left p-4 font-medium">Last run</th>
+                    <th className="text-left p-4 font-medium text-center">Runs</th>
+                    <th className="text-left p-4 font-medium">Enabled</th>
+                    <th className="text-left p-4 font-medium"></th>
+                  </tr>
+                </thead>
+                <tbody>
+                  {loading ? (
+                    <tr>
+                      <td colSpan="8" className="p-12 text-center text-muted-foreground">Loading...</td>
+                    </tr>
+                  ) : schedules.length > 0 ? (
+                    schedules.map((schedule) => (
+                      <tr key={schedule.scheduleId} className="border-b hover:bg-muted/50 transition-colors">
+                        <td className="p-4">
+                          <p className="font-medium text-sm">{schedule.name}</p>
+                          {schedule.lastError && <p className="text-xs text-red-500">{schedule.lastError}</p>}
+                        </td>
+                        <td className="p-4 text-sm">{schedule.actorName}</td>
+                        <td className="p-4">
+                          <span className="font-mono text-xs">{schedule.cron}</span>
+                          {schedule.jitterSecs > 0 && (
+                            <span className="text-xs text-muted-foreground ml-2">±{schedule.jitterSecs}s</span>
+                          )}
+                        </td>
+                        <td className="p-4 text-sm">{schedule.enabled ? formatDate(schedule.nextRunAt) : '-'}</td>
+                        <td className="p-4 text-sm">
+                          {schedule.lastRunId ? (
+                            <span
+                              className="text-blue-600 dark:text-blue-400 cursor-pointer hover:underline"
+                              onClick={() => navigate(`/runs/${schedule.lastRunId}`)}
+                            >
+                              {formatDate(schedule.lastRunAt)}
+                            </span>
+                          ) : '-'}
+                        </td>
+                        <td className="p-4 text-sm text-center">
+                          {schedule.runCount}
+                          {schedule.skippedCount > 0 && (
+                            <Badge variant="outline" className="ml-2">{schedule.skippedCount} skipped</Badge>
+                          )}
+                        </td>
+                        <td className="p-4">
+                          <Switch checked={schedule.enabled} onCheckedChange={() => toggleSchedule(schedule)} />
+                        </td>
+                        <td className="p-4">
+                          <Button variant="ghost" size="sm" onClick={() => deleteSchedule(schedule)}>
+                            <Trash2 className="w-4 h-4" />
+                          </Button>
+                        </td>
+                      </tr>
+                    ))
+                  ) : (
+                    <tr>
+                      <td colSpan="8" className="p-12 text-center">
+                        <div className="flex flex-col items-center gap-4">
+                          <div className="h-16 w-16 rounded-full bg-muted flex items-center justify-center">
+                            <Calendar className="h-8 w-8 text-muted-foreground" />
+                          </div>
+                          <div>
+                            <h3 className="font-semibold mb-1">No schedules yet</h3>
+                            <p className="text-sm text-muted-foreground">
+                              Run an actor on a cron schedule instead of starting it by hand
+                            </p>
+                          </div>
+                          <Button onClick={() => setShowForm(true)}>New schedule</Button>
+                        </div>
+                      </td>
+                    </tr>
+                  )}
+                </tbody>
+              </table>
+            </div>
+          </CardContent>
+        </Card>
       </div>
     </div>
   );
@@ -46,4 +46,41 @@ api.interceptors.response.use(
   }
 );
 
+/**
+ * Subscribe to a run's Server-Sent Events stream.
+ * Uses fetch instead of EventSource so the auth header can be sent.
+ * Resolves when the stream ends (run finished) or the signal aborts.
+ */
+export async function streamRunEvents(runId, { onStatus, signal }) {
+  const token = localStorage.getItem('token');
+  const response = await fetch(`${process.env.REACT_APP_BACKEND_URL}/api/runs/${runId}/events`, {
+    headers: token ? { Authorization: `Bearer ${token}` } : {},
+    signal,
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(`Run events unavailable (${response.status})`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // Events are separated by a blank line
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const chunk = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const lines = chunk.split('\n');
+      const event = lines.find((l) => l.startsWith('event: '))?.slice(7);
+      const data = lines.filter((l) => l.startsWith('data: ')).map((l) => l.slice(6)).join('\n');
+      if (event === 'status' && data) onStatus(JSON.parse(data));
+    }
+  }
+}
+
 export default api;
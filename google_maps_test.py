@@ -4,12 +4,14 @@ Google Maps Scraper Testing Suite
 Tests the Google Maps scraper functionality as requested in the review
 """
 
-import requests
+import httpx
 import json
 import time
 import sys
 from datetime import datetime
 
+from scrapi_client import ScrapiClient, ScrapiError, ScrapiTimeoutError
+
 # Configuration
 BACKEND_URL = "https://app-bootstrap-4.preview.emergentagent.com/api"
 
@@ -19,6 +21,9 @@ class GoogleMapsScraperTester:
         self.auth_token = None
         self.user_data = None
         self.test_results = []
+        # One pooled client for the whole suite: keep-alive connections and
+        # retries on transient failures
+        self.client = ScrapiClient(BACKEND_URL, verify=False)
         
     def log_test(self, test_name, success, message, details=None):
         """Log test results"""
@@ -38,26 +43,14 @@ class GoogleMapsScraperTester:
     def make_request(self, method, endpoint, data=None, headers=None):
         """Make HTTP request with error handling"""
         url = f"{self.base_url}{endpoint}"
-        
-        # Default headers
-        req_headers = {'Content-Type': 'application/json'}
-        if self.auth_token:
-            req_headers['Authorization'] = f'Bearer {self.auth_token}'
-        if headers:
-            req_headers.update(headers)
+        self.client.token = self.auth_token
         
         try:
             print(f"Making {method} request to {url}")
-            if method.upper() == 'GET':
-                response = requests.get(url, headers=req_headers, timeout=60, verify=False)
-            elif method.upper() == 'POST':
-                response = requests.post(url, json=data, headers=req_headers, timeout=60, verify=False)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-            
+            response = self.client.request(method.upper(), endpoint, json=data, headers=headers)
             print(f"Response status: {response.status_code}")
             return response
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Request error for {method} {url}: {e}")
             return None
     
@@ -181,39 +174,35 @@ class GoogleMapsScraperTester:
         
         # Monitor run with extended timeout for scraping
         max_wait = 300  # 5 minutes timeout for Google Maps scraping
-        wait_time = 0
         
         print(f"Monitoring run {self.run_id} (max wait: {max_wait}s)")
         
-        while wait_time < max_wait:
-            time.sleep(10)  # Check every 10 seconds
-            wait_time += 10
-            
-            response = self.make_request('GET', f'/runs/{self.run_id}')
-            
-            if not response or response.status_code != 200:
-                self.log_test("Monitor Run", False, "Failed to get run status")
-                return False
-            
-            run_status = response.json()
-            status = run_status.get('status')
-            
-            print(f"   Status: {status} ({wait_time}s elapsed)")
-            
-            if status == 'succeeded':
-                return self._verify_scraper_output(run_status)
-            elif status == 'failed':
-                error_msg = run_status.get('error', 'Unknown error')
-                self.log_test("Run Execution", False, f"Scraper failed: {error_msg}")
-                return False
-            
-            # Still running, continue waiting
-            if wait_time % 30 == 0:  # Log every 30 seconds
-                print(f"   🔄 Scraping in progress... ({wait_time}s elapsed)")
+        started = time.monotonic()
+        
+        def report(run):
+            print(f"   Status: {run.status} ({int(time.monotonic() - started)}s elapsed, "
+                  f"{run.result_count} items so far)")
+        
+        # The client long-polls the run status endpoint (waitForFinish) instead of sleeping between polls
+        try:
+            run = self.client.wait_for_run(self.run_id, timeout=max_wait, on_update=report)
+        except ScrapiTimeoutError:
+            self.log_test("Run Execution", False, f"Scraper timed out after {max_wait}s")
+            return False
+        except (ScrapiError, httpx.HTTPError) as e:
+            self.log_test("Monitor Run", False, f"Failed to get run status: {e}")
+            return False
         
-        # Timeout
-        self.log_test("Run Execution", False, f"Scraper timed out after {max_wait}s")
-        return False
+        if not run.succeeded:
+            self.log_test("Run Execution", False, f"Scraper failed: {run.error or 'Unknown error'}")
+            return False
+        
+        # Finished - load the run once with its output
+        response = self.make_request('GET', f'/runs/{self.run_id}')
+        if not response or response.status_code != 200:
+            self.log_test("Monitor Run", False, "Failed to get run output")
+            return False
+        return self._verify_scraper_output(response.json())
     
     def _verify_scraper_output(self, run_status):
         """Verify the quality of scraper output"""
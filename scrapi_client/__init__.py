@@ -0,0 +1,28 @@
+"""
+Scrapi API client
+
+    async with AsyncScrapiClient(BACKEND_URL) as client:
+        await client.login(email, password)
+        runs = [await client.create_run("google-maps", run_input) for run_input in inputs]
+        finished = await client.wait_for_runs([run.run_id for run in runs])
+        async for item in client.iter_items(runs[0].run_id):
+            ...
+
+Requires: httpx (pip install httpx)
+"""
+
+from .client import AsyncScrapiClient, ScrapiClient
+from .errors import ScrapiError, ScrapiHTTPError, ScrapiTimeoutError
+from .models import ItemsPage, Run, RunProgress, TERMINAL_STATUSES
+
+__all__ = [
+    "AsyncScrapiClient",
+    "ScrapiClient",
+    "ScrapiError",
+    "ScrapiHTTPError",
+    "ScrapiTimeoutError",
+    "ItemsPage",
+    "Run",
+    "RunProgress",
+    "TERMINAL_STATUSES",
+]
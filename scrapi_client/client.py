@@ -0,0 +1,434 @@
+"""
+Scrapi API clients built on httpx connection pools
+
+AsyncScrapiClient multiplexes many requests and runs on one event loop;
+ScrapiClient is the blocking twin used by the test scripts. Both keep
+connections alive between calls and retry transient failures (connection
+errors and HTTP 429, 502, 503 and 504; a 500 is not retried) with
+exponential backoff. POSTs are resent only when the server cannot have
+processed them (connect failures, 429, 503).
+
+Requires: httpx
+"""
+
+import asyncio
+import contextlib
+import json
+import random
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional
+
+import httpx
+
+from .errors import ScrapiHTTPError, ScrapiTimeoutError
+from .models import ItemsPage, Run, TERMINAL_STATUSES
+
+RETRY_STATUSES = {429, 502, 503, 504}
+# Safe to send again after any transport failure
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+MAX_WAIT_FOR_FINISH_SECS = 50
+
+
+class _ClientBase:
+    def __init__(self, base_url, token=None, timeout=60.0, max_retries=3,
+                 backoff_base=0.5, backoff_max=8.0):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _headers(self, headers=None):
+        req_headers = {"Content-Type": "application/json"}
+        if self.token:
+            req_headers["Authorization"] = f"Bearer {self.token}"
+        if headers:
+            req_headers.update(headers)
+        return req_headers
+
+    def _backoff(self, attempt):
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _should_retry(self, method, status_code):
+        # Only retry POSTs when the server signalled it did not process them
+        if method.upper() == "POST":
+            return status_code in (429, 503)
+        return status_code in RETRY_STATUSES
+
+    def _should_retry_error(self, method, error):
+        if isinstance(error, httpx.HTTPStatusError):
+            return True  # already vetted by _should_retry
+        if method.upper() in IDEMPOTENT_METHODS:
+            return True
+        # A POST that timed out or lost its connection may have been processed;
+        # only resend it when it never reached the server
+        return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+
+    @staticmethod
+    def _check(response):
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("error", response.text)
+            except ValueError:
+                message = response.text
+            raise ScrapiHTTPError(response.status_code, message, response)
+        return response
+
+    @staticmethod
+    def _limits(max_connections):
+        return httpx.Limits(max_connections=max_connections,
+                            max_keepalive_connections=max_connections)
+
+    @staticmethod
+    def _run_params(wait_for_finish, include_output):
+        params = {}
+        if wait_for_finish:
+            params["waitForFinish"] = int(min(MAX_WAIT_FOR_FINISH_SECS, wait_for_finish))
+        if not include_output:
+            params["includeOutput"] = "false"
+        return params
+
+    @staticmethod
+    def _status_headers(etag):
+        return {"If-None-Match": etag} if etag else None
+
+    @staticmethod
+    def _status_result(response) -> Optional[Run]:
+        if response.status_code == 304:
+            return None
+        return Run.from_dict(response.json(), etag=response.headers.get("etag"))
+
+    @staticmethod
+    def _items_params(offset, limit, fields):
+        params = {"offset": offset, "limit": limit}
+        if fields:
+            params["fields"] = ",".join(fields)
+        return params
+
+    @staticmethod
+    def _export_params(format, fields):
+        params = {"format": format}
+        if fields:
+            params["fields"] = ",".join(fields)
+        return params
+
+    def _export_timeout(self, timeout):
+        return httpx.Timeout(self.timeout, read=timeout)
+
+
+class AsyncScrapiClient(_ClientBase):
+    """Asyncio client with a shared connection pool"""
+
+    def __init__(self, base_url, token=None, timeout=60.0, max_connections=100,
+                 max_retries=3, verify=True, **kwargs):
+        super().__init__(base_url, token=token, timeout=timeout, max_retries=max_retries, **kwargs)
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=self._limits(max_connections),
+            verify=verify,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    async def request(self, method, endpoint, json=None, params=None, headers=None, timeout=None):
+        """Send a request with retries; returns the final httpx.Response"""
+        attempt = 0
+        while True:
+            try:
+                response = await self._http.request(
+                    method, endpoint, json=json, params=params,
+                    headers=self._headers(headers), timeout=timeout or self.timeout,
+                )
+                if attempt < self.max_retries and self._should_retry(method, response.status_code):
+                    raise httpx.HTTPStatusError("retryable status", request=response.request, response=response)
+                return response
+            except (httpx.TransportError, httpx.HTTPStatusError) as error:
+                if attempt >= self.max_retries or not self._should_retry_error(method, error):
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+
+    async def register(self, username, email, password, full_name=""):
+        response = self._check(await self.request("POST", "/auth/register", json={
+            "username": username, "email": email, "password": password, "fullName": full_name,
+        }))
+        data = response.json()
+        self.token = data["token"]
+        return data
+
+    async def login(self, email, password):
+        response = self._check(await self.request("POST", "/auth/login", json={
+            "email": email, "password": password,
+        }))
+        data = response.json()
+        self.token = data["token"]
+        return data
+
+    async def create_run(self, actor_id, run_input) -> Run:
+        response = self._check(await self.request("POST", "/runs", json={
+            "actorId": actor_id, "input": run_input,
+        }))
+        return Run.from_dict(response.json())
+
+    async def get_run(self, run_id, wait_for_finish=None, include_output=True) -> Run:
+        params = self._run_params(wait_for_finish, include_output)
+        timeout = self.timeout + (params.get("waitForFinish") or 0)
+        response = self._check(await self.request("GET", f"/runs/{run_id}", params=params, timeout=timeout))
+        return Run.from_dict(response.json())
+
+    async def get_status(self, run_id, wait_for_finish=None, etag=None) -> Optional[Run]:
+        """
+        Status, counters, progress and version of a run (no output).
+        Pass the etag of the previous result to get None while nothing changed.
+        """
+        params = self._run_params(wait_for_finish, True)
+        timeout = self.timeout + (params.get("waitForFinish") or 0)
+        response = self._check(await self.request(
+            "GET", f"/runs/{run_id}/status", params=params,
+            headers=self._status_headers(etag), timeout=timeout,
+        ))
+        return self._status_result(response)
+
+    async def get_trace(self, run_id) -> Dict[str, Any]:
+        """Span timeline of a finished run in Chrome trace format (load it in Perfetto)."""
+        return self._check(await self.request("GET", f"/runs/{run_id}/trace")).json()
+
+    async def wait_for_run(self, run_id, timeout=300.0, on_update: Optional[Callable[[Run], Any]] = None) -> Run:
+        """Long-poll a run's status until it finishes; raises ScrapiTimeoutError on timeout"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ScrapiTimeoutError(f"Run {run_id} did not finish within {timeout}s")
+            run = await self.get_status(run_id, wait_for_finish=max(1, remaining))
+            if on_update:
+                on_update(run)
+            if run.is_finished:
+                return run
+
+    async def wait_for_runs(self, run_ids: Iterable[str], timeout=300.0, concurrency=100,
+                            on_update: Optional[Callable[[Run], Any]] = None) -> Dict[str, Any]:
+        """
+        Wait for many runs at once on this event loop.
+        Returns run_id -> finished Run, or the exception raised while waiting.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def wait_one(run_id):
+            async with semaphore:
+                return await self.wait_for_run(run_id, timeout=timeout, on_update=on_update)
+
+        run_ids = list(run_ids)
+        results = await asyncio.gather(*(wait_one(r) for r in run_ids), return_exceptions=True)
+        return dict(zip(run_ids, results))
+
+    async def stream_events(self, run_id, timeout=300.0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the run's server-sent status events until it finishes.
+        Each event has runId, status, resultCount, newItems and progress.
+        """
+        stream_timeout = httpx.Timeout(self.timeout, read=timeout)
+        async with self._http.stream("GET", f"/runs/{run_id}/events", headers=self._headers(),
+                                     timeout=stream_timeout) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                self._check(response)
+            event, data = None, []
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    data.append(line[5:].strip())
+                elif line == "" and data:
+                    if event in (None, "status"):
+                        payload = json.loads("\n".join(data))
+                        yield payload
+                        if payload.get("status") in TERMINAL_STATUSES:
+                            return
+                    event, data = None, []
+
+    async def get_items(self, run_id, offset=0, limit=100, fields: Optional[List[str]] = None) -> ItemsPage:
+        response = self._check(await self.request(
+            "GET", f"/runs/{run_id}/items", params=self._items_params(offset, limit, fields),
+        ))
+        return ItemsPage.from_dict(response.json())
+
+    async def get_item_keys(self, run_id) -> List[str]:
+        """Top-level keys of every item of the run, in order of first appearance"""
+        return self._check(await self.request("GET", f"/runs/{run_id}/items/keys")).json()["keys"]
+
+    async def iter_item_pages(self, run_id, page_size=500, fields=None) -> AsyncIterator[ItemsPage]:
+        offset = 0
+        while True:
+            page = await self.get_items(run_id, offset=offset, limit=page_size, fields=fields)
+            if page.count == 0:
+                return
+            yield page
+            offset += page.count
+            if offset >= page.total:
+                return
+
+    async def stream_export(self, run_id, format="ndjson", fields=None, timeout=300.0) -> AsyncIterator[bytes]:
+        """Yield the raw bytes of a streamed ndjson or csv export of the run"""
+        async with self._http.stream("GET", f"/runs/{run_id}/items/export", headers=self._headers(),
+                                     params=self._export_params(format, fields),
+                                     timeout=self._export_timeout(timeout)) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                self._check(response)
+            async for chunk in response.aiter_bytes():
+                yield chunk
+
+    async def iter_items(self, run_id, page_size=500, fields=None) -> AsyncIterator[Dict[str, Any]]:
+        async for page in self.iter_item_pages(run_id, page_size=page_size, fields=fields):
+            for item in page.items:
+                yield item
+
+
+class ScrapiClient(_ClientBase):
+    """Blocking client with the same pooling and retry behaviour"""
+
+    def __init__(self, base_url, token=None, timeout=60.0, max_connections=20,
+                 max_retries=3, verify=True, **kwargs):
+        super().__init__(base_url, token=token, timeout=timeout, max_retries=max_retries, **kwargs)
+        self._http = httpx.Client(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=self._limits(max_connections),
+            verify=verify,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._http.close()
+
+    def request(self, method, endpoint, json=None, params=None, headers=None, timeout=None):
+        """Send a request with retries; returns the final httpx.Response"""
+        attempt = 0
+        while True:
+            try:
+                response = self._http.request(
+                    method, endpoint, json=json, params=params,
+                    headers=self._headers(headers), timeout=timeout or self.timeout,
+                )
+                if attempt < self.max_retries and self._should_retry(method, response.status_code):
+                    raise httpx.HTTPStatusError("retryable status", request=response.request, response=response)
+                return response
+            except (httpx.TransportError, httpx.HTTPStatusError) as error:
+                if attempt >= self.max_retries or not self._should_retry_error(method, error):
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+
+    def register(self, username, email, password, full_name=""):
+        response = self._check(self.request("POST", "/auth/register", json={
+            "username": username, "email": email, "password": password, "fullName": full_name,
+        }))
+        data = response.json()
+        self.token = data["token"]
+        return data
+
+    def login(self, email, password):
+        response = self._check(self.request("POST", "/auth/login", json={
+            "email": email, "password": password,
+        }))
+        data = response.json()
+        self.token = data["token"]
+        return data
+
+    def create_run(self, actor_id, run_input) -> Run:
+        response = self._check(self.request("POST", "/runs", json={
+            "actorId": actor_id, "input": run_input,
+        }))
+        return Run.from_dict(response.json())
+
+    def get_run(self, run_id, wait_for_finish=None, include_output=True) -> Run:
+        params = self._run_params(wait_for_finish, include_output)
+        timeout = self.timeout + (params.get("waitForFinish") or 0)
+        response = self._check(self.request("GET", f"/runs/{run_id}", params=params, timeout=timeout))
+        return Run.from_dict(response.json())
+
+    def get_status(self, run_id, wait_for_finish=None, etag=None) -> Optional[Run]:
+        """
+        Status, counters, progress and version of a run (no output).
+        Pass the etag of the previous result to get None while nothing changed.
+        """
+        params = self._run_params(wait_for_finish, True)
+        timeout = self.timeout + (params.get("waitForFinish") or 0)
+        response = self._check(self.request(
+            "GET", f"/runs/{run_id}/status", params=params,
+            headers=self._status_headers(etag), timeout=timeout,
+        ))
+        return self._status_result(response)
+
+    def get_trace(self, run_id) -> Dict[str, Any]:
+        """Span timeline of a finished run in Chrome trace format (load it in Perfetto)."""
+        return self._check(self.request("GET", f"/runs/{run_id}/trace")).json()
+
+    def wait_for_run(self, run_id, timeout=300.0, on_update: Optional[Callable[[Run], Any]] = None) -> Run:
+        """Long-poll a run's status until it finishes; raises ScrapiTimeoutError on timeout"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ScrapiTimeoutError(f"Run {run_id} did not finish within {timeout}s")
+            run = self.get_status(run_id, wait_for_finish=max(1, remaining))
+            if on_update:
+                on_update(run)
+            if run.is_finished:
+                return run
+
+    def get_item_keys(self, run_id) -> List[str]:
+        """Top-level keys of every item of the run, in order of first appearance"""
+        return self._check(self.request("GET", f"/runs/{run_id}/items/keys")).json()["keys"]
+
+    def iter_items(self, run_id, page_size=500, fields=None) -> Iterator[Dict[str, Any]]:
+        offset = 0
+        while True:
+            response = self._check(self.request(
+                "GET", f"/runs/{run_id}/items", params=self._items_params(offset, page_size, fields),
+            ))
+            page = ItemsPage.from_dict(response.json())
+            if page.count == 0:
+                return
+            yield from page.items
+            offset += page.count
+            if offset >= page.total:
+                return
+
+    def stream_export(self, run_id, format="ndjson", fields=None, timeout=300.0) -> Iterator[bytes]:
+        """Yield the raw bytes of a streamed ndjson or csv export of the run"""
+        with self._export_response(run_id, format, fields, timeout) as response:
+            yield from response.iter_bytes()
+
+    def iter_export(self, run_id, fields=None, timeout=300.0) -> Iterator[Dict[str, Any]]:
+        """Yield every item of the run from one streamed ndjson export"""
+        with self._export_response(run_id, "ndjson", fields, timeout) as response:
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    @contextlib.contextmanager
+    def _export_response(self, run_id, format, fields, timeout):
+        with self._http.stream("GET", f"/runs/{run_id}/items/export", headers=self._headers(),
+                               params=self._export_params(format, fields),
+                               timeout=self._export_timeout(timeout)) as response:
+            if response.status_code >= 400:
+                response.read()
+                self._check(response)
+            yield response
@@ -0,0 +1,20 @@
+"""
+Errors raised by the Scrapi client
+"""
+
+
+class ScrapiError(Exception):
+    """Base error for Scrapi client failures"""
+
+
+class ScrapiHTTPError(ScrapiError):
+    """Non-success HTTP response from the API"""
+
+    def __init__(self, status_code, message, response=None):
+        super().__init__(f"HTTP {status_code}: {message}")
+        self.status_code = status_code
+        self.response = response
+
+
+class ScrapiTimeoutError(ScrapiError):
+    """A run did not finish within the requested time"""
@@ -0,0 +1,237 @@
+"""
+Stream a run's dataset into a Parquet file
+
+Items are read from one streamed NDJSON export (GET /runs/:runId/items/export)
+and written as Parquet row groups, so only one row group is ever held in
+memory whatever the run size:
+
+    with ScrapiClient(BACKEND_URL, token=token) as client:
+        rows = download_parquet(client, run_id, "places.parquet")
+
+    python -m scrapi_client.export RUN_ID places.parquet --token $SCRAPI_TOKEN
+
+The columns are every item key of the run (fetched from the server before
+the export starts). Column types are inferred from the first row group:
+integers are widened to float64 (a later null or fraction must not break
+the file), columns with no value yet get the type of their first value, and
+nested objects and lists are stored as JSON strings. A later
+value that does not fit its column's type widens the column to string, so
+no value is ever dropped.
+
+Requires: pyarrow (imported lazily so the client works without it)
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_BASE_URL = "http://localhost:8001/api"
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def _cell(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return value
+
+
+def _columns(rows: List[Dict[str, Any]], names: List[str]) -> Dict[str, List[Any]]:
+    return {name: [_cell(row.get(name)) for row in rows] for name in names}
+
+
+def _kind(pa, values):
+    """Column type inferred from its first values (null while they all are)"""
+    kind = pa.array(values).type
+    if pa.types.is_integer(kind):
+        return pa.float64()
+    return kind
+
+
+def _text(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _array(pa, values, kind):
+    """Arrow array of a column, or None when a value does not fit its type"""
+    try:
+        return pa.array(values, type=kind)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        pass
+    # Anything can be stored as text
+    if pa.types.is_string(kind):
+        return pa.array([_text(v) for v in values], type=kind)
+    return None
+
+
+class _ParquetWriter:
+    """
+    Parquet file written one row group at a time whose schema can still grow.
+    A column first seen in a later row group, or a value that does not fit
+    its column's type ("4.7" in a float column), widens the schema; the row
+    groups already written are then copied into a file with the new schema,
+    one row group at a time.
+    """
+
+    def __init__(self, pa, path, columns, compression):
+        self.pa = pa
+        self.path = str(path)
+        self.names = list(columns or [])
+        self.compression = compression
+        self.schema = None
+        self.writer = None
+        self.current = None
+        self.generation = 0
+
+    def write(self, rows):
+        pa = self.pa
+        self.names.extend(k for k in dict.fromkeys(k for row in rows for k in row) if k not in self.names)
+        columns = _columns(rows, self.names)
+
+        kinds = {field.name: field.type for field in self.schema} if self.schema else {}
+        arrays = []
+        for name in self.names:
+            kind = kinds.get(name)
+            if kind is None or pa.types.is_null(kind):
+                kind = _kind(pa, columns[name])
+            array = _array(pa, columns[name], kind)
+            if array is None:
+                kind = pa.string()
+                array = _array(pa, columns[name], kind)
+            kinds[name] = kind
+            arrays.append(array)
+
+        schema = pa.schema([pa.field(name, kinds[name]) for name in self.names])
+        if self.schema is None or not schema.equals(self.schema):
+            self._reopen(schema)
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+    def _reopen(self, schema):
+        """Start a new file with the schema and copy the row groups written so far"""
+        pa = self.pa
+        previous, old_schema = self.current, self.schema
+        if self.writer is not None:
+            self.writer.close()
+        self.generation += 1
+        self.current = f"{self.path}.{self.generation}.tmp"
+        self.writer = pa.parquet.ParquetWriter(self.current, schema, compression=self.compression)
+        self.schema = schema
+        if previous is None:
+            return
+
+        source = pa.parquet.ParquetFile(previous)
+        for index in range(source.num_row_groups):
+            table = source.read_row_group(index)
+            arrays = []
+            for field in schema:
+                if field.name not in old_schema.names:
+                    arrays.append(pa.nulls(table.num_rows, type=field.type))
+                    continue
+                column = table.column(field.name)
+                if pa.types.is_null(column.type):
+                    column = pa.nulls(table.num_rows, type=field.type)
+                elif column.type != field.type:
+                    # Widened to text: write values the way new rows are written
+                    column = pa.array([_text(_cell(v)) for v in column.to_pylist()], type=field.type)
+                arrays.append(column)
+            self.writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        source.close()
+        os.remove(previous)
+
+    def close(self, keep=True):
+        if self.writer is None:
+            return
+        self.writer.close()
+        if keep:
+            os.replace(self.current, self.path)
+        else:
+            os.remove(self.current)
+
+
+def write_parquet(items: Iterable[Dict[str, Any]], path, row_group_size=DEFAULT_ROW_GROUP_SIZE,
+                  compression="zstd", columns: Optional[List[str]] = None) -> int:
+    """
+    Write an iterable of item dicts to Parquet in row groups; returns the row count.
+    columns - every top-level key of the items, when known up front (avoids
+    copying the file when a later row group adds a column)
+    """
+    pa = _pyarrow()
+    writer = _ParquetWriter(pa, path, columns, compression)
+    rows: List[Dict[str, Any]] = []
+    total = 0
+    done = False
+
+    try:
+        for item in items:
+            rows.append(item)
+            total += 1
+            if len(rows) >= row_group_size:
+                writer.write(rows)
+                rows.clear()
+        if rows:
+            writer.write(rows)
+        done = True
+    finally:
+        writer.close(keep=done)
+    return total
+
+
+def download_parquet(client, run_id, path, fields: Optional[List[str]] = None,
+                     row_group_size=DEFAULT_ROW_GROUP_SIZE, compression="zstd", timeout=600.0) -> int:
+    """
+    Stream a run's items from the export endpoint into a Parquet file.
+    The columns are the requested fields, or every item key known to the server.
+    """
+    if fields:
+        columns = list(dict.fromkeys(field.split(".", 1)[0] for field in fields))
+    else:
+        columns = client.get_item_keys(run_id)
+    items = client.iter_export(run_id, fields=fields, timeout=timeout)
+    return write_parquet(items, path, row_group_size=row_group_size, compression=compression, columns=columns)
+
+
+def main(argv=None):
+    from .client import ScrapiClient
+
+    parser = argparse.ArgumentParser(description="Download a run's dataset as Parquet")
+    parser.add_argument("run_id")
+    parser.add_argument("path", help="output .parquet file")
+    parser.add_argument("--base-url", default=os.environ.get("SCRAPI_BASE_URL", DEFAULT_BASE_URL))
+    parser.add_argument("--token", default=os.environ.get("SCRAPI_TOKEN"), help="JWT (or SCRAPI_TOKEN)")
+    parser.add_argument("--email", help="log in instead of passing a token")
+    parser.add_argument("--password", default=os.environ.get("SCRAPI_PASSWORD"))
+    parser.add_argument("--fields", help="comma separated item fields, e.g. name,city,location")
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    parser.add_argument("--compression", default="zstd")
+    parser.add_argument("--insecure", action="store_true", help="skip TLS verification")
+    args = parser.parse_args(argv)
+
+    fields = [f.strip() for f in args.fields.split(",") if f.strip()] if args.fields else None
+    with ScrapiClient(args.base_url, token=args.token, verify=not args.insecure) as client:
+        if args.email:
+            client.login(args.email, args.password)
+        if not client.token:
+            parser.error("pass --token, set SCRAPI_TOKEN or log in with --email/--password")
+        rows = download_parquet(client, args.run_id, args.path, fields=fields,
+                                row_group_size=args.row_group_size, compression=args.compression)
+
+    print(f"Wrote {rows} rows to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
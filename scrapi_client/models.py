@@ -0,0 +1,88 @@
+"""
+Typed models for Scrapi API responses
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+
+@dataclass
+class RunProgress:
+    collected: int = 0
+    enriched: int = 0
+    failed: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "RunProgress":
+        data = data or {}
+        return cls(
+            collected=data.get("collected", 0) or 0,
+            enriched=data.get("enriched", 0) or 0,
+            failed=data.get("failed", 0) or 0,
+        )
+
+
+@dataclass
+class Run:
+    run_id: str
+    actor_id: Optional[str]
+    status: str
+    result_count: int = 0
+    progress: RunProgress = field(default_factory=RunProgress)
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    duration: Optional[str] = None
+    error: Optional[str] = None
+    output: Optional[List[Any]] = None
+    version: int = 0
+    etag: Optional[str] = None
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == "succeeded"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], etag: Optional[str] = None) -> "Run":
+        return cls(
+            run_id=data.get("runId"),
+            actor_id=data.get("actorId"),
+            status=data.get("status"),
+            result_count=data.get("resultCount", 0) or 0,
+            progress=RunProgress.from_dict(data.get("progress")),
+            started_at=data.get("startedAt"),
+            finished_at=data.get("finishedAt"),
+            duration=data.get("duration"),
+            error=data.get("error"),
+            output=data.get("output"),
+            version=data.get("version", 0) or 0,
+            etag=etag,
+            raw=data,
+        )
+
+
+@dataclass
+class ItemsPage:
+    items: List[Dict[str, Any]]
+    total: int
+    offset: int
+    limit: int
+
+    @property
+    def count(self) -> int:
+        return len(self.items)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ItemsPage":
+        return cls(
+            items=data.get("items", []),
+            total=data.get("total", 0),
+            offset=data.get("offset", 0),
+            limit=data.get("limit", 0),
+        )
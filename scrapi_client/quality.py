@@ -0,0 +1,341 @@
+"""
+Columnar data-quality scoring for scraped places
+
+Places from any number of runs are loaded into one DataFrame (one row per
+place, nested objects flattened one level, e.g. location.lat) and every check
+runs as a vectorised pass over whole columns: per-field fill rates, validity
+checks (name, address shape, coordinates, phone type, social links, emails)
+and a quality score per place and per run.
+
+    frame = places_frame(run.output, run_id=run.run_id)
+    scored = score_places(frame)
+    print(run_scores(scored))
+
+Requires: pandas, numpy (imported lazily so the client works without them)
+"""
+
+import asyncio
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+GENERIC_TITLES = ["hours", "menu", "about", "reviews", "photos", "overview"]
+
+# Canonical field -> names used by the different Google Maps scraper versions
+FIELD_ALIASES = {
+    "title": ["title", "name"],
+    "address": ["address", "fullAddress"],
+    "categoryName": ["categoryName", "mainCategory"],
+    "totalScore": ["totalScore", "rating"],
+    "postalCode": ["postalCode", "zip"],
+    "imagesCount": ["imagesCount", "photoCount"],
+}
+
+# Nested objects stored under different names, flattened as <prefix>.<key>
+NESTED_ALIASES = {
+    "socialMedia": ["socialMedia", "social"],
+    "additionalInfo": ["additionalInfo"],
+    "location": ["location"],
+}
+
+CRITICAL_FIELDS = ["title", "address", "phone", "website", "location"]
+
+SOCIAL_DOMAINS = {
+    "facebook": r"facebook\.com",
+    "instagram": r"instagram\.com",
+    "twitter": r"twitter\.com|x\.com",
+    "linkedin": r"linkedin\.com",
+    "tiktok": r"tiktok\.com",
+    "youtube": r"youtube\.com",
+    "pinterest": r"pinterest\.com",
+    "yelp": r"yelp\.com",
+}
+
+EMAIL_PATTERN = r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"
+
+# Weight of each validity check in the quality score
+CHECK_WEIGHTS = {
+    "name_valid": 2.0,
+    "address_valid": 2.0,
+    "coords_valid": 2.0,
+    "phone_valid": 1.5,
+    "website_valid": 1.0,
+    "rating_valid": 0.5,
+    "social_valid": 0.5,
+    "email_valid": 0.5,
+}
+
+# Nested lists count at most this many elements, like the original field counter
+LIST_COUNT_LIMIT = 3
+
+
+def _pandas():
+    try:
+        import numpy as np
+        import pandas as pd
+    except ImportError as e:
+        raise ImportError("scrapi_client.quality requires pandas and numpy (pip install pandas numpy)") from e
+    return pd, np
+
+
+def places_frame(places: Iterable[Dict[str, Any]], run_id=None):
+    """
+    Load places into a DataFrame.
+    run_id is a single id for every row or a sequence with one id per place.
+    Fields the scraper versions name differently are coalesced into their
+    canonical column and the alias columns dropped.
+    """
+    pd, np = _pandas()
+    records = [p for p in places if isinstance(p, dict)]
+    frame = pd.json_normalize(records, max_level=1) if records else pd.DataFrame(index=pd.RangeIndex(0))
+    frame["_keys"] = np.fromiter((len(r) for r in records), dtype=np.int64, count=len(records))
+    frame["run_id"] = run_id if run_id is None or isinstance(run_id, str) else list(run_id)
+
+    for canonical, names in FIELD_ALIASES.items():
+        present = [n for n in names if n in frame.columns]
+        if not present or present == [canonical]:
+            continue
+        frame[canonical] = frame[present].bfill(axis=1).iloc[:, 0]
+        frame = frame.drop(columns=[n for n in present if n != canonical])
+
+    for canonical, names in NESTED_ALIASES.items():
+        for alias in names:
+            if alias == canonical:
+                continue
+            prefix = f"{alias}."
+            for column in [c for c in frame.columns if c == alias or c.startswith(prefix)]:
+                target = canonical + column[len(alias):]
+                frame[target] = frame[target].combine_first(frame[column]) if target in frame.columns else frame[column]
+                frame = frame.drop(columns=column)
+    return frame
+
+
+def frame_from_runs(runs: Mapping[str, Iterable[Dict[str, Any]]]):
+    """One frame for places from many runs: {run_id: places}"""
+    pd, _ = _pandas()
+    frames = [places_frame(places, run_id) for run_id, places in runs.items()]
+    return pd.concat(frames, ignore_index=True) if frames else places_frame([])
+
+
+async def load_runs(client, run_ids: Iterable[str], concurrency=8, page_size=1000):
+    """Fetch every item of many runs through an AsyncScrapiClient into one frame"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def load(run_id):
+        async with semaphore:
+            return [item async for item in client.iter_items(run_id, page_size=page_size)]
+
+    run_ids = list(run_ids)
+    pages = await asyncio.gather(*(load(run_id) for run_id in run_ids))
+    return frame_from_runs(dict(zip(run_ids, pages)))
+
+
+def _nested_columns(frame, field):
+    prefixes = tuple(f"{name}." for name in NESTED_ALIASES.get(field, [field]))
+    return [c for c in frame.columns if c.startswith(prefixes)]
+
+
+def _text(frame, column):
+    pd, _ = _pandas()
+    if column not in frame.columns:
+        return pd.Series("", index=frame.index, dtype="string")
+    return frame[column].astype("string").fillna("")
+
+
+def _number(frame, column):
+    pd, np = _pandas()
+    if column not in frame.columns:
+        return pd.Series(np.nan, index=frame.index)
+    return pd.to_numeric(frame[column], errors="coerce")
+
+
+def _bool(series):
+    return series.fillna(False).astype(bool)
+
+
+def _filled(column):
+    """Non-null and not an empty string/list/object"""
+    pd, _ = _pandas()
+    filled = column.notna()
+    if not (pd.api.types.is_numeric_dtype(column) or pd.api.types.is_bool_dtype(column)):
+        filled &= ~column.astype(str).isin(["", "[]", "{}", "None", "nan"])
+    return filled
+
+
+def _field_filled(frame, field):
+    pd, _ = _pandas()
+    filled = _filled(frame[field]) if field in frame.columns else pd.Series(False, index=frame.index)
+    nested = _nested_columns(frame, field)
+    if nested:
+        # Flattened objects leave the bare column only on rows where they were null
+        filled |= frame[nested].notna().any(axis=1)
+    return filled
+
+
+def count_fields(frame):
+    """
+    Fields per place: top-level keys, plus keys of nested objects, plus up to
+    LIST_COUNT_LIMIT elements of list values
+    """
+    pd, np = _pandas()
+    nested = [c for c in frame.columns if "." in c]
+    counts = frame["_keys"].to_numpy(dtype=np.int64).copy()
+    if nested:
+        counts += frame[nested].notna().sum(axis=1).to_numpy(dtype=np.int64)
+
+    for column in frame.columns:
+        if frame[column].dtype != object or column in nested:
+            continue
+        sample = frame[column].dropna()
+        if sample.empty or not isinstance(sample.iloc[0], list):
+            continue
+        lengths = frame[column].str.len().fillna(0).clip(upper=LIST_COUNT_LIMIT)
+        counts += lengths.to_numpy(dtype=np.int64)
+    return pd.Series(counts, index=frame.index, name="field_count")
+
+
+def phone_types(frame):
+    """Same classes as the scraper: US landline / US number / unknown"""
+    pd, np = _pandas()
+    phone = _text(frame, "phone")
+    digits = phone.str.replace(r"\D", "", regex=True)
+    length = digits.str.len()
+    kinds = np.select(
+        [
+            _bool(length == 10).to_numpy(),
+            _bool((length == 11) & digits.str.startswith("1")).to_numpy(),
+            _bool(phone.str.len() > 0).to_numpy(),
+        ],
+        ["US landline", "US number", "unknown"],
+        default="",
+    )
+    kinds = pd.Series(kinds, index=frame.index, name="phone_type")
+    return kinds.where(kinds != "")
+
+
+def social_link_counts(frame):
+    """(valid, invalid) social link counts per place; a link is valid when it
+    is an http(s) URL on the platform's domain"""
+    pd, _ = _pandas()
+    valid = pd.Series(0, index=frame.index)
+    invalid = pd.Series(0, index=frame.index)
+    for column in _nested_columns(frame, "socialMedia"):
+        platform = column.split(".", 1)[1]
+        link = _text(frame, column)
+        present = link.str.len() > 0
+        ok = link.str.match(r"https?://")
+        if platform in SOCIAL_DOMAINS:
+            ok &= link.str.contains(SOCIAL_DOMAINS[platform], case=False, regex=True)
+        valid += _bool(present & ok).astype(int)
+        invalid += _bool(present & ~ok).astype(int)
+    return valid, invalid
+
+
+def email_counts(frame):
+    """Number of well-formed emails per place"""
+    pd, _ = _pandas()
+    if "emails" not in frame.columns:
+        return pd.Series(0, index=frame.index)
+    exploded = frame["emails"].explode()
+    matches = _bool(exploded.astype("string").str.fullmatch(EMAIL_PATTERN))
+    return matches.groupby(level=0).sum().reindex(frame.index, fill_value=0).astype(int)
+
+
+def score_places(frame):
+    """
+    Add per-place validity checks, counts and a 0-100 quality_score.
+    Returns a new frame; the input is not modified.
+    """
+    pd, np = _pandas()
+    scored = frame.copy()
+
+    title = _text(frame, "title")
+    scored["name_valid"] = _bool((title.str.len() > 3) & ~title.str.lower().isin(GENERIC_TITLES))
+
+    address = _text(frame, "address")
+    address_shape = address.str.contains(",", regex=False) | address.str.lower().str.contains("st|ave|rd|blvd|dr")
+    scored["address_valid"] = _bool((address.str.len() > 10) & address_shape)
+
+    lat = _number(frame, "location.lat")
+    lng = _number(frame, "location.lng")
+    scored["coords_valid"] = lat.between(-90, 90) & lng.between(-180, 180) & (lat != 0) & (lng != 0)
+
+    scored["phone_type"] = phone_types(frame)
+    digits = _text(frame, "phone").str.replace(r"\D", "", regex=True)
+    scored["phone_valid"] = _bool(digits.str.len() >= 10)
+
+    scored["website_valid"] = _bool(_text(frame, "website").str.match(r"https?://"))
+    scored["rating_valid"] = _number(frame, "totalScore").between(1, 5)
+
+    scored["social_links"], scored["invalid_social_links"] = social_link_counts(frame)
+    scored["social_valid"] = scored["social_links"] > 0
+    scored["email_count"] = email_counts(frame)
+    scored["email_valid"] = scored["email_count"] > 0
+
+    info_columns = _nested_columns(frame, "additionalInfo")
+    scored["additional_info_categories"] = (
+        frame[info_columns].notna().sum(axis=1) if info_columns else pd.Series(0, index=frame.index)
+    )
+    scored["field_count"] = count_fields(frame)
+
+    checks = scored[list(CHECK_WEIGHTS)].to_numpy(dtype=float)
+    weights = np.array(list(CHECK_WEIGHTS.values()))
+    scored["quality_score"] = (checks @ weights) / weights.sum() * 100
+    return scored
+
+
+def fill_rates(frame, fields: Optional[List[str]] = None):
+    """
+    Share of places (0-1) with each field filled, highest first.
+    Defaults to every (canonical) field present in the frame.
+    """
+    pd, _ = _pandas()
+    if fields is None:
+        fields = sorted({c.split(".", 1)[0] for c in frame.columns if not c.startswith("_") and c != "run_id"})
+    filled = pd.DataFrame({field: _field_filled(frame, field) for field in fields}, index=frame.index)
+    return filled.mean().sort_values(ascending=False)
+
+
+def run_scores(scored):
+    """Per-run aggregates of a score_places() frame"""
+    aggregations = {
+        "places": ("quality_score", "size"),
+        "quality_score": ("quality_score", "mean"),
+        "avg_field_count": ("field_count", "mean"),
+    }
+    for check in CHECK_WEIGHTS:
+        aggregations[check] = (check, "mean")
+    return scored.groupby("run_id", dropna=False).agg(**aggregations).sort_values("quality_score")
+
+
+def quality_report(places, run_id=None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Plain-dict summary for scripts: check pass rates, field fill rates,
+    score distribution and per-run scores
+    """
+    frame = places if hasattr(places, "columns") else places_frame(places, run_id)
+    scored = score_places(frame)
+    if scored.empty:
+        return {"places": 0}
+
+    checks = scored[list(CHECK_WEIGHTS)].mean()
+    return {
+        "places": len(scored),
+        "quality_score": {
+            "mean": round(float(scored["quality_score"].mean()), 1),
+            "p10": round(float(scored["quality_score"].quantile(0.1)), 1),
+            "min": round(float(scored["quality_score"].min()), 1),
+        },
+        "checks": {name: round(float(rate), 3) for name, rate in checks.items()},
+        "fill_rates": {name: round(float(rate), 3) for name, rate in fill_rates(frame, fields).items()},
+        "field_count": {
+            "mean": round(float(scored["field_count"].mean()), 1),
+            "min": int(scored["field_count"].min()),
+            "first": int(scored["field_count"].iloc[0]),
+        },
+        "additional_info_categories": {
+            "mean": round(float(scored["additional_info_categories"].mean()), 1),
+            "first": int(scored["additional_info_categories"].iloc[0]),
+        },
+        "phone_types": {k: int(v) for k, v in scored["phone_type"].value_counts().items()},
+        "invalid_social_links": int(scored["invalid_social_links"].sum()),
+        "runs": run_scores(scored).reset_index().to_dict(orient="records"),
+    }
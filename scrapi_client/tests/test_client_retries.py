@@ -0,0 +1,99 @@
+"""
+Retry behaviour of the Scrapi clients against httpx.MockTransport
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from scrapi_client.client import AsyncScrapiClient, ScrapiClient
+
+BASE_URL = "http://scrapi.test/api"
+
+
+class Recorder:
+    """Mock transport handler that fails the first `failures` calls"""
+
+    def __init__(self, failure, failures=1):
+        self.failure = failure
+        self.failures = failures
+        self.calls = []
+
+    def __call__(self, request):
+        self.calls.append(request.method)
+        if len(self.calls) <= self.failures:
+            if isinstance(self.failure, int):
+                return httpx.Response(self.failure, json={"error": "unavailable"})
+            raise self.failure("simulated", request=request)
+        return httpx.Response(200, json={"ok": True})
+
+
+def sync_client(handler):
+    client = ScrapiClient(BASE_URL, max_retries=3, backoff_base=0)
+    client._http = httpx.Client(base_url=BASE_URL, transport=httpx.MockTransport(handler))
+    return client
+
+
+def async_request(handler, method, endpoint):
+    async def send():
+        client = AsyncScrapiClient(BASE_URL, max_retries=3, backoff_base=0)
+        client._http = httpx.AsyncClient(base_url=BASE_URL, transport=httpx.MockTransport(handler))
+        async with client:
+            return await client.request(method, endpoint, json={})
+    return asyncio.run(send())
+
+
+def test_post_read_timeout_is_not_resent():
+    handler = Recorder(httpx.ReadTimeout)
+    with sync_client(handler) as client:
+        with pytest.raises(httpx.ReadTimeout):
+            client.request("POST", "/runs", json={"actorId": "google-maps"})
+    assert handler.calls == ["POST"]
+
+
+def test_post_connect_errors_are_retried():
+    for failure in (httpx.ConnectError, httpx.ConnectTimeout):
+        handler = Recorder(failure)
+        with sync_client(handler) as client:
+            assert client.request("POST", "/runs", json={}).status_code == 200
+        assert handler.calls == ["POST", "POST"]
+
+
+def test_get_transport_errors_are_retried():
+    handler = Recorder(httpx.ReadTimeout, failures=2)
+    with sync_client(handler) as client:
+        assert client.request("GET", "/runs/abc").status_code == 200
+    assert handler.calls == ["GET"] * 3
+
+
+def test_post_retries_only_statuses_that_mean_not_processed():
+    handler = Recorder(503)
+    with sync_client(handler) as client:
+        assert client.request("POST", "/runs", json={}).status_code == 200
+    assert len(handler.calls) == 2
+
+    handler = Recorder(502)
+    with sync_client(handler) as client:
+        assert client.request("POST", "/runs", json={}).status_code == 502
+    assert len(handler.calls) == 1
+
+
+def test_retries_stop_at_max_retries():
+    handler = Recorder(503, failures=10)
+    with sync_client(handler) as client:
+        assert client.request("GET", "/runs/abc").status_code == 503
+    assert len(handler.calls) == 4
+
+
+def test_async_post_read_timeout_is_not_resent():
+    handler = Recorder(httpx.ReadTimeout)
+    with pytest.raises(httpx.ReadTimeout):
+        async_request(handler, "POST", "/runs")
+    assert handler.calls == ["POST"]
+
+
+def test_async_post_connect_error_is_retried():
+    handler = Recorder(httpx.ConnectError)
+    assert async_request(handler, "POST", "/runs").status_code == 200
+    assert handler.calls == ["POST", "POST"]
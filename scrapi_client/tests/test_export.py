@@ -0,0 +1,74 @@
+"""
+Parquet export: schema growth and type widening across row groups
+"""
+
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from scrapi_client.export import download_parquet, write_parquet
+
+ROWS = [{"name": "Joe's Pizza", "rating": 4.5}] * 2 + [{"name": "Cafe Luna", "rating": "4.7", "phone": "123"}] * 2
+
+
+def read(path):
+    return pq.read_table(path).to_pylist()
+
+
+def test_later_columns_and_mismatched_values_are_kept(tmp_path):
+    path = tmp_path / "places.parquet"
+    assert write_parquet(iter(ROWS), path, row_group_size=2) == 4
+
+    assert read(path) == [
+        {"name": "Joe's Pizza", "rating": "4.5", "phone": None},
+        {"name": "Joe's Pizza", "rating": "4.5", "phone": None},
+        {"name": "Cafe Luna", "rating": "4.7", "phone": "123"},
+        {"name": "Cafe Luna", "rating": "4.7", "phone": "123"},
+    ]
+    assert pq.ParquetFile(path).num_row_groups == 2
+    assert [p.name for p in tmp_path.iterdir()] == ["places.parquet"]
+
+
+def test_known_columns_take_the_type_of_their_first_value(tmp_path):
+    path = tmp_path / "places.parquet"
+    rows = [{"name": "a", "rating": 4}, {"name": "b", "rating": 4.5, "open": True, "location": {"lat": 1}}]
+    write_parquet(iter(rows), path, row_group_size=1, columns=["name", "rating", "open", "location"])
+
+    table = pq.read_table(path)
+    assert str(table.schema.field("rating").type) == "double"
+    assert str(table.schema.field("open").type) == "bool"
+    assert table.to_pylist()[1] == {"name": "b", "rating": 4.5, "open": True, "location": '{"lat":1}'}
+
+
+class FakeClient:
+    def __init__(self, items, keys):
+        self.items = items
+        self.keys = keys
+        self.calls = []
+
+    def get_item_keys(self, run_id):
+        self.calls.append(("keys", run_id))
+        return self.keys
+
+    def iter_export(self, run_id, fields=None, timeout=None):
+        self.calls.append(("export", run_id, fields))
+        return iter(self.items)
+
+
+def test_download_uses_the_server_key_list(tmp_path):
+    path = tmp_path / "run.parquet"
+    client = FakeClient(ROWS, ["name", "rating", "phone", "website"])
+    assert download_parquet(client, "run-1", path, row_group_size=2) == 4
+
+    assert client.calls == [("keys", "run-1"), ("export", "run-1", None)]
+    assert pq.read_table(path).column_names == ["name", "rating", "phone", "website"]
+    assert read(path)[3]["phone"] == "123"
+
+
+def test_download_with_fields_skips_the_key_list(tmp_path):
+    path = tmp_path / "run.parquet"
+    client = FakeClient([{"name": "a", "location": {"lat": 1.5}}], [])
+    download_parquet(client, "run-1", path, fields=["name", "location.lat"])
+
+    assert client.calls == [("export", "run-1", ["name", "location.lat"])]
+    assert read(path) == [{"name": "a", "location": '{"lat":1.5}'}]
@@ -0,0 +1,44 @@
+"""
+Alias coalescing and fill rates of scrapi_client.quality
+"""
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from scrapi_client import quality
+
+PLACES = [
+    {"title": "Joe's Pizza", "photoCount": 4, "location": {"lat": 40.7, "lng": -74.0}},
+    {"name": "Cafe Luna", "imagesCount": 2, "social": {"facebook": "https://facebook.com/luna"}},
+    {"name": "Corner Deli", "location": {"lat": 0, "lng": 0}},
+]
+
+
+def test_aliases_coalesce_into_canonical_columns():
+    frame = quality.places_frame(PLACES, run_id="run-1")
+
+    assert list(frame["title"]) == ["Joe's Pizza", "Cafe Luna", "Corner Deli"]
+    assert list(frame["imagesCount"].iloc[:2]) == [4, 2]
+    assert frame["imagesCount"].isna().iloc[2]
+    assert "socialMedia.facebook" in frame.columns
+    for alias in ("name", "photoCount", "social.facebook"):
+        assert alias not in frame.columns
+
+
+def test_default_fill_rates_cover_canonical_fields_only():
+    rates = quality.fill_rates(quality.places_frame(PLACES))
+
+    assert rates["title"] == 1.0
+    assert rates["imagesCount"] == pytest.approx(2 / 3)
+    assert rates["socialMedia"] == pytest.approx(1 / 3)
+    # Fields no place has are not reported as 0.0
+    for field in ("name", "photoCount", "social", "postalCode", "categoryName"):
+        assert field not in rates.index
+
+
+def test_coords_valid_rejects_empty_coordinates():
+    report = quality.quality_report(PLACES, run_id="run-1")
+
+    assert report["fill_rates"]["location"] == pytest.approx(0.667)
+    assert report["checks"]["coords_valid"] == pytest.approx(0.333)